@@ -0,0 +1,271 @@
+"""
+Asynchronní vyhledávací služba pro vysoký počet souběžných dotazů
+"""
+
+import asyncio
+import logging
+import os
+
+from rate_limiter import QuotaExceededError, RateLimiter
+from result_cache import ResultCache
+from results_parser import ResultsParser
+from search_service import SearchService
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSearchService:
+    """Vyhledávání přes asyncio a sdílený pool HTTP spojení (httpx)
+
+    Jeden event loop obslouží stovky souběžných dotazů bez vlákna na
+    každý požadavek. Perzistentní cache, rate limiter, kvóta, metriky
+    i normalizace dotazů a odpovědí jsou sdílené se SearchService, takže
+    synchronní a asynchronní volající čerpají z jednoho limitu a vidí
+    stejné záznamy cache.
+
+    Použití:
+        async with AsyncSearchService() as service:
+            results = await service.search_many(["python", "java"], language="en")
+
+    Klient je vázaný na event loop, ve kterém vznikl - instance se
+    nesdílí mezi různými asyncio.run().
+    """
+
+    # Výchozí maximální počet otevřených spojení k API
+    MAX_CONNECTIONS = 100
+
+    def __init__(self, api_key=None, cx=None, max_connections=None):
+        """Inicializace služby
+
+        Args:
+            api_key: Google Custom Search API klíč (výchozí GOOGLE_API_KEY)
+            cx: Custom Search Engine ID (výchozí GOOGLE_CX)
+            max_connections: Velikost poolu spojení
+                             (výchozí SEARCH_ASYNC_MAX_CONNECTIONS, jinak 100)
+        """
+        self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
+        self.cx = cx or os.getenv("GOOGLE_CX")
+        self.max_connections = max_connections or int(
+            os.getenv("SEARCH_ASYNC_MAX_CONNECTIONS", str(self.MAX_CONNECTIONS))
+        )
+        self._client = None
+        # Rozběhnuté stejné dotazy - souběžní volající čekají na jeden výsledek
+        self._in_flight = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def _get_client(self):
+        """Vrátí sdílený httpx.AsyncClient (vytvoří se při prvním volání)
+
+        SEARCH_API_ENDPOINT přesměruje volání na jiný server stejně jako
+        u SearchService (např. fake_search_server.py).
+        """
+        if self._client is None:
+            try:
+                import httpx
+            except ImportError:
+                raise ImportError("httpx není nainstalován (pip install httpx)")
+
+            endpoint = os.getenv("SEARCH_API_ENDPOINT") or "https://customsearch.googleapis.com/"
+            self._client = httpx.AsyncClient(
+                base_url=endpoint,
+                timeout=SearchService.HTTP_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def aclose(self):
+        """Zavře pool spojení"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def search(self, query, num=10, language="cs"):
+        """
+        Vyhledá dotaz a vrátí naparsované výsledky
+
+        Args:
+            query: Vyhledávací dotaz
+            num: Počet výsledků (max 100, nad 10 se stahuje po stránkách)
+            language: Jazyk výsledků (cs, en, sk, pl, de, fr, es, it)
+
+        Returns:
+            ResultSet: Výsledky (stejné jako ResultsParser.parse_google_api_response)
+        """
+        SearchService.get_metrics().searches.inc(language=language)
+        response = await self.fetch(query, num, language=language)
+        return ResultsParser.parse_google_api_response(response)
+
+    async def search_many(
+        self, queries, num=10, language="cs", concurrency=None, return_exceptions=False
+    ):
+        """
+        Vyhledá více dotazů souběžně
+
+        Args:
+            queries: Iterovatelné dotazů
+            num: Počet výsledků na dotaz
+            language: Jazyk výsledků
+            concurrency: Maximální počet rozpracovaných dotazů (výchozí max_connections)
+            return_exceptions: Chybu dotazu vrátit v seznamu místo vyhození
+
+        Returns:
+            list: ResultSet (nebo výjimka) pro každý dotaz ve stejném pořadí
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.max_connections)
+
+        async def search_one(query):
+            async with semaphore:
+                return await self.search(query, num, language=language)
+
+        return await asyncio.gather(
+            *(search_one(query) for query in queries), return_exceptions=return_exceptions
+        )
+
+    async def fetch(self, query, num, language="cs"):
+        """
+        Provede vyhledávání přes perzistentní cache (asynchronní SearchService.fetch)
+
+        Čerstvý záznam se vrátí z cache, prošlý v okně stale-while-revalidate
+        se vrátí hned a obnoví na pozadí přes BackgroundRefresher, v okně
+        stale-if-error se vrátí, když API selže. Stejné souběžné dotazy
+        v rámci služby volají API jen jednou. Čtení a zápis perzistentní
+        cache i kontrola kvóty před obnovou (SQLite) běží ve vláknech,
+        takže event loop neblokují.
+
+        Returns:
+            dict: Google API odpověď, pro num > 10 ve tvaru {"pages": [odpověď, ...]}
+        """
+        # Do API jde dotaz s původní velikostí písmen, klíče cache normalizuje make_key
+        query = ResultCache.clean_query(query)
+        num = min(num, SearchService.MAX_RESULTS)
+        cache = SearchService.get_cache()
+        metrics = SearchService.get_metrics()
+        item_fields = SearchService.get_item_fields()
+        key = ResultCache.make_key(self.cx, query, None, language, item_fields)
+
+        stale = None
+        if cache is not None:
+            # Čtení SQLite může čekat na zámek - mimo event loop
+            state, stale, entry_num = await asyncio.to_thread(
+                SearchService._cache_lookup, cache, key, num
+            )
+            if state == "hit":
+                metrics.cache_requests.inc(layer="disk", result="hit")
+                return stale
+            if state == "stale":
+                metrics.cache_requests.inc(layer="disk", result="stale")
+                # Kontrola kvóty před naplánováním obnovy čte SQLite - mimo event loop
+                await asyncio.to_thread(
+                    SearchService._schedule_refresh,
+                    self.api_key,
+                    self.cx,
+                    query,
+                    entry_num,
+                    language,
+                    lambda res, res_num: SearchService._cache_store(cache, key, res, res_num),
+                    item_fields,
+                )
+                return stale
+            metrics.cache_requests.inc(layer="disk", result="miss")
+
+        flight_key = ResultCache.make_key(self.cx, query, num, language, item_fields)
+        task = self._in_flight.get(flight_key)
+        if task is not None:
+            metrics.coalesced.inc()
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(
+            self._load(cache, key, query, num, language, stale, item_fields)
+        )
+        self._in_flight[flight_key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(flight_key, None))
+        return await asyncio.shield(task)
+
+    async def _load(self, cache, key, query, num, language, stale, item_fields=None):
+        """Zavolá API a uloží odpověď do cache (při chybě vrátí stale, pokud je)"""
+        try:
+            res = await self._call_api(query, num, language, item_fields)
+        except Exception as e:
+            if stale is None:
+                raise
+            logger.warning("API selhalo, vracím prošlý záznam cache: %s", e)
+            SearchService.get_metrics().cache_requests.inc(layer="disk", result="stale_on_error")
+            return stale
+        if cache is not None:
+            await asyncio.to_thread(SearchService._cache_store, cache, key, res, num)
+        return res
+
+    async def _call_api(self, query, num, language, item_fields=None):
+        """Zavolá Custom Search API (bez cache), stránky se stahují souběžně"""
+        logger.info("API call: query=%r num=%s language=%s", query, num, language)
+
+        num = min(num, SearchService.MAX_RESULTS)
+        if num <= SearchService.PAGE_SIZE:
+            res = await self._fetch_page(query, num, language, 1, item_fields)
+            return SearchService.project_response(res, item_fields)
+
+        pages = await asyncio.gather(
+            *(
+                self._fetch_page(query, page_num, language, start, item_fields)
+                for start, page_num in SearchService.page_ranges(num)
+            )
+        )
+        return SearchService.project_response({"pages": list(pages)}, item_fields)
+
+    async def _fetch_page(self, query, num, language, start, item_fields=None):
+        """Stáhne jednu stránku výsledků (max 10) přes sdílený rate limiter"""
+        metrics = SearchService.get_metrics()
+        client = self._get_client()
+        params = SearchService.list_params(self.cx, query, num, language, start, item_fields)
+        params["key"] = self.api_key
+
+        async def execute():
+            metrics.api_requests.inc(language=language)
+            with metrics.api_latency.time(language=language):
+                try:
+                    return await self._request(client, params)
+                except Exception as e:
+                    metrics.api_errors.inc(reason=RateLimiter.error_reason(e))
+                    raise
+
+        try:
+            return await SearchService.get_rate_limiter().call_async(execute)
+        except QuotaExceededError as e:
+            if e.__cause__ is None:
+                metrics.api_errors.inc(reason="localQuotaExceeded")
+            raise
+
+    @staticmethod
+    async def _request(client, params):
+        """
+        Provede jeden GET customsearch/v1
+
+        Chyby se převádí na stejné výjimky jako v synchronní cestě
+        (googleapiclient HttpError, ConnectionError, TimeoutError), takže
+        RateLimiter i metriky je rozliší stejně.
+        """
+        import httpx
+
+        try:
+            response = await client.get("customsearch/v1", params=params)
+        except httpx.TimeoutException as e:
+            raise TimeoutError(str(e)) from e
+        except httpx.TransportError as e:
+            raise ConnectionError(str(e)) from e
+
+        if response.status_code >= 400:
+            import httplib2
+            from googleapiclient.errors import HttpError
+
+            resp = httplib2.Response({"status": response.status_code, **response.headers})
+            # API klíč do chybové zprávy nepatří
+            raise HttpError(resp, response.content, uri=str(response.url.copy_remove_param("key")))
+        return response.json()
@@ -0,0 +1,87 @@
+"""
+Obnova prošlých záznamů cache na pozadí (stale-while-revalidate)
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundRefresher:
+    """Omezený pool pro obnovu záznamů cache na pozadí
+
+    Obnova se nikdy nehromadí ve frontě: když běží max_workers obnov,
+    když se stejný klíč už obnovuje, nebo když zbývající denní kvóta
+    klesla na rezervu, požadavek se zahodí a uživatel dostane prošlý
+    záznam i příště.
+    """
+
+    def __init__(self, max_workers=2, quota_reserve=0, quota_remaining=None):
+        """Inicializace
+
+        Args:
+            max_workers: Maximální počet souběžných obnov
+            quota_reserve: Kolik dotazů denní kvóty se na obnovy nesmí použít
+            quota_remaining: Funkce vracející zbývající denní kvótu
+        """
+        self.max_workers = max_workers
+        self.quota_reserve = quota_reserve
+        self.quota_remaining = quota_remaining
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="cache-refresh"
+        )
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, quota_remaining=None):
+        """Vytvoří refresher podle environment proměnných
+
+        - SEARCH_REFRESH_WORKERS: souběžné obnovy na pozadí (výchozí 2)
+        - SEARCH_REFRESH_QUOTA_RESERVE: část denní kvóty vyhrazená pro
+          uživatelské dotazy, obnovy ji nespotřebují (výchozí 1000)
+        """
+        return cls(
+            max_workers=int(os.getenv("SEARCH_REFRESH_WORKERS", "2")),
+            quota_reserve=int(os.getenv("SEARCH_REFRESH_QUOTA_RESERVE", "1000")),
+            quota_remaining=quota_remaining,
+        )
+
+    def submit(self, key, func, cost=1):
+        """
+        Naplánuje obnovu, pokud to limity dovolí
+
+        Args:
+            key: Klíč obnovovaného záznamu
+            func: Funkce bez argumentů, která záznam obnoví
+            cost: Počet API dotazů, které obnova spotřebuje
+
+        Returns:
+            Future nebo None, pokud se obnova nenaplánovala
+        """
+        if self.quota_remaining is not None and self.quota_remaining() - cost < self.quota_reserve:
+            return None
+
+        with self._lock:
+            if key in self._pending or len(self._pending) >= self.max_workers:
+                return None
+            self._pending.add(key)
+
+        def run():
+            try:
+                return func()
+            except Exception as e:
+                logger.warning("Obnova záznamu cache selhala: %s", e)
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+
+        return self._executor.submit(run)
+
+    def pending(self):
+        """Počet právě běžících obnov"""
+        with self._lock:
+            return len(self._pending)
@@ -0,0 +1,236 @@
+"""
+Dávkové vyhledávání bez UI
+Čte dotazy ze souboru a výsledky průběžně zapisuje do JSONL
+
+Použití:
+    python batch.py queries.csv -o results.jsonl --workers 8 --resume
+
+Vstupní CSV má sloupce query[,language[,num]], hlavička je nepovinná.
+Řádky začínající # se přeskakují.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+from results_parser import ResultsParser
+from search_service import SearchService
+
+
+class BatchRunner:
+    """Třída pro dávkové spouštění dotazů"""
+
+    def __init__(self, api_key, cx, workers=4, progress=None):
+        """Inicializace runneru
+
+        Args:
+            api_key: Google Custom Search API klíč
+            cx: Custom Search Engine ID
+            workers: Počet souběžně běžících dotazů
+            progress: Stream pro výpis průběhu (None = bez výpisu)
+        """
+        self.api_key = api_key
+        self.cx = cx
+        self.workers = workers
+        self.progress = progress
+
+    @staticmethod
+    def read_queries(path, language="cs", num=10):
+        """
+        Postupně čte dotazy ze vstupního CSV
+
+        Args:
+            path: Cesta ke vstupnímu souboru
+            language: Výchozí jazyk pro řádky bez jazyka
+            num: Výchozí počet výsledků pro řádky bez počtu
+
+        Yields:
+            tuple: (query, language, num)
+        """
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.reader(f):
+                if not row or not row[0].strip() or row[0].startswith("#"):
+                    continue
+                if row[0].strip().lower() == "query":  # Hlavička
+                    continue
+
+                query = row[0].strip()
+                row_language = row[1].strip() if len(row) > 1 and row[1].strip() else language
+                row_num = int(row[2]) if len(row) > 2 and row[2].strip() else num
+                yield query, row_language, row_num
+
+    @staticmethod
+    def read_checkpoint(path):
+        """
+        Načte dotazy, které už ve výstupu úspěšně doběhly
+
+        Args:
+            path: Cesta k výstupnímu JSONL
+
+        Returns:
+            set: {(query, language, num)}
+        """
+        done = set()
+        if not os.path.exists(path):
+            return done
+
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Poslední řádek může být useknutý přerušeným během
+                    continue
+                if "error" not in record:
+                    done.add((record["query"], record["language"], record["num"]))
+        return done
+
+    def _search(self, query, language, num):
+        """Provede jeden dotaz a vrátí záznam pro JSONL"""
+        record = {"query": query, "language": language, "num": num}
+        try:
+            response = SearchService.fetch(self.api_key, self.cx, query, num, language=language)
+            results = ResultsParser.parse_google_api_response(response)
+            SearchService.record_history(query, language, results)
+            record["results"] = results.to_dicts()
+        except Exception as e:
+            record["error"] = str(e)
+        record["fetched_at"] = datetime.now(timezone.utc).isoformat()
+        return record
+
+    def run(self, queries, output_path, resume=False, total=None):
+        """
+        Spustí dotazy souběžně a výsledky průběžně zapisuje do JSONL
+
+        V paměti je najednou nejvýše 2× workers rozpracovaných dotazů,
+        každý hotový záznam se hned zapíše a zahodí.
+
+        Args:
+            queries: Iterovatelné (query, language, num)
+            output_path: Cesta k výstupnímu JSONL (při resume se připisuje)
+            resume: Přeskočit dotazy, které už ve výstupu doběhly
+            total: Celkový počet dotazů pro výpis průběhu (nepovinné)
+
+        Returns:
+            dict: Statistika běhu {'done', 'failed', 'skipped', 'elapsed'}
+        """
+        done_keys = self.read_checkpoint(output_path) if resume else set()
+        stats = {"done": 0, "failed": 0, "skipped": 0, "elapsed": 0.0}
+        started = time.monotonic()
+        max_pending = self.workers * 2
+
+        with open(output_path, "a" if resume else "w", encoding="utf-8") as out, \
+                ThreadPoolExecutor(max_workers=self.workers) as executor:
+            # Přerušený běh mohl nechat useknutý poslední řádek bez konce řádku
+            if resume and out.tell() > 0 and not self._ends_with_newline(output_path):
+                out.write("\n")
+
+            pending = set()
+
+            def drain(return_when):
+                nonlocal pending
+                finished, pending = wait(pending, return_when=return_when)
+                for future in finished:
+                    record = future.result()
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+                    stats["failed" if "error" in record else "done"] += 1
+                    self._report(stats, started, total)
+
+            for query, language, num in queries:
+                if (query, language, num) in done_keys:
+                    stats["skipped"] += 1
+                    continue
+                pending.add(executor.submit(self._search, query, language, num))
+                if len(pending) >= max_pending:
+                    drain(FIRST_COMPLETED)
+
+            if pending:
+                drain(ALL_COMPLETED)
+
+        stats["elapsed"] = time.monotonic() - started
+        if self.progress is not None:
+            self.progress.write("\n")
+        return stats
+
+    @staticmethod
+    def _ends_with_newline(path):
+        """Zjistí, zda soubor končí znakem nového řádku"""
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _report(self, stats, started, total):
+        """Vypíše průběh a propustnost"""
+        if self.progress is None:
+            return
+
+        processed = stats["done"] + stats["failed"]
+        elapsed = time.monotonic() - started
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        of_total = f"/{total - stats['skipped']}" if total is not None else ""
+        self.progress.write(
+            f"\r[{processed}{of_total}] {rate:.1f} dotazů/s, chyby: {stats['failed']}"
+        )
+        self.progress.flush()
+
+
+def main(argv=None):
+    """Hlavní funkce dávkového režimu"""
+    parser = argparse.ArgumentParser(description="Dávkové vyhledávání přes Google Custom Search")
+    parser.add_argument("input", help="CSV se sloupci query[,language[,num]]")
+    parser.add_argument("-o", "--output", required=True, help="Výstupní JSONL soubor")
+    parser.add_argument("-l", "--language", default="cs", help="Výchozí jazyk (výchozí cs)")
+    parser.add_argument("-n", "--num", type=int, default=10, help="Výchozí počet výsledků")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Počet souběžných dotazů")
+    parser.add_argument(
+        "--resume", action="store_true", help="Pokračovat tam, kde předchozí běh skončil"
+    )
+    args = parser.parse_args(argv)
+
+    search_service = SearchService()
+    if not search_service.api_key or not search_service.cx:
+        parser.error("Chybí GOOGLE_API_KEY nebo GOOGLE_CX")
+
+    total = 0
+    cost = 0
+    for _, _, num in BatchRunner.read_queries(args.input, args.language, args.num):
+        total += 1
+        # Každá stránka (10 výsledků) je jedno volání API
+        cost += len(SearchService.page_ranges(num))
+    remaining = SearchService.quota_remaining()
+    if remaining < cost:
+        print(
+            f"⚠️ Zbývající denní kvóta ({remaining}) nestačí na {total} dotazů "
+            f"({cost} volání API), "
+            "zbytek skončí chybou a doběhne přes --resume",
+            file=sys.stderr,
+        )
+
+    runner = BatchRunner(
+        search_service.api_key, search_service.cx, workers=args.workers, progress=sys.stderr
+    )
+    stats = runner.run(
+        BatchRunner.read_queries(args.input, args.language, args.num),
+        args.output,
+        resume=args.resume,
+        total=total,
+    )
+
+    processed = stats["done"] + stats["failed"]
+    rate = processed / stats["elapsed"] if stats["elapsed"] > 0 else 0.0
+    print(
+        f"✅ Hotovo: {stats['done']}, chyby: {stats['failed']}, přeskočeno: {stats['skipped']} "
+        f"({rate:.1f} dotazů/s)",
+        file=sys.stderr,
+    )
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
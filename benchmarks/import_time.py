@@ -0,0 +1,126 @@
+"""
+Měření doby importu (cold start) pomocí python -X importtime
+
+Použití:
+    python -m benchmarks.import_time            # výpis
+    python -m benchmarks.import_time --check    # kontrola rozpočtu (exit 1 při překročení)
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_budget.json")
+
+
+def parse_importtime(stderr):
+    """
+    Zpracuje výstup -X importtime
+
+    Args:
+        stderr: Text ze stderr procesu spuštěného s -X importtime
+
+    Returns:
+        dict: {modul: (self_us, cumulative_us)}
+    """
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure_import(module, repeat=3):
+    """
+    Změří import modulu v čistém procesu
+
+    Spouští se opakovaně a bere se nejrychlejší běh (nejméně ovlivněný šumem).
+
+    Args:
+        module: Název importovaného modulu
+        repeat: Počet měření
+
+    Returns:
+        dict: {'total_ms', 'timings'} nejrychlejšího běhu
+    """
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings = parse_importtime(proc.stderr)
+        total_ms = timings[module][1] / 1000
+        if best is None or total_ms < best["total_ms"]:
+            best = {"total_ms": total_ms, "timings": timings}
+    return best
+
+
+def load_budget(path=BUDGET_PATH):
+    """Načte rozpočet doby importu {modul: {'max_ms', 'forbidden'}}"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check_budget(budget, repeat=3, timing=True):
+    """
+    Změří všechny moduly z rozpočtu a vrátí porušení
+
+    Args:
+        budget: dict z load_budget()
+        repeat: Počet měření na modul
+        timing: Kontrolovat i max_ms (závisí na stroji), jinak jen zakázané importy
+
+    Returns:
+        tuple: (results {modul: measure_import()}, violations [str])
+    """
+    results = {}
+    violations = []
+    for module, limits in budget.items():
+        result = measure_import(module, repeat=repeat)
+        results[module] = result
+
+        if timing and result["total_ms"] > limits["max_ms"]:
+            violations.append(
+                f"{module}: import trvá {result['total_ms']:.0f} ms "
+                f"(rozpočet {limits['max_ms']} ms)"
+            )
+
+        loaded = {name.split(".")[0] for name in result["timings"]}
+        for forbidden in limits.get("forbidden", []):
+            if forbidden in loaded:
+                violations.append(f"{module}: při startu se importuje {forbidden}")
+    return results, violations
+
+
+def main(argv=None):
+    """Vypíše dobu importu modulů a případně zkontroluje rozpočet"""
+    parser = argparse.ArgumentParser(description="Měření doby importu aplikace")
+    parser.add_argument("--check", action="store_true", help="Skončit chybou při překročení")
+    parser.add_argument("--repeat", type=int, default=3, help="Počet měření na modul")
+    parser.add_argument("--top", type=int, default=10, help="Počet nejpomalejších importů")
+    args = parser.parse_args(argv)
+
+    results, violations = check_budget(load_budget(), repeat=args.repeat)
+    for module, result in results.items():
+        print(f"{module}: {result['total_ms']:.1f} ms")
+        slowest = sorted(result["timings"].items(), key=lambda item: -item[1][0])
+        for name, (self_us, _) in slowest[: args.top]:
+            print(f"    {self_us / 1000:8.1f} ms  {name}")
+
+    for violation in violations:
+        print(f"❌ {violation}")
+
+    return 1 if args.check and violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+Mikro-benchmarky parsování a exportů ResultsParser
+
+Použití:
+    python -m benchmarks.parser_bench                          # výpis
+    python -m benchmarks.parser_bench --sizes 10,1000,1000000  # vlastní velikosti
+    python -m benchmarks.parser_bench --save-baseline          # uložit baseline
+    python -m benchmarks.parser_bench --compare                # exit 1 při regresi
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from results_parser import ResultsParser  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parser_baseline.json")
+
+DEFAULT_SIZES = [10, 1000, 100000]
+
+# Měřené operace - všechny dostávají surovou API odpověď jako v aplikaci
+BENCHMARKS = {
+    "parse": ResultsParser.parse_google_api_response,
+    "to_json_string": ResultsParser.to_json_string,
+    "to_csv_data": ResultsParser.to_csv_data,
+    "to_txt_content": lambda response: ResultsParser.to_txt_content(response, "benchmark"),
+}
+
+
+def make_response(size):
+    """
+    Vygeneruje syntetickou odpověď Custom Search API
+
+    Args:
+        size: Počet položek v items
+
+    Returns:
+        dict: Odpověď ve tvaru Google API (včetně polí, která parser ignoruje)
+    """
+    return {
+        "kind": "customsearch#search",
+        "searchInformation": {"totalResults": str(size), "searchTime": 0.2},
+        "items": [
+            {
+                "kind": "customsearch#result",
+                "title": f"Výsledek {i} - příliš žluťoučký kůň",
+                "link": f"https://www.example{i % 97}.cz/stranka/{i}?q=test&page={i}",
+                "displayLink": f"www.example{i % 97}.cz",
+                "snippet": f'Popis výsledku {i}, s čárkou a "uvozovkami". ' * 3,
+                "formattedUrl": f"https://www.example{i % 97}.cz/stranka/{i}",
+            }
+            for i in range(1, size + 1)
+        ],
+    }
+
+
+def measure(func, response, size, repeat=3):
+    """
+    Změří jednu operaci
+
+    Čas je nejlepší z `repeat` běhů, špička paměti se měří zvlášť
+    přes tracemalloc (ten měření času zpomaluje).
+
+    Returns:
+        dict: {'seconds', 'items_per_s', 'peak_mb'}
+    """
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(response)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        func(response)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": best,
+        "items_per_s": size / best if best > 0 else float("inf"),
+        "peak_mb": peak / (1024 * 1024),
+    }
+
+
+def run_benchmarks(sizes=None, repeat=3, names=None):
+    """
+    Spustí benchmarky pro všechny velikosti
+
+    Args:
+        sizes: list počtů položek (výchozí DEFAULT_SIZES)
+        repeat: Počet měření času na operaci
+        names: Podmnožina BENCHMARKS (výchozí všechny)
+
+    Returns:
+        dict: {"operace@velikost": výsledek measure()}
+    """
+    results = {}
+    for size in sizes or DEFAULT_SIZES:
+        response = make_response(size)
+        for name in names or BENCHMARKS:
+            repeats = repeat if size < 100000 else 1
+            results[f"{name}@{size}"] = measure(BENCHMARKS[name], response, size, repeats)
+        del response
+    return results
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    """Uloží výsledky jako baseline pro pozdější porovnání"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path=BASELINE_PATH):
+    """Načte uloženou baseline"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results, baseline, threshold=0.25):
+    """
+    Porovná výsledky s baseline
+
+    Args:
+        results: Výsledky run_benchmarks()
+        baseline: Výsledky načtené z load_baseline()
+        threshold: Povolené zhoršení (0.25 = o 25 % nižší propustnost nebo vyšší paměť)
+
+    Returns:
+        list: Popisy regresí (prázdný = bez regrese)
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+
+        if result["items_per_s"] < base["items_per_s"] * (1 - threshold):
+            regressions.append(
+                f"{key}: propustnost {result['items_per_s']:,.0f}/s "
+                f"(baseline {base['items_per_s']:,.0f}/s)"
+            )
+        # Malé alokace jsou zatížené šumem, paměť se hlídá až od 1 MB
+        if result["peak_mb"] > max(base["peak_mb"], 1.0) * (1 + threshold):
+            regressions.append(
+                f"{key}: špička paměti {result['peak_mb']:.1f} MB "
+                f"(baseline {base['peak_mb']:.1f} MB)"
+            )
+    return regressions
+
+
+def format_results(results):
+    """Naformátuje výsledky jako tabulku"""
+    lines = [f"{'operace':<28} {'čas [ms]':>12} {'položek/s':>14} {'paměť [MB]':>11}"]
+    for key, result in results.items():
+        lines.append(
+            f"{key:<28} {result['seconds'] * 1000:>12.2f} "
+            f"{result['items_per_s']:>14,.0f} {result['peak_mb']:>11.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Spustí benchmarky z příkazové řádky"""
+    parser = argparse.ArgumentParser(description="Benchmarky ResultsParser")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Velikosti odpovědí oddělené čárkou (např. 10,1000,1000000)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Počet měření na operaci")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Cesta k baseline JSON")
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Uložit výsledky jako baseline"
+    )
+    parser.add_argument("--compare", action="store_true", help="Porovnat s baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="Povolené zhoršení (výchozí 0.25)"
+    )
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = run_benchmarks(sizes, repeat=args.repeat)
+    print(format_results(results))
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"💾 Baseline uložena do {args.baseline}")
+
+    if args.compare:
+        regressions = compare(results, load_baseline(args.baseline), args.threshold)
+        for regression in regressions:
+            print(f"❌ {regression}")
+        if regressions:
+            return 1
+        print("✅ Bez regrese oproti baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
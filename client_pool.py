@@ -0,0 +1,76 @@
+"""
+Pool dlouhodobě žijících API klientů
+"""
+
+import queue
+import threading
+from contextlib import contextmanager
+
+
+class ClientPool:
+    """Thread-safe pool předpřipravených API klientů
+
+    Klient googleapiclient (a jeho httplib2 transport) není thread-safe,
+    ale jeho vytvoření je drahé (zpracování discovery dokumentu, nové
+    TLS spojení). Pool proto drží pro každý API klíč zásobník volných
+    klientů - vlákno si klienta půjčí, použije a vrátí. Klienti tak
+    zůstávají otevření a znovu používají keep-alive spojení.
+    """
+
+    def __init__(self, factory, max_idle=8):
+        """Inicializace poolu
+
+        Args:
+            factory: Funkce factory(api_key) vracející nového klienta
+            max_idle: Maximální počet volných klientů držených pro jeden klíč
+        """
+        self.factory = factory
+        self.max_idle = max_idle
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _queue_for(self, api_key):
+        """Vrátí zásobník volných klientů pro daný klíč"""
+        with self._lock:
+            if api_key not in self._idle:
+                self._idle[api_key] = queue.LifoQueue(maxsize=self.max_idle)
+            return self._idle[api_key]
+
+    @contextmanager
+    def client(self, api_key):
+        """
+        Zapůjčí klienta pro daný API klíč
+
+        Nejdříve se použije naposledy vrácený klient (LIFO drží spojení
+        "teplá"), teprve když žádný volný není, vytvoří se nový.
+
+        Args:
+            api_key: Google API klíč
+
+        Yields:
+            Klient vytvořený přes factory
+        """
+        idle = self._queue_for(api_key)
+        try:
+            client = idle.get_nowait()
+        except queue.Empty:
+            client = self.factory(api_key)
+
+        yield client
+
+        # Po výjimce se sem nedojde - klient s možná rozbitým spojením se zahodí
+        try:
+            idle.put_nowait(client)
+        except queue.Full:
+            pass
+
+    def clear(self):
+        """Zahodí všechny volné klienty"""
+        with self._lock:
+            self._idle = {}
+
+    def idle_count(self, api_key):
+        """Počet volných klientů pro daný klíč"""
+        with self._lock:
+            idle = self._idle.get(api_key)
+        return idle.qsize() if idle is not None else 0
@@ -0,0 +1,401 @@
+"""
+Paralelní export velkých dávek výsledků
+Parsuje a serializuje JSONL z batch.py po blocích v poolu procesů
+
+Použití:
+    python export_pipeline.py results.jsonl --json results.json --csv results.csv --workers 8
+    python export_pipeline.py results.jsonl --parquet archive.parquet --compression zstd
+
+Každý řádek vstupu je záznam s "query", "language" a buď "results"
+(výstup batch.py), nebo surovou API odpovědí v "response". Záznamy
+s "error" se přeskakují.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from results_parser import ResultsParser
+from search_results import ResultSet
+
+
+class ExportPipeline:
+    """Export JSONL záznamů do jednoho JSON, CSV a Parquet s využitím všech jader
+
+    Vstup se rozdělí na bloky řádků podle bajtových offsetů (hlavní
+    proces JSON vůbec nedekóduje). Každý blok v samostatném procesu
+    naparsuje, převede na řádky a zapíše do dílčích souborů, které se
+    pak připojí do výsledných souborů v pořadí bloků - výstup je proto
+    stejný bez ohledu na počet procesů a pořadí, v jakém bloky doběhnou.
+    """
+
+    # Sloupce exportu - dotaz a jazyk + pole výsledku
+    FIELDS = ("query", "language") + ResultSet.FIELDS
+
+    # Podporované výstupní formáty
+    FORMATS = ("json", "csv", "parquet")
+
+    def __init__(
+        self,
+        workers=None,
+        chunk_size=1000,
+        compression=ResultsParser.PARQUET_COMPRESSION,
+        row_group_size=ResultsParser.PARQUET_ROW_GROUP_SIZE,
+    ):
+        """Inicializace pipeline
+
+        Args:
+            workers: Počet procesů (výchozí počet jader, 1 = bez poolu v hlavním procesu)
+            chunk_size: Počet záznamů (řádků vstupu) v jednom bloku
+            compression: Komprese Parquet výstupu (viz ResultsParser.write_parquet)
+            row_group_size: Počet řádků v jedné row group Parquet výstupu
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.compression = compression
+        self.row_group_size = row_group_size
+
+    @staticmethod
+    def iter_chunks(path, chunk_size):
+        """
+        Rozdělí JSONL soubor na bloky po chunk_size řádcích
+
+        Čtou se jen bajty a hledají konce řádků, dekódování JSON
+        zůstává na procesech poolu.
+
+        Yields:
+            tuple: (offset, délka) bloku v bajtech
+        """
+        with open(path, "rb") as f:
+            start = 0
+            lines = 0
+            position = 0
+            for line in f:
+                position += len(line)
+                lines += 1
+                if lines >= chunk_size:
+                    yield start, position - start
+                    start = position
+                    lines = 0
+            if position > start:
+                yield start, position - start
+
+    @staticmethod
+    def iter_rows(records):
+        """
+        Převede záznamy dávky na řádky exportu
+
+        Args:
+            records: Iterovatelné dictů {'query', 'language', 'results' nebo 'response'}
+
+        Yields:
+            tuple: Hodnoty v pořadí FIELDS
+        """
+        for record in records:
+            if "error" in record:
+                continue
+            data = record["response"] if "response" in record else record.get("results", [])
+            results = ResultsParser.parse_google_api_response(data)
+            prefix = (record.get("query", ""), record.get("language", ""))
+            for result in results:
+                yield prefix + tuple(result.get(field, "") for field in ResultSet.FIELDS)
+
+    @staticmethod
+    def serialize_rows(rows, formats):
+        """
+        Serializuje řádky do dílčích částí výstupu
+
+        JSON část jsou objekty oddělené ",\\n  " bez hranatých závorek,
+        CSV část jsou řádky bez hlavičky - obojí se dá spojit prostým
+        zřetězením (viz merge). Parquet část je Arrow tabulka archivu.
+
+        Returns:
+            tuple: ({formát: str nebo pyarrow.Table}, počet řádků)
+        """
+        json_items = []
+        table_rows = []
+        csv_buffer = io.StringIO()
+        writer = csv.writer(csv_buffer, lineterminator="\n")
+        count = 0
+        for row in rows:
+            if "json" in formats:
+                item = dict(zip(ExportPipeline.FIELDS, row))
+                # Odsazení o úroveň pole jako v ResultsParser.iter_json_chunks
+                json_items.append(
+                    json.dumps(item, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+                )
+            if "csv" in formats:
+                writer.writerow(row)
+            if "parquet" in formats:
+                table_rows.append(row)
+            count += 1
+
+        parts = {}
+        if "json" in formats:
+            parts["json"] = ",\n  ".join(json_items)
+        if "csv" in formats:
+            parts["csv"] = csv_buffer.getvalue()
+        if "parquet" in formats:
+            columns = zip(*table_rows) if table_rows else [[]] * len(ExportPipeline.FIELDS)
+            parts["parquet"] = ResultsParser.archive_table(
+                dict(zip(ExportPipeline.FIELDS, map(list, columns)))
+            )
+        return parts, count
+
+    @staticmethod
+    def process_chunk(path, offset, length, index, formats, part_dir):
+        """
+        Zpracuje jeden blok vstupu (běží v procesu poolu)
+
+        Returns:
+            tuple: (index, {formát: cesta k dílčímu souboru}, počet řádků)
+        """
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read(length)
+
+        records = (json.loads(line) for line in data.splitlines() if line.strip())
+        parts, count = ExportPipeline.serialize_rows(ExportPipeline.iter_rows(records), formats)
+
+        paths = {}
+        for fmt, content in parts.items():
+            if fmt == "parquet":
+                # Blok jako Arrow IPC - hlavní proces ho jen přečte a zapíše do row groups
+                pa = ResultsParser._pyarrow()
+                paths[fmt] = os.path.join(part_dir, f"part-{index:06d}.arrow")
+                with pa.OSFile(paths[fmt], "wb") as sink:
+                    with pa.ipc.new_file(sink, content.schema) as writer:
+                        writer.write_table(content)
+                continue
+            paths[fmt] = os.path.join(part_dir, f"part-{index:06d}.{fmt}")
+            with open(paths[fmt], "w", encoding="utf-8", newline="") as out:
+                out.write(content)
+        return index, paths, count
+
+    def run(self, input_path, outputs, progress=None):
+        """
+        Spustí export
+
+        Rozpracovaných bloků je nejvýše 2× workers. Hotové bloky se do
+        výstupu připojují průběžně, jakmile jsou hotové všechny před nimi,
+        a jejich dílčí soubory se hned mažou.
+
+        Args:
+            input_path: Vstupní JSONL (výstup batch.py)
+            outputs: dict {formát: cesta k výstupu}, formát "json", "csv" nebo "parquet"
+            progress: Stream pro výpis průběhu (None = bez výpisu)
+
+        Returns:
+            dict: Statistika {'chunks', 'rows', 'elapsed'}
+        """
+        unknown = set(outputs) - set(self.FORMATS)
+        if unknown:
+            raise ValueError(f"Nepodporovaný formát exportu: {', '.join(sorted(unknown))}")
+
+        formats = tuple(outputs)
+        stats = {"chunks": 0, "rows": 0, "elapsed": 0.0}
+        started = time.monotonic()
+
+        with tempfile.TemporaryDirectory(prefix="export-parts-") as part_dir:
+            files = {
+                fmt: open(path, "w", encoding="utf-8", newline="")
+                for fmt, path in outputs.items()
+                if fmt != "parquet"
+            }
+            merger = None
+            try:
+                merger = _OrderedMerger(
+                    files, outputs.get("parquet"), self.compression, self.row_group_size
+                )
+
+                def merge(result):
+                    index, paths, count = result
+                    merger.add(index, paths)
+                    stats["chunks"] += 1
+                    stats["rows"] += count
+                    if progress is not None:
+                        progress.write(f"\r[{stats['chunks']} bloků] {stats['rows']} řádků")
+                        progress.flush()
+
+                chunks = self.iter_chunks(input_path, self.chunk_size)
+                if self.workers == 1:
+                    for index, (offset, length) in enumerate(chunks):
+                        merge(
+                            self.process_chunk(
+                                input_path, offset, length, index, formats, part_dir
+                            )
+                        )
+                else:
+                    with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                        pending = set()
+                        for index, (offset, length) in enumerate(chunks):
+                            pending.add(
+                                executor.submit(
+                                    ExportPipeline.process_chunk,
+                                    input_path,
+                                    offset,
+                                    length,
+                                    index,
+                                    formats,
+                                    part_dir,
+                                )
+                            )
+                            if len(pending) >= self.workers * 2:
+                                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                                for future in finished:
+                                    merge(future.result())
+                        for future in wait(pending).done:
+                            merge(future.result())
+                merger.close()
+            finally:
+                for f in files.values():
+                    f.close()
+                if merger is not None and merger.parquet is not None:
+                    merger.parquet.close()
+
+        stats["elapsed"] = time.monotonic() - started
+        if progress is not None:
+            progress.write("\n")
+        return stats
+
+
+class _OrderedMerger:
+    """Připojuje dílčí soubory do výstupů v pořadí indexů bloků
+
+    Parquet bloky se skládají do row groups o row_group_size řádcích,
+    nezávisle na velikosti bloků vstupu.
+    """
+
+    def __init__(self, files, parquet_path=None, compression=None, row_group_size=None):
+        self.files = files
+        self.next_index = 0
+        self.waiting = {}
+        self.empty = {fmt: True for fmt in files}
+
+        if "csv" in files:
+            csv.writer(files["csv"], lineterminator="\n").writerow(ExportPipeline.FIELDS)
+
+        self.parquet = None
+        self.row_group_size = row_group_size
+        self.buffered = []
+        self.buffered_rows = 0
+        if parquet_path is not None:
+            import pyarrow.parquet as pq
+
+            self.parquet = pq.ParquetWriter(
+                parquet_path, ResultsParser.archive_schema(), compression=compression
+            )
+
+    def add(self, index, paths):
+        """Přidá hotový blok, zapíše všechny bloky, které už jsou na řadě"""
+        self.waiting[index] = paths
+        while self.next_index in self.waiting:
+            self._append(self.waiting.pop(self.next_index))
+            self.next_index += 1
+
+    def _append(self, paths):
+        for fmt, path in paths.items():
+            if fmt == "parquet":
+                self._append_table(path)
+                os.remove(path)
+                continue
+            out = self.files[fmt]
+            if os.path.getsize(path):
+                if fmt == "json":
+                    out.write("[\n  " if self.empty[fmt] else ",\n  ")
+                with open(path, encoding="utf-8", newline="") as part:
+                    shutil.copyfileobj(part, out)
+                self.empty[fmt] = False
+            os.remove(path)
+
+    def _append_table(self, path):
+        """Přidá Arrow blok, zapíše všechny celé row groups"""
+        pa = ResultsParser._pyarrow()
+        with pa.OSFile(path, "rb") as source:
+            table = pa.ipc.open_file(source).read_all()
+        self.buffered.append(table)
+        self.buffered_rows += table.num_rows
+
+        if self.buffered_rows >= self.row_group_size:
+            combined = pa.concat_tables(self.buffered)
+            full = self.buffered_rows - self.buffered_rows % self.row_group_size
+            self.parquet.write_table(combined.slice(0, full), row_group_size=self.row_group_size)
+            self.buffered = [combined.slice(full)]
+            self.buffered_rows -= full
+
+    def close(self):
+        """Uzavře JSON pole a zapíše poslední row group"""
+        if self.waiting:
+            raise RuntimeError("Chybí dílčí výstupy některých bloků")
+        if "json" in self.files:
+            self.files["json"].write("[]" if self.empty["json"] else "\n]")
+        if self.parquet is not None and self.buffered_rows:
+            pa = ResultsParser._pyarrow()
+            self.parquet.write_table(
+                pa.concat_tables(self.buffered), row_group_size=self.row_group_size
+            )
+            self.buffered = []
+            self.buffered_rows = 0
+
+
+def main(argv=None):
+    """Hlavní funkce exportu z příkazové řádky"""
+    parser = argparse.ArgumentParser(
+        description="Paralelní export JSONL z batch.py do JSON/CSV/Parquet"
+    )
+    parser.add_argument("input", help="Vstupní JSONL (výstup batch.py)")
+    parser.add_argument("--json", help="Výstupní JSON soubor")
+    parser.add_argument("--csv", help="Výstupní CSV soubor")
+    parser.add_argument("--parquet", help="Výstupní Parquet soubor (vyžaduje pyarrow)")
+    parser.add_argument(
+        "--compression",
+        default=ResultsParser.PARQUET_COMPRESSION,
+        help="Komprese Parquet (zstd, snappy, gzip, lz4, none; výchozí zstd)",
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=ResultsParser.PARQUET_ROW_GROUP_SIZE,
+        help="Řádků v jedné row group Parquet (výchozí 100000)",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="Počet procesů (výchozí počet jader)"
+    )
+    parser.add_argument(
+        "-c",
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help="Záznamů v jednom bloku (výchozí 1000)",
+    )
+    args = parser.parse_args(argv)
+
+    outputs = {fmt: getattr(args, fmt) for fmt in ExportPipeline.FORMATS if getattr(args, fmt)}
+    if not outputs:
+        parser.error("Zadejte alespoň jeden výstup (--json, --csv nebo --parquet)")
+
+    pipeline = ExportPipeline(
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        compression=args.compression,
+        row_group_size=args.row_group_size,
+    )
+    stats = pipeline.run(args.input, outputs, progress=sys.stderr)
+
+    rate = stats["rows"] / stats["elapsed"] if stats["elapsed"] > 0 else 0.0
+    print(
+        f"✅ Hotovo: {stats['rows']} řádků v {stats['chunks']} blocích ({rate:.0f} řádků/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
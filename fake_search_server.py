@@ -0,0 +1,303 @@
+"""
+Lokální náhrada Google Custom Search API pro zátěžové a latenční testy
+
+Implementuje GET /customsearch/v1 (cse.list) včetně parametrů
+q, cx, num, start, lr a gl. Latence, chybovost i denní kvóta jsou
+konfigurovatelné, takže jde měřit throughput, retry a timeouty bez
+spotřeby skutečné kvóty a bez přístupu k internetu.
+
+Použití:
+    python fake_search_server.py --port 8808 --latency lognormal:-3,0.5 --error-rate 0.01
+    SEARCH_API_ENDPOINT=http://127.0.0.1:8808/ streamlit run main.py
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class LatencyModel:
+    """Rozdělení latence odpovědí
+
+    Zápis specifikace:
+    - "fixed:0.05" - vždy 50 ms
+    - "uniform:0.01,0.2" - rovnoměrně 10-200 ms
+    - "normal:0.1,0.02" - normální rozdělení (průměr, směrodatná odchylka)
+    - "lognormal:-3,0.5" - log-normální (mu, sigma), typický tvar latence sítě
+    """
+
+    def __init__(self, kind="fixed", params=(0.0,), rng=None):
+        self.kind = kind
+        self.params = tuple(params)
+        self.rng = rng or random.Random()
+
+    @classmethod
+    def parse(cls, spec, rng=None):
+        """Vytvoří model ze zápisu "typ:param1,param2" """
+        kind, _, raw = spec.partition(":")
+        params = tuple(float(p) for p in raw.split(",")) if raw else (0.0,)
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Neznámé rozdělení latence: {kind}")
+        return cls(kind, params, rng)
+
+    def sample(self):
+        """Vrátí jednu latenci v sekundách"""
+        if self.kind == "fixed":
+            value = self.params[0]
+        elif self.kind == "uniform":
+            value = self.rng.uniform(*self.params)
+        elif self.kind == "normal":
+            value = self.rng.gauss(*self.params)
+        else:
+            value = self.rng.lognormvariate(*self.params)
+        return max(value, 0.0)
+
+
+class FakeSearchServer:
+    """HTTP server napodobující Custom Search JSON API"""
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        latency="fixed:0",
+        error_rate=0.0,
+        rate_limit_rate=0.0,
+        daily_quota=None,
+        total_results=100,
+        seed=None,
+    ):
+        """Inicializace serveru
+
+        Args:
+            host: Adresa pro naslouchání
+            port: Port (0 = libovolný volný)
+            latency: Specifikace LatencyModel
+            error_rate: Pravděpodobnost odpovědi 500/503
+            rate_limit_rate: Pravděpodobnost odpovědi 429 rateLimitExceeded
+            daily_quota: Počet úspěšných dotazů, po kterém přijde 403 dailyLimitExceeded
+            total_results: Počet výsledků, které "existují" pro každý dotaz
+            seed: Seed náhodného generátoru (pro reprodukovatelné běhy)
+        """
+        self.rng = random.Random(seed)
+        self.latency = LatencyModel.parse(latency, self.rng)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.daily_quota = daily_quota
+        self.total_results = total_results
+
+        self._lock = threading.Lock()
+        self.stats = {}
+        self.reset()
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        """Base URL pro SEARCH_API_ENDPOINT / client_options.api_endpoint"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def reset(self):
+        """Vynuluje statistiky a spotřebovanou kvótu"""
+        with self._lock:
+            self.stats = {"requests": 0, "quota_used": 0, "connections": 0, "statuses": {}}
+
+    def start(self):
+        """Spustí server ve vlákně na pozadí"""
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Zastaví server"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _record(self, status):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["statuses"][status] = self.stats["statuses"].get(status, 0) + 1
+
+    def _error(self, status, reason, message):
+        """Tělo chyby ve formátu Google API"""
+        return status, {
+            "error": {
+                "code": status,
+                "message": message,
+                "errors": [{"domain": "usageLimits", "reason": reason, "message": message}],
+            }
+        }
+
+    def handle_list(self, params):
+        """
+        Zpracuje jeden cse.list požadavek
+
+        Args:
+            params: dict query parametrů (první hodnota každého)
+
+        Returns:
+            tuple: (HTTP status, JSON tělo)
+        """
+        if not params.get("key"):
+            return self._error(403, "forbidden", "Method doesn't allow unregistered callers")
+        if not params.get("cx"):
+            return self._error(400, "invalid", "Invalid Value: cx")
+
+        num = int(params.get("num", 10))
+        start = int(params.get("start", 1))
+        if not 1 <= num <= 10:
+            return self._error(400, "invalid", "Invalid Value: num")
+        if start < 1 or start + num - 1 > 100:
+            return self._error(400, "invalid", "Invalid Value: start")
+
+        roll = self.rng.random()
+        if roll < self.error_rate:
+            return self._error(self.rng.choice([500, 503]), "backendError", "Backend Error")
+        if roll < self.error_rate + self.rate_limit_rate:
+            return self._error(429, "rateLimitExceeded", "Rate Limit Exceeded")
+
+        with self._lock:
+            if self.daily_quota is not None and self.stats["quota_used"] >= self.daily_quota:
+                return self._error(403, "dailyLimitExceeded", "Daily Limit Exceeded")
+            self.stats["quota_used"] += 1
+
+        return 200, self.search_response(params, num, start)
+
+    def search_response(self, params, num, start):
+        """Vygeneruje deterministickou odpověď pro daný dotaz a lokalizaci"""
+        query = params.get("q", "")
+        language = params.get("lr", "lang_en").replace("lang_", "")
+        country = params.get("gl", "us").lower()
+        digest = hashlib.sha1(f"{query}|{language}|{country}".encode("utf-8")).hexdigest()[:8]
+
+        last = min(start + num - 1, self.total_results)
+        items = [
+            {
+                "kind": "customsearch#result",
+                "title": f"{query} - výsledek {i} ({language}-{country})",
+                "link": f"https://{digest}-{i % 7}.example.{country}/{language}/{i}",
+                "displayLink": f"{digest}-{i % 7}.example.{country}",
+                "snippet": f"Syntetický výsledek {i} pro dotaz {query}.",
+                "htmlSnippet": f"Syntetický výsledek {i} pro dotaz <b>{query}</b>.",
+                "formattedUrl": f"https://{digest}-{i % 7}.example.{country}/{language}/{i}",
+                "pagemap": {"metatags": [{"og:title": f"{query} {i}"}]},
+            }
+            for i in range(start, last + 1)
+        ]
+
+        response = {
+            "kind": "customsearch#search",
+            "queries": {
+                "request": [
+                    {
+                        "searchTerms": query,
+                        "count": len(items),
+                        "startIndex": start,
+                        "language": params.get("lr", ""),
+                        "gl": params.get("gl", ""),
+                        "cx": params.get("cx"),
+                    }
+                ]
+            },
+            "searchInformation": {
+                "searchTime": 0.1,
+                "totalResults": str(self.total_results),
+            },
+        }
+        if items:
+            response["items"] = items
+        return response
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 kvůli keep-alive spojením (měření znovupoužití spojení)
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.stats["connections"] += 1
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+                if url.path.rstrip("/") == "/customsearch/v1":
+                    time.sleep(server.latency.sample())
+                    status, body = server.handle_list(params)
+                elif url.path == "/stats":
+                    with server._lock:
+                        status, body = 200, json.loads(json.dumps(server.stats))
+                else:
+                    status, body = 404, {"error": {"code": 404, "message": "Not Found"}}
+
+                server._record(status)
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                # Bez výpisu každého požadavku (zátěžové testy)
+                pass
+
+        return Handler
+
+
+def main(argv=None):
+    """Spustí fake server z příkazové řádky"""
+    parser = argparse.ArgumentParser(description="Lokální náhrada Google Custom Search API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8808)
+    parser.add_argument("--latency", default="fixed:0", help='Např. "lognormal:-3,0.5"')
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Podíl odpovědí 5xx")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Podíl odpovědí 429")
+    parser.add_argument("--daily-quota", type=int, default=None, help="Limit dotazů (403 potom)")
+    parser.add_argument("--total-results", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = FakeSearchServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        daily_quota=args.daily_quota,
+        total_results=args.total_results,
+        seed=args.seed,
+    )
+    print(f"🧪 Fake Custom Search API běží na {server.endpoint} (Ctrl+C pro ukončení)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,20 +3,49 @@ Jednoduchá vyhledávací aplikace
 Objektový přístup - Streamlit + Requests + BeautifulSoup
 """
 
-import json
+import os
 
 import streamlit as st
 
+from metrics import start_http_server
+from results_parser import ResultsParser
 from search_service import SearchService
 from ui import SearchUI
 
 
+@st.cache_resource
+def start_metrics_exporter(port):
+    """Spustí Prometheus exporter jednou za proces (ne při každém rerunu)"""
+    return start_http_server(port, lambda: SearchService.get_metrics().render())
+
+
+@st.cache_resource
+def get_search_service():
+    """SearchService se vytvoří jednou za proces (ne při každém rerunu)"""
+    return SearchService()
+
+
+def get_ui():
+    """SearchUI se vytvoří jednou za relaci, při rerunu se jen nastaví stránka"""
+    ui = st.session_state.get("ui")
+    if ui is None:
+        ui = st.session_state.ui = SearchUI()
+    else:
+        ui.setup_page()
+    return ui
+
+
 def main():
     """Hlavní funkce aplikace"""
 
-    # Inicializace komponent
-    ui = SearchUI()
-    search_service = SearchService()
+    # Exporter metrik pro Prometheus (volitelný)
+    metrics_port = os.getenv("SEARCH_METRICS_PORT")
+    if metrics_port:
+        start_metrics_exporter(int(metrics_port))
+
+    # Inicializace komponent (znovupoužité mezi reruny)
+    ui = get_ui()
+    search_service = get_search_service()
 
     # Vykreslení UI
     ui.render_header()
@@ -30,24 +59,69 @@ def main():
     # Nastavení počtu výsledků
     results_count = ui.render_results_count()
 
+    # Porovnání více jazyků (volitelné)
+    compare_languages = ui.render_compare_locales()
+    # Jeden vybraný jazyk k porovnání - obyčejné vyhledávání v tomto jazyce
+    if len(compare_languages) == 1:
+        language = compare_languages[0]
+
     # Tlačítko vyhledat
     if ui.render_search_button():
         if query and query.strip():
-            with ui.show_loading():
-                # Vyhledání s lokalizací (staticmethod s cache)
-                results_dict = SearchService.google_search(
-                    search_service.api_key,
-                    search_service.cx,
-                    query,
-                    results_count,
-                    language=language
-                )
-
-                # Uložení do session state
-                st.session_state.results_json = json.dumps(
-                    results_dict, ensure_ascii=False, indent=2
-                )
-                st.session_state.query = query
+            if len(compare_languages) > 1:
+                for compared in compare_languages:
+                    SearchService.get_metrics().searches.inc(language=compared)
+                with ui.show_loading("Vyhledávám ve všech jazycích..."):
+                    # Všechny jazyky souběžně, výsledky zarovnané podle URL
+                    responses = SearchService.google_search_locales(
+                        search_service.api_key,
+                        search_service.cx,
+                        SearchService.clean_query(query),
+                        results_count,
+                        tuple(compare_languages),
+                    )
+                    st.session_state.comparison = ResultsParser.compare_locales(responses)
+                    st.session_state.results = None
+                    st.session_state.movements = None
+                    for compared, response in responses.items():
+                        SearchService.record_history(
+                            query, compared, ResultsParser.parse_google_api_response(response)
+                        )
+                    st.session_state.query = query
+            else:
+                SearchService.get_metrics().searches.inc(language=language)
+                with ui.show_loading():
+                    # Vyhledání s lokalizací (staticmethod s cache)
+                    # Klíče cache dotaz normalizují ("Python " a "python" sdílí záznam),
+                    # do API jde s původní velikostí písmen (operátory OR, AND)
+                    results_dict = SearchService.google_search(
+                        search_service.api_key,
+                        search_service.cx,
+                        SearchService.clean_query(query),
+                        results_count,
+                        language=language
+                    )
+
+                    # Uložení do session state - parsuje se jen jednou,
+                    # při dalších rerunech se pracuje s hotovým seznamem
+                    st.session_state.results = ResultsParser.parse_google_api_response(
+                        results_dict
+                    )
+                    st.session_state.results_digest = ResultsParser.results_digest(
+                        st.session_state.results
+                    )
+                    st.session_state.comparison = None
+                    st.session_state.query = query
+                    st.session_state.language = language
+
+                    # Snímek do historie pořadí a změny oproti minulému
+                    st.session_state.movements = None
+                    if SearchService.record_history(query, language, st.session_state.results):
+                        history = SearchService.get_history()
+                        st.session_state.movements = (
+                            history.movements(query, language),
+                            history.history(query, language, days=90),
+                        )
 
             # Zobrazení úspěšné zprávy
             ui.show_success(f"✅ Vyhledávání dokončeno")
@@ -55,10 +129,29 @@ def main():
         else:
             ui.show_error("⚠️ Zadejte vyhledávací dotaz!")
 
-    # Zobrazení výsledků (pokud existují v session_state) a export tlačítka (pokud existují výsledky)
-    if hasattr(st.session_state, "results_json") and st.session_state.results_json:
-        ui.render_results(st.session_state.results_json)
-        ui.render_export_buttons(st.session_state.results_json, st.session_state.query)
+    # Zobrazení výsledků (pokud existují v session_state) a export - jako fragment,
+    # stránkování ani výběr formátu nespouští celou aplikaci znovu
+    if st.session_state.get("results") is not None:
+        ui.render_results_section(
+            st.session_state.results,
+            st.session_state.query,
+            st.session_state.get("language", ""),
+            st.session_state.get("results_digest"),
+        )
+
+    # Změny pořadí oproti předchozímu snímku (s historií pořadí)
+    if st.session_state.get("movements") is not None:
+        movements, history = st.session_state.movements
+        ui.render_rank_movements(movements, history, st.session_state.query)
+
+    # Porovnání jazyků (pokud bylo spuštěné) a jeho export
+    if st.session_state.get("comparison") is not None:
+        ui.render_comparison(st.session_state.comparison)
+        ui.render_comparison_export(st.session_state.comparison, st.session_state.query)
+
+    # Admin panel s metrikami (cache, latence API, chyby, kvóta)
+    if os.getenv("SEARCH_ADMIN_PANEL", "").lower() in ("1", "true", "yes"):
+        ui.render_metrics_panel(SearchService.get_metrics().summary())
 
 
 if __name__ == "__main__":
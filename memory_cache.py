@@ -0,0 +1,191 @@
+"""
+Komprimovaná cache odpovědí v paměti procesu s limitem velikosti
+"""
+
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+try:
+    from compression import zstd as _zstd  # Python 3.14+
+except ImportError:
+    try:
+        import zstandard as _zstd
+    except ImportError:
+        _zstd = None
+
+
+class MemoryCache:
+    """LRU cache serializovaných a komprimovaných odpovědí s rozpočtem v bajtech
+
+    Na rozdíl od st.cache_data (limit jen TTL, v paměti celé Python
+    dicty) se každá odpověď uloží jako komprimovaný JSON a počítá se
+    její skutečná velikost. Když součet překročí max_bytes, mažou se
+    nejdéle nepoužité záznamy, dokud se rozpočet nevejde - paměť repliky
+    tak zůstává předvídatelná i při dlouhém chvostu různých dotazů.
+    Záznam větší než max_entry_bytes se vůbec neuloží, aby jedna velká
+    odpověď nevytlačila stovky malých.
+    """
+
+    # Odhad režie jednoho záznamu (klíč, položka OrderedDict, n-tice) v bajtech
+    ENTRY_OVERHEAD = 200
+
+    # Podporované kodeky komprese
+    CODECS = ("zstd", "zlib")
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, ttl=3600, codec="auto", max_entry_bytes=None):
+        """Inicializace cache
+
+        Args:
+            max_bytes: Rozpočet paměti pro všechny záznamy v bajtech
+            ttl: Platnost záznamu v sekundách
+            codec: "zstd", "zlib" nebo "auto" (zstd, pokud je k dispozici)
+            max_entry_bytes: Největší ukládaný záznam (výchozí max_bytes / 8)
+        """
+        if codec == "auto":
+            codec = "zstd" if _zstd is not None else "zlib"
+        if codec not in self.CODECS:
+            raise ValueError(f"Neznámý kodek komprese: {codec}")
+        if codec == "zstd" and _zstd is None:
+            raise ImportError("zstandard není nainstalován (pip install zstandard)")
+
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.codec = codec
+        self.max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else max_bytes // 8
+        # key -> (komprimovaná data, velikost JSON, čas uložení)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._raw_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls):
+        """Vytvoří cache podle environment proměnných
+
+        - SEARCH_MEMORY_CACHE_MB: rozpočet paměti v MB (výchozí 64)
+        - SEARCH_MEMORY_CACHE_TTL: platnost záznamu v sekundách (výchozí 3600)
+        - SEARCH_MEMORY_CACHE_CODEC: zstd, zlib nebo auto (výchozí auto)
+        """
+        return cls(
+            max_bytes=int(float(os.getenv("SEARCH_MEMORY_CACHE_MB", "64")) * 1024 * 1024),
+            ttl=int(os.getenv("SEARCH_MEMORY_CACHE_TTL", "3600")),
+            codec=os.getenv("SEARCH_MEMORY_CACHE_CODEC", "auto"),
+        )
+
+    def _compress(self, data):
+        if self.codec == "zstd":
+            return _zstd.compress(data)
+        return zlib.compress(data, 6)
+
+    def _decompress(self, data):
+        if self.codec == "zstd":
+            return _zstd.decompress(data)
+        return zlib.decompress(data)
+
+    def _size(self, key, blob):
+        """Velikost záznamu započítaná do rozpočtu"""
+        return len(blob) + len(key) + self.ENTRY_OVERHEAD
+
+    def _remove(self, key):
+        blob, raw_size, _ = self._entries.pop(key)
+        self._bytes -= self._size(key, blob)
+        self._raw_bytes -= raw_size
+
+    def get(self, key):
+        """
+        Načte záznam z cache
+
+        Args:
+            key: Klíč záznamu (např. ResultCache.make_key)
+
+        Returns:
+            Uložená hodnota (nová kopie) nebo None, pokud chybí nebo vypršela
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            blob, _, created_at = entry
+            if time.time() - created_at > self.ttl:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        # Dekomprese a parsování mimo zámek
+        return json.loads(self._decompress(blob))
+
+    def set(self, key, value):
+        """
+        Uloží hodnotu do cache a uvolní místo nejdéle nepoužitými záznamy
+
+        Args:
+            key: Klíč záznamu
+            value: JSON serializovatelná hodnota
+
+        Returns:
+            bool: False, pokud je záznam větší než max_entry_bytes a neuložil se
+        """
+        raw = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        blob = self._compress(raw)
+        size = self._size(key, blob)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_entry_bytes:
+                self.rejected += 1
+                return False
+
+            self._entries[key] = (blob, len(raw), time.time())
+            self._bytes += size
+            self._raw_bytes += len(raw)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return True
+
+    def clear(self):
+        """Smaže všechny záznamy"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._raw_bytes = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self):
+        """
+        Využití paměti a úspěšnost cache
+
+        Returns:
+            dict: {'entries', 'bytes', 'max_bytes', 'raw_bytes', 'ratio',
+                   'hits', 'misses', 'evictions', 'rejected', 'codec'}
+                  - bytes je započítaná velikost v paměti, raw_bytes velikost
+                  nekomprimovaného JSON, ratio kompresní poměr
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "raw_bytes": self._raw_bytes,
+                "ratio": self._raw_bytes / self._bytes if self._bytes else None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "rejected": self.rejected,
+                "codec": self.codec,
+            }
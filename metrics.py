@@ -0,0 +1,345 @@
+"""
+Metriky vyhledávání (cache, latence API, chyby, kvóta) ve formátu Prometheus
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _escape(value):
+    """Escapování hodnoty labelu podle Prometheus text formátu"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotónně rostoucí čítač s labely (thread-safe)"""
+
+    type_name = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def inc(self, amount=1, **labels):
+        """Zvýší čítač pro danou kombinaci labelů"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """Aktuální hodnota pro danou kombinaci labelů"""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def values(self):
+        """Kopie všech hodnot {labely: hodnota}"""
+        with self._lock:
+            return dict(self._values)
+
+    def samples(self):
+        """Řádky pro Prometheus výstup"""
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+            for key, value in sorted(self.values().items())
+        ]
+
+
+class Gauge:
+    """Okamžitá hodnota počítaná při čtení (např. zbývající kvóta)"""
+
+    type_name = "gauge"
+
+    def __init__(self, name, help_text, func):
+        self.name = name
+        self.help = help_text
+        self.func = func
+
+    def value(self):
+        return self.func()
+
+    def samples(self):
+        return [f"{self.name} {self.value()}"]
+
+
+class FuncCounter(Gauge):
+    """Čítač, jehož hodnotu počítá jiný objekt (čte se při vykreslení)"""
+
+    type_name = "counter"
+
+
+class Histogram:
+    """Histogram hodnot (latencí) s labely a pevnými hranicemi bucketů"""
+
+    type_name = "histogram"
+
+    DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """Zaznamená jednu hodnotu"""
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.setdefault(
+                key, {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            )
+            series["counts"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Změří dobu běhu bloku (i když skončí výjimkou)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def series(self):
+        """Kopie dat {labely: {'counts', 'sum', 'count'}}"""
+        with self._lock:
+            return {
+                key: {"counts": list(s["counts"]), "sum": s["sum"], "count": s["count"]}
+                for key, s in self._series.items()
+            }
+
+    def quantile(self, q, **labels):
+        """
+        Odhad kvantilu z bucketů (horní hranice bucketu, kde kvantil leží)
+
+        Returns:
+            float nebo None, pokud nejsou data
+        """
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        series = self.series().get(key)
+        if not series or not series["count"]:
+            return None
+
+        target = q * series["count"]
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), series["counts"]):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return float("inf")  # pragma: no cover - cumulative vždy dosáhne count
+
+    def samples(self):
+        lines = []
+        for key, series in sorted(self.series().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series["counts"]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {series['sum']}")
+            lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Sada metrik vykreslitelná do Prometheus text formátu"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, func):
+        return self.register(Gauge(name, help_text, func))
+
+    def func_counter(self, name, help_text, func):
+        return self.register(FuncCounter(name, help_text, func))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=Histogram.DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self):
+        """Vykreslí všechny metriky (Prometheus text format 0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+class SearchMetrics:
+    """Metriky vyhledávací služby"""
+
+    def __init__(self, quota_remaining=None, memory_stats=None):
+        """Inicializace metrik
+
+        Args:
+            quota_remaining: Funkce vracející zbývající denní kvótu (pro gauge)
+            memory_stats: Funkce vracející MemoryCache.stats() (pro gauge využití paměti)
+        """
+        self.registry = MetricsRegistry()
+        self.searches = self.registry.counter(
+            "search_requests_total", "Vyhledávání spuštěná uživatelem", ["language"]
+        )
+        self.cache_requests = self.registry.counter(
+            "search_cache_requests_total", "Dotazy do cache podle vrstvy a výsledku",
+            ["layer", "result"],
+        )
+        self.coalesced = self.registry.counter(
+            "search_coalesced_requests_total",
+            "Dotazy, které převzaly výsledek souběžného stejného dotazu",
+        )
+        self.api_requests = self.registry.counter(
+            "search_api_requests_total", "Volání Custom Search API (= spotřebovaná kvóta)",
+            ["language"],
+        )
+        self.api_errors = self.registry.counter(
+            "search_api_errors_total", "Chyby volání API podle důvodu", ["reason"]
+        )
+        self.api_latency = self.registry.histogram(
+            "search_api_latency_seconds", "Latence jednoho volání API", ["language"]
+        )
+        if quota_remaining is not None:
+            self.quota_remaining = self.registry.gauge(
+                "search_quota_remaining", "Zbývající denní kvóta API", quota_remaining
+            )
+        self.memory_stats = memory_stats
+        if memory_stats is not None:
+            self.registry.gauge(
+                "search_memory_cache_bytes",
+                "Velikost komprimovaných záznamů paměťové cache v bajtech",
+                lambda: memory_stats()["bytes"],
+            )
+            self.registry.gauge(
+                "search_memory_cache_max_bytes",
+                "Rozpočet paměťové cache v bajtech",
+                lambda: memory_stats()["max_bytes"],
+            )
+            self.registry.gauge(
+                "search_memory_cache_entries",
+                "Počet záznamů v paměťové cache",
+                lambda: memory_stats()["entries"],
+            )
+            self.registry.func_counter(
+                "search_memory_cache_evictions_total",
+                "Záznamy vytlačené z paměťové cache kvůli rozpočtu",
+                lambda: memory_stats()["evictions"],
+            )
+
+    def render(self):
+        """Prometheus text výstup"""
+        return self.registry.render()
+
+    def cache_counts(self, layer):
+        """
+        Počet hitů a missů cache ve vrstvě
+
+        Returns:
+            tuple: (hits, misses)
+        """
+        misses = self.cache_requests.value(layer=layer, result="miss")
+        # Prošlý záznam vrácený hned (stale-while-revalidate) je také hit
+        hits = self.cache_requests.value(layer=layer, result="hit") + self.cache_requests.value(
+            layer=layer, result="stale"
+        )
+        return hits, misses
+
+    def hit_rate(self, layer):
+        """Podíl cache hitů ve vrstvě (None, pokud vrstva nemá data)"""
+        hits, misses = self.cache_counts(layer)
+        return hits / (hits + misses) if hits + misses else None
+
+    def summary(self):
+        """
+        Souhrn pro admin panel
+
+        Returns:
+            dict: {'searches', 'cache', 'coalesced', 'api_requests', 'errors',
+                   'latency', 'quota_remaining', 'memory_cache'}
+        """
+        cache = {}
+        for layer, _ in self.cache_requests.values():
+            hits, misses = self.cache_counts(layer)
+            cache[layer] = {"hit": hits, "miss": misses, "hit_rate": self.hit_rate(layer)}
+
+        latency = {}
+        for (language,), series in self.api_latency.series().items():
+            latency[language] = {
+                "count": series["count"],
+                "avg": series["sum"] / series["count"] if series["count"] else 0.0,
+                "p95": self.api_latency.quantile(0.95, language=language),
+            }
+
+        return {
+            "searches": sum(self.searches.values().values()),
+            "cache": cache,
+            "coalesced": self.coalesced.value(),
+            "api_requests": sum(self.api_requests.values().values()),
+            "errors": {reason: value for (reason,), value in self.api_errors.values().items()},
+            "latency": latency,
+            "quota_remaining": (
+                self.quota_remaining.value() if hasattr(self, "quota_remaining") else None
+            ),
+            "memory_cache": self.memory_stats() if self.memory_stats is not None else None,
+        }
+
+
+def start_http_server(port, render, addr="0.0.0.0"):
+    """
+    Spustí exporter metrik na pozadí (GET /metrics)
+
+    Args:
+        port: Port exporteru
+        render: Funkce vracející Prometheus text (volá se při každém scrapu)
+        addr: Adresa pro naslouchání
+
+    Returns:
+        ThreadingHTTPServer (zastaví se přes shutdown())
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            payload = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((addr, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
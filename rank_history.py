@@ -0,0 +1,302 @@
+"""
+Historie pořadí výsledků vyhledávání
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+
+from result_cache import ResultCache
+
+
+class RankHistory:
+    """Lokální SQLite úložiště denních snímků pořadí
+
+    Každé vyhledávání se uloží jako snímek (dotaz, jazyk, den) a pořadí
+    každé URL se indexuje podle (query, language, day, url). Změna pořadí
+    oproti předchozímu snímku se spočítá už při zápisu (prev_rank), takže
+    pohyby i historie URL se čtou jen z indexů bez přepočtu.
+    """
+
+    def __init__(self, path):
+        """Inicializace úložiště
+
+        Args:
+            path: Cesta k SQLite souboru (adresář se vytvoří automaticky)
+        """
+        self.path = path
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        conn = self._connect()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                query TEXT NOT NULL,
+                language TEXT NOT NULL,
+                day TEXT NOT NULL,
+                prev_day TEXT,
+                result_count INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (query, language, day)
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ranks (
+                query TEXT NOT NULL,
+                language TEXT NOT NULL,
+                day TEXT NOT NULL,
+                url TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                prev_rank INTEGER,
+                PRIMARY KEY (query, language, day, url)
+            ) WITHOUT ROWID
+            """
+        )
+        # Historie jedné URL napříč dny ("pořadí URL X pro dotaz Y za 90 dní")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ranks_url ON ranks (url, query, language, day)"
+        )
+
+    @classmethod
+    def from_env(cls):
+        """Vytvoří úložiště podle SEARCH_HISTORY_PATH (None, pokud není nastavená)"""
+        path = os.getenv("SEARCH_HISTORY_PATH")
+        return cls(path) if path else None
+
+    def _connect(self):
+        """Vrátí SQLite spojení pro aktuální vlákno a proces"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def record(self, query, language, results, day=None):
+        """
+        Uloží snímek pořadí a spočítá změny oproti předchozímu snímku
+
+        Opakovaný zápis stejného dne snímek nahradí. Zápis staršího dne
+        (dodatečný import) přepočítá změny následujícího snímku.
+
+        Args:
+            query: Vyhledávací dotaz (normalizuje se jako klíč cache)
+            language: Jazyk výsledků
+            results: ResultSet nebo iterovatelné dictů s rank, title, link
+            day: Den snímku (date nebo ISO string, výchozí dnes)
+
+        Returns:
+            int: Počet uložených URL
+        """
+        query = ResultCache.normalize_query(query)
+        if day is None:
+            day = date.today()
+        if not isinstance(day, str):
+            day = day.isoformat()
+
+        # Stejná URL v jednom snímku jen jednou, na nejlepší pozici
+        rows = {}
+        for result in results:
+            link = result.get("link", "")
+            if link and link not in rows:
+                rows[link] = (result.get("rank"), result.get("title", ""))
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            prev_day = self._neighbour_day(conn, query, language, day, "<")
+            prev = self._ranks(conn, query, language, prev_day)
+
+            conn.execute(
+                "DELETE FROM ranks WHERE query = ? AND language = ? AND day = ?",
+                (query, language, day),
+            )
+            conn.executemany(
+                "INSERT INTO ranks (query, language, day, url, rank, title, prev_rank) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (query, language, day, url, rank, title, prev.get(url))
+                    for url, (rank, title) in rows.items()
+                ],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots "
+                "(query, language, day, prev_day, result_count, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (query, language, day, prev_day, len(rows), time.time()),
+            )
+
+            next_day = self._neighbour_day(conn, query, language, day, ">")
+            if next_day is not None:
+                self._relink(conn, query, language, next_day, day)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+    @staticmethod
+    def _neighbour_day(conn, query, language, day, op):
+        """Nejbližší den snímku před (op="<") nebo po (op=">") daném dni"""
+        func = "MAX" if op == "<" else "MIN"
+        (value,) = conn.execute(
+            f"SELECT {func}(day) FROM snapshots WHERE query = ? AND language = ? AND day {op} ?",
+            (query, language, day),
+        ).fetchone()
+        return value
+
+    @staticmethod
+    def _ranks(conn, query, language, day):
+        """Pořadí URL v jednom snímku {url: rank}"""
+        if day is None:
+            return {}
+        return dict(
+            conn.execute(
+                "SELECT url, rank FROM ranks WHERE query = ? AND language = ? AND day = ?",
+                (query, language, day),
+            )
+        )
+
+    @staticmethod
+    def _relink(conn, query, language, day, prev_day):
+        """Přepočítá prev_rank snímku `day` vůči snímku `prev_day`"""
+        conn.execute(
+            "UPDATE ranks SET prev_rank = (SELECT p.rank FROM ranks p WHERE p.query = ranks.query "
+            "AND p.language = ranks.language AND p.day = ? AND p.url = ranks.url) "
+            "WHERE query = ? AND language = ? AND day = ?",
+            (prev_day, query, language, day),
+        )
+        conn.execute(
+            "UPDATE snapshots SET prev_day = ? WHERE query = ? AND language = ? AND day = ?",
+            (prev_day, query, language, day),
+        )
+
+    def days(self, query, language):
+        """Dny, pro které existuje snímek (vzestupně)"""
+        rows = self._connect().execute(
+            "SELECT day FROM snapshots WHERE query = ? AND language = ? ORDER BY day",
+            (ResultCache.normalize_query(query), language),
+        )
+        return [day for (day,) in rows]
+
+    def movements(self, query, language, day=None):
+        """
+        Vrátí změny pořadí ve snímku oproti předchozímu snímku
+
+        Args:
+            query: Vyhledávací dotaz
+            language: Jazyk výsledků
+            day: Den snímku (výchozí poslední)
+
+        Returns:
+            list: dicty {'url', 'title', 'rank', 'prev_rank', 'change', 'status'}
+                  - change > 0 znamená zlepšení, status je "new", "up",
+                  "down", "same" nebo "dropped" (URL z předchozího snímku
+                  chybí; ty jsou na konci)
+        """
+        query = ResultCache.normalize_query(query)
+        conn = self._connect()
+        if day is None:
+            (day,) = conn.execute(
+                "SELECT MAX(day) FROM snapshots WHERE query = ? AND language = ?",
+                (query, language),
+            ).fetchone()
+        row = conn.execute(
+            "SELECT prev_day FROM snapshots WHERE query = ? AND language = ? AND day = ?",
+            (query, language, day),
+        ).fetchone()
+        if row is None:
+            return []
+        (prev_day,) = row
+
+        movements = []
+        current = set()
+        for url, title, rank, prev_rank in conn.execute(
+            "SELECT url, title, rank, prev_rank FROM ranks "
+            "WHERE query = ? AND language = ? AND day = ? ORDER BY rank",
+            (query, language, day),
+        ):
+            current.add(url)
+            if prev_rank is None:
+                change, status = None, "new"
+            else:
+                change = prev_rank - rank
+                status = "up" if change > 0 else "down" if change < 0 else "same"
+            movements.append(
+                {
+                    "url": url,
+                    "title": title,
+                    "rank": rank,
+                    "prev_rank": prev_rank,
+                    "change": change,
+                    "status": status,
+                }
+            )
+
+        if prev_day is not None:
+            for url, title, prev_rank in conn.execute(
+                "SELECT url, title, rank FROM ranks "
+                "WHERE query = ? AND language = ? AND day = ? ORDER BY rank",
+                (query, language, prev_day),
+            ):
+                if url not in current:
+                    movements.append(
+                        {
+                            "url": url,
+                            "title": title,
+                            "rank": None,
+                            "prev_rank": prev_rank,
+                            "change": None,
+                            "status": "dropped",
+                        }
+                    )
+        return movements
+
+    def url_history(self, url, query, language, days=90, until=None):
+        """
+        Historie pořadí jedné URL pro dotaz (z indexu podle URL)
+
+        Args:
+            url: Sledovaná URL
+            query: Vyhledávací dotaz
+            language: Jazyk výsledků
+            days: Počet dní zpětně
+            until: Poslední den (výchozí dnes)
+
+        Returns:
+            list: [(den, pořadí)] vzestupně podle dne (jen dny, kdy URL byla ve výsledcích)
+        """
+        until = until or date.today()
+        since = (until - timedelta(days=days)).isoformat()
+        return self._connect().execute(
+            "SELECT day, rank FROM ranks WHERE url = ? AND query = ? AND language = ? "
+            "AND day > ? AND day <= ? ORDER BY day",
+            (url, ResultCache.normalize_query(query), language, since, until.isoformat()),
+        ).fetchall()
+
+    def history(self, query, language, days=90, until=None):
+        """
+        Pořadí všech URL dotazu za posledních `days` dní (z primárního klíče)
+
+        Returns:
+            dict: {url: [(den, pořadí)]} vzestupně podle dne
+        """
+        until = until or date.today()
+        since = (until - timedelta(days=days)).isoformat()
+        history = {}
+        for day, url, rank in self._connect().execute(
+            "SELECT day, url, rank FROM ranks WHERE query = ? AND language = ? "
+            "AND day > ? AND day <= ? ORDER BY day",
+            (ResultCache.normalize_query(query), language, since, until.isoformat()),
+        ):
+            history.setdefault(url, []).append((day, rank))
+        return history
@@ -0,0 +1,344 @@
+"""
+Omezení rychlosti a denní kvóty volání Google API
+"""
+
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+class QuotaExceededError(Exception):
+    """Denní kvóta API je vyčerpaná"""
+
+
+class TokenBucket:
+    """Token bucket pro omezení počtu požadavků za sekundu (thread-safe)"""
+
+    def __init__(self, rate, capacity=None):
+        """Inicializace bucketu
+
+        Args:
+            rate: Počet tokenů doplněných za sekundu
+            capacity: Maximální počet naspořených tokenů (burst), výchozí = rate
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens=1):
+        """
+        Počká, dokud nejsou k dispozici tokeny, a odebere je
+
+        Args:
+            tokens: Počet odebíraných tokenů
+
+        Returns:
+            float: Celková doba čekání v sekundách
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+            # Spí se mimo zámek, ostatní vlákna mezitím mohou doplňovat
+            time.sleep(wait)
+            waited += wait
+
+    def reserve(self, tokens=1):
+        """
+        Odebere tokeny hned (i do mínusu) a vrátí, jak dlouho má volající počkat
+
+        Neblokuje, takže se hodí pro asyncio - volající si počká sám
+        (await asyncio.sleep). Rezervace sdílí stav s acquire(), souběžná
+        vlákna i korutiny se tak řadí do jednoho společného limitu.
+
+        Returns:
+            float: Doba čekání v sekundách (0, pokud jsou tokeny k dispozici)
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            return max(-self._tokens / self.rate, 0.0)
+
+
+class DailyQuota:
+    """Počítadlo denní kvóty API
+
+    Kvóta Custom Search API se nuluje o půlnoci pacifického času.
+    S cestou k souboru se stav ukládá do SQLite, takže přežije restart
+    a sdílí ho všechny procesy se stejným souborem.
+    """
+
+    def __init__(self, limit, path=None):
+        """Inicializace počítadla
+
+        Args:
+            limit: Počet dotazů povolených za den
+            path: Cesta k SQLite souboru (None = jen v paměti procesu)
+        """
+        self.limit = limit
+        self.path = path
+        self._lock = threading.Lock()
+        self._memory = {}
+        self._local = threading.local()
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._connect().execute(
+                "CREATE TABLE IF NOT EXISTS quota (day TEXT PRIMARY KEY, used INTEGER NOT NULL)"
+            )
+
+    @staticmethod
+    def quota_day():
+        """Vrátí aktuální den kvóty (datum v pacifickém čase)"""
+        try:
+            tz = ZoneInfo("America/Los_Angeles")
+        except ZoneInfoNotFoundError:
+            # Windows bez balíčku tzdata
+            tz = timezone.utc
+        return datetime.now(tz).date().isoformat()
+
+    def _connect(self):
+        """Vrátí SQLite spojení pro aktuální vlákno a proces"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def used(self):
+        """Počet dnes spotřebovaných dotazů"""
+        day = self.quota_day()
+        if not self.path:
+            with self._lock:
+                return self._memory.get(day, 0)
+
+        row = self._connect().execute("SELECT used FROM quota WHERE day = ?", (day,)).fetchone()
+        return row[0] if row else 0
+
+    def remaining(self):
+        """Počet dotazů, které dnes ještě zbývají"""
+        return max(self.limit - self.used(), 0)
+
+    def consume(self, count=1):
+        """
+        Započítá dotazy do kvóty
+
+        Args:
+            count: Počet dotazů
+
+        Raises:
+            QuotaExceededError: Pokud by dotazy kvótu překročily
+        """
+        day = self.quota_day()
+        if not self.path:
+            with self._lock:
+                used = self._memory.get(day, 0)
+                if used + count > self.limit:
+                    raise QuotaExceededError(f"Denní kvóta {self.limit} dotazů je vyčerpaná")
+                self._memory = {day: used + count}
+            return
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT used FROM quota WHERE day = ?", (day,)).fetchone()
+            used = row[0] if row else 0
+            if used + count > self.limit:
+                raise QuotaExceededError(f"Denní kvóta {self.limit} dotazů je vyčerpaná")
+            conn.execute(
+                "INSERT OR REPLACE INTO quota (day, used) VALUES (?, ?)", (day, used + count)
+            )
+            conn.execute("DELETE FROM quota WHERE day < ?", (day,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+class RateLimiter:
+    """Omezení rychlosti, denní kvóta a opakování volání API
+
+    Každý pokus o volání nejdřív počká na token, započítá se do denní
+    kvóty a při dočasné chybě (429, 5xx, rateLimitExceeded) se zopakuje
+    s exponenciálním backoffem a náhodným rozptylem (full jitter).
+    """
+
+    # HTTP statusy, po kterých má smysl volání zopakovat
+    RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+    # Důvody 403, které znamenají jen krátkodobé překročení limitu
+    RETRYABLE_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+    # Důvody, kdy je vyčerpaná denní kvóta - opakování nepomůže
+    QUOTA_REASONS = {"dailyLimitExceeded", "quotaExceeded"}
+
+    def __init__(self, bucket, quota, max_retries=3, base_delay=0.5, max_delay=30.0):
+        """Inicializace limiteru
+
+        Args:
+            bucket: TokenBucket pro požadavky za sekundu
+            quota: DailyQuota pro denní limit
+            max_retries: Maximální počet opakování po dočasné chybě
+            base_delay: Základ exponenciálního backoffu v sekundách
+            max_delay: Horní mez čekání mezi pokusy v sekundách
+        """
+        self.bucket = bucket
+        self.quota = quota
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def from_env(cls):
+        """Vytvoří limiter podle environment proměnných
+
+        - SEARCH_RATE_LIMIT_QPS: dotazů za sekundu (výchozí 10)
+        - SEARCH_RATE_LIMIT_BURST: maximální nárazový počet dotazů (výchozí = QPS)
+        - SEARCH_DAILY_QUOTA: dotazů za den (výchozí 10000, limit API)
+        - SEARCH_QUOTA_PATH: SQLite soubor pro počítadlo kvóty (bez něj jen v paměti)
+        - SEARCH_MAX_RETRIES: počet opakování po dočasné chybě (výchozí 3)
+        """
+        qps = float(os.getenv("SEARCH_RATE_LIMIT_QPS", "10"))
+        burst = os.getenv("SEARCH_RATE_LIMIT_BURST")
+        return cls(
+            TokenBucket(qps, float(burst) if burst else None),
+            DailyQuota(
+                int(os.getenv("SEARCH_DAILY_QUOTA", "10000")), os.getenv("SEARCH_QUOTA_PATH")
+            ),
+            max_retries=int(os.getenv("SEARCH_MAX_RETRIES", "3")),
+        )
+
+    @staticmethod
+    def error_status(error):
+        """Vrátí HTTP status chyby googleapiclient (nebo None)"""
+        return getattr(getattr(error, "resp", None), "status", None)
+
+    @staticmethod
+    def error_reasons(error):
+        """Vrátí množinu důvodů z těla chyby Google API"""
+        content = getattr(error, "content", None)
+        if not content:
+            return set()
+        try:
+            body = json.loads(content.decode("utf-8") if isinstance(content, bytes) else content)
+            return {e.get("reason") for e in body["error"].get("errors", [])}
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return set()
+
+    @staticmethod
+    def error_reason(error):
+        """Vrátí jeden popisek chyby pro metriky (důvod z API, HTTP status nebo typ výjimky)"""
+        reasons = sorted(reason for reason in RateLimiter.error_reasons(error) if reason)
+        if reasons:
+            return reasons[0]
+        status = RateLimiter.error_status(error)
+        return f"http_{status}" if status is not None else type(error).__name__
+
+    def is_retryable(self, error):
+        """Zjistí, zda je chyba dočasná a volání má smysl zopakovat"""
+        if isinstance(error, (ConnectionError, TimeoutError)):
+            return True
+
+        status = self.error_status(error)
+        if status in self.RETRYABLE_STATUSES:
+            return True
+        return status == 403 and bool(self.error_reasons(error) & self.RETRYABLE_REASONS)
+
+    def backoff(self, attempt, error=None):
+        """
+        Vrátí dobu čekání před dalším pokusem
+
+        Respektuje hlavičku Retry-After, jinak exponenciální backoff
+        s full jitter (náhodně 0 až base * 2^attempt).
+        """
+        resp = getattr(error, "resp", None)
+        retry_after = resp.get("retry-after") if isinstance(resp, dict) else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_delay)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def call(self, func):
+        """
+        Zavolá funkci s omezením rychlosti, kvótou a opakováním
+
+        Args:
+            func: Funkce bez argumentů provádějící jeden HTTP požadavek
+
+        Returns:
+            Návratová hodnota func
+
+        Raises:
+            QuotaExceededError: Denní kvóta je vyčerpaná (lokálně nebo podle API)
+        """
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            self.quota.consume()
+            try:
+                return func()
+            except Exception as e:
+                if self.error_status(e) == 403 and self.error_reasons(e) & self.QUOTA_REASONS:
+                    raise QuotaExceededError("Denní kvóta Google API je vyčerpaná") from e
+                if attempt >= self.max_retries or not self.is_retryable(e):
+                    raise
+                time.sleep(self.backoff(attempt, e))
+                attempt += 1
+
+    async def call_async(self, func):
+        """
+        Asynchronní varianta call pro korutiny (sdílí bucket, kvótu i pravidla opakování)
+
+        Započtení kvóty (u SEARCH_QUOTA_PATH transakce SQLite, která může
+        čekat na zámek jiného procesu) běží ve vlákně, aby neblokovalo
+        event loop a ostatní rozběhnuté dotazy.
+
+        Args:
+            func: Async funkce bez argumentů provádějící jeden HTTP požadavek
+
+        Returns:
+            Návratová hodnota func
+
+        Raises:
+            QuotaExceededError: Denní kvóta je vyčerpaná (lokálně nebo podle API)
+        """
+        attempt = 0
+        while True:
+            wait = self.bucket.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            await asyncio.to_thread(self.quota.consume)
+            try:
+                return await func()
+            except Exception as e:
+                if self.error_status(e) == 403 and self.error_reasons(e) & self.QUOTA_REASONS:
+                    raise QuotaExceededError("Denní kvóta Google API je vyčerpaná") from e
+                if attempt >= self.max_retries or not self.is_retryable(e):
+                    raise
+                await asyncio.sleep(self.backoff(attempt, e))
+                attempt += 1
+
+    def quota_remaining(self):
+        """Počet dotazů, které dnes ještě zbývají"""
+        return self.quota.remaining()
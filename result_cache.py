@@ -0,0 +1,232 @@
+"""
+Perzistentní cache výsledků vyhledávání
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+
+class ResultCache:
+    """Disková cache API odpovědí sdílená mezi procesy
+
+    Záznamy se ukládají do SQLite databáze ve WAL režimu, takže cache
+    přežije restart kontejneru a může ji současně používat více worker
+    procesů. Platnost záznamů omezuje TTL, velikost počet záznamů (LRU).
+
+    Po vypršení TTL se záznam ještě chvíli drží jako "prošlý" (stale):
+    během stale_ttl ho lze vrátit hned a obnovit na pozadí
+    (stale-while-revalidate), během stale_if_error ho lze vrátit,
+    když API selže (stale-if-error).
+    """
+
+    # Operátory vyhledávání, které API rozlišuje jen velkými písmeny
+    OPERATOR_PATTERN = re.compile(r"OR|AND|AROUND\(\d+\)")
+
+    def __init__(self, path, ttl=3600, max_entries=10000, stale_ttl=0, stale_if_error=0):
+        """Inicializace cache
+
+        Args:
+            path: Cesta k SQLite souboru (adresář se vytvoří automaticky)
+            ttl: Platnost záznamu v sekundách
+            max_entries: Maximální počet záznamů, nad limit se mažou nejdéle nepoužité
+            stale_ttl: Jak dlouho po TTL lze záznam vrátit a obnovit na pozadí (s)
+            stale_if_error: Jak dlouho po TTL lze záznam vrátit při chybě API (s)
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self.stale_if_error = stale_if_error
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)")
+
+    @classmethod
+    def from_env(cls):
+        """Vytvoří cache podle environment proměnných
+
+        - SEARCH_CACHE_PATH: cesta k SQLite souboru (bez ní je cache vypnutá)
+        - SEARCH_CACHE_TTL: platnost záznamu v sekundách (výchozí 3600)
+        - SEARCH_CACHE_MAX_ENTRIES: maximální počet záznamů (výchozí 10000)
+        - SEARCH_CACHE_STALE_TTL: okno stale-while-revalidate po TTL (výchozí 0 = vypnuto)
+        - SEARCH_CACHE_STALE_IF_ERROR: okno pro prošlé záznamy při chybě API (výchozí 0)
+
+        Returns:
+            ResultCache nebo None, pokud cache není nakonfigurovaná
+        """
+        path = os.getenv("SEARCH_CACHE_PATH")
+        if not path:
+            return None
+
+        return cls(
+            path,
+            ttl=int(os.getenv("SEARCH_CACHE_TTL", "3600")),
+            max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "10000")),
+            stale_ttl=int(os.getenv("SEARCH_CACHE_STALE_TTL", "0")),
+            stale_if_error=int(os.getenv("SEARCH_CACHE_STALE_IF_ERROR", "0")),
+        )
+
+    @property
+    def retention(self):
+        """Jak dlouho se záznam drží od uložení (TTL + nejdelší stale okno)"""
+        return self.ttl + max(self.stale_ttl, self.stale_if_error)
+
+    @staticmethod
+    def clean_query(query):
+        """Sjednotí bílé znaky a Unicode (NFC) dotazu, velikost písmen zachová
+
+        Tento tvar se posílá do API - operátory jako OR a AND fungují jen
+        velkými písmeny, takže se dotaz pro API nesmí převádět na malá.
+        """
+        return unicodedata.normalize("NFC", " ".join(query.split()))
+
+    @staticmethod
+    def normalize_query(query):
+        """Převede dotaz na kanonický tvar pro klíč cache
+
+        Kromě clean_query sjednotí i velikost písmen, takže "Python ",
+        "python" i "PYTHON" sdílí záznam. Operátory (OR, AND, AROUND(n))
+        zůstávají beze změny - "python OR java" hledá něco jiného než
+        "python or java". Malá písmena se použijí jen u slov, kde převod
+        nemění délku textu (např. turecké "İ" zůstane beze změny). Do API
+        se posílá clean_query, ne tento tvar.
+        """
+        words = []
+        for word in ResultCache.clean_query(query).split(" "):
+            lowered = word.lower()
+            if ResultCache.OPERATOR_PATTERN.fullmatch(word) or len(lowered) != len(word):
+                words.append(word)
+            else:
+                words.append(lowered)
+        return " ".join(words)
+
+    @staticmethod
+    def make_key(cx, query, num, language, fields=None):
+        """Sestaví klíč záznamu z parametrů vyhledávání
+
+        API klíč do klíče záznamu záměrně nepatří - výsledky nezávisí
+        na tom, kdo dotaz zaplatil. Dotaz se normalizuje (normalize_query),
+        num=None dává klíč společný pro všechny počty výsledků. Zúžená
+        odpověď (fields) má vlastní klíč, plná odpověď klíč beze změny.
+        """
+        parts = [cx, ResultCache.normalize_query(query), num, language]
+        if fields is not None:
+            parts.append(list(fields))
+        raw = json.dumps(parts, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _connect(self):
+        """Vrátí SQLite spojení pro aktuální vlákno a proces"""
+        conn = getattr(self._local, "conn", None)
+        # Po forku nesmí proces sdílet spojení s rodičem
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        """
+        Načte záznam z cache
+
+        Args:
+            key: Klíč z make_key()
+
+        Returns:
+            dict nebo None, pokud záznam neexistuje nebo vypršel
+        """
+        value, age = self.get_entry(key)
+        return value if value is not None and age <= self.ttl else None
+
+    def get_entry(self, key):
+        """
+        Načte záznam včetně prošlého (v rámci retention) a jeho stáří
+
+        Args:
+            key: Klíč z make_key()
+
+        Returns:
+            tuple: (dict, stáří v sekundách) nebo (None, None)
+        """
+        conn = self._connect()
+        now = time.time()
+
+        row = conn.execute(
+            "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None, None
+
+        value, created_at = row
+        age = now - created_at
+        if age > self.retention:
+            return None, None
+
+        # Posunutí v LRU pořadí
+        conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(value), age
+
+    def set(self, key, value):
+        """
+        Uloží záznam do cache a případně uvolní místo
+
+        Args:
+            key: Klíč z make_key()
+            value: JSON serializovatelná API odpověď
+        """
+        conn = self._connect()
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+
+        # BEGIN IMMEDIATE zamkne databázi pro zápis hned na začátku,
+        # souběžné procesy tak na sebe počkají místo deadlocku
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            conn.execute("DELETE FROM entries WHERE created_at < ?", (now - self.retention,))
+
+            (count,) = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM entries WHERE key IN "
+                    "(SELECT key FROM entries ORDER BY accessed_at ASC, rowid ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def clear(self):
+        """Smaže všechny záznamy"""
+        self._connect().execute("DELETE FROM entries")
+
+    def __len__(self):
+        (count,) = self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()
+        return count
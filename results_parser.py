@@ -2,48 +2,189 @@
 Parser pro Google API odpovědi
 """
 
+import csv
+import io
+import os
+from contextlib import contextmanager
+
+from search_results import LocaleComparison, ResultSet
+
 
 class ResultsParser:
     """Třída pro parsování výsledků z různých zdrojů"""
 
+    # Sloupce exportu změn pořadí (RankHistory.movements)
+    MOVEMENT_FIELDS = ("url", "title", "rank", "prev_rank", "change", "status")
+
+    # Sloupce Parquet/Arrow archivu - dotaz, jazyk, výsledek a doména odkazu
+    ARCHIVE_FIELDS = ("query", "language") + ResultSet.FIELDS + ("domain",)
+
+    # Sloupce s mnoha opakováními, ukládají se slovníkově (dictionary encoding)
+    DICTIONARY_FIELDS = ("query", "language", "domain", "rank")
+
+    # Výchozí komprese a velikost row group Parquet exportu
+    PARQUET_COMPRESSION = "zstd"
+    PARQUET_ROW_GROUP_SIZE = 100_000
+
     @staticmethod
     def parse_google_api_response(results):
         """
         Parsuje Google Custom Search API odpověď
 
         Args:
-            results: dict nebo str s API odpovědí
+            results: dict nebo str s API odpovědí, případně už naparsovaná data
 
         Returns:
-            list: Normalizovaná data ve formátu [{'rank', 'title', 'link', 'snippet'}]
+            ResultSet: Normalizovaná data (rank, title, link, snippet), která se
+                       chovají i jako [{'rank', 'title', 'link', 'snippet'}]
         """
         import json
 
+        # Už naparsovaná data se vrací beze změny
+        if isinstance(results, ResultSet):
+            return results
+
         # Kontrola typu
         if isinstance(results, str):
             results = json.loads(results)
 
+        # Víc stránek z jednoho vyhledávání (num > 10)
+        if isinstance(results, dict) and "pages" in results:
+            return ResultsParser._merge_pages(results["pages"])
+
         # Parsování Google API struktury
-        if "items" in results:
-            items = results["items"]
-            data = []
-            for i, item in enumerate(items, 1):
-                data.append(
-                    {
-                        "rank": i,
-                        "title": item.get("title", ""),
-                        "link": item.get("link", ""),
-                        "snippet": item.get("snippet", ""),
-                    }
-                )
-            return data
+        if isinstance(results, dict) and "items" in results:
+            return ResultsParser._items_to_result_set(results["items"])
 
-        # Fallback - data už jsou v našem formátu
+        # Fallback - data už jsou v našem formátu (list dictů)
         elif isinstance(results, list):
-            return results
+            return ResultSet.from_records(results)
 
         # Fallback - prázdná odpověď
-        return []
+        return ResultSet()
+
+    @staticmethod
+    def _items_to_result_set(items):
+        """Převede API items rovnou na sloupce ResultSet (bez dictu na řádek)"""
+        titles, links, snippets = [], [], []
+        for item in items:
+            titles.append(item.get("title", ""))
+            links.append(item.get("link", ""))
+            snippets.append(item.get("snippet", ""))
+
+        return ResultSet(
+            {
+                "rank": list(range(1, len(titles) + 1)),
+                "title": titles,
+                "link": links,
+                "snippet": snippets,
+            }
+        )
+
+    @staticmethod
+    def _merge_pages(pages):
+        """
+        Spojí stránky jednoho vyhledávání do jednoho seznamu s globálním pořadím
+
+        Stránky se seřadí podle startIndex (stahují se souběžně, takže
+        nemusí přijít popořadě). Odkaz, který Google vrátí na víc stránkách,
+        se započítá jen jednou - na nejlepší pozici.
+
+        Args:
+            pages: list API odpovědí jednotlivých stránek
+
+        Returns:
+            ResultSet: Normalizovaná data s pořadím přes všechny stránky
+        """
+
+        def start_index(page):
+            request = page.get("queries", {}).get("request") or [{}]
+            return request[0].get("startIndex", 0)
+
+        items = []
+        seen_links = set()
+        for page in sorted(pages, key=start_index):
+            for item in page.get("items", []):
+                link = item.get("link", "")
+                if link and link in seen_links:
+                    continue
+                seen_links.add(link)
+                items.append(item)
+        return ResultsParser._items_to_result_set(items)
+
+    @staticmethod
+    def _iter_records(results):
+        """
+        Vrátí iterátor řádků k exportu
+
+        API odpověď, JSON string, list nebo ResultSet se nejdřív naparsuje.
+        Cokoliv jiného (generátor, iterátor) se bere jako proud už
+        normalizovaných řádků - dictů nebo SearchResult - a prochází se
+        líně, takže se nikdy nedrží v paměti celé.
+        """
+        if isinstance(results, (str, dict, list, ResultSet)):
+            return iter(ResultsParser.parse_google_api_response(results))
+        return iter(results)
+
+    @staticmethod
+    @contextmanager
+    def _text_stream(fileobj, encoding):
+        """
+        Vrátí textový stream pro zápis do fileobj
+
+        Binární soubor se obalí TextIOWrapperem, který se na konci
+        odpojí, aby nezavřel soubor volajícího.
+        """
+        if isinstance(fileobj, io.TextIOBase):
+            yield fileobj
+            return
+
+        stream = io.TextIOWrapper(fileobj, encoding=encoding, newline="")
+        try:
+            yield stream
+        finally:
+            stream.flush()
+            stream.detach()
+
+    @staticmethod
+    def iter_json_chunks(results):
+        """
+        Postupně generuje JSON pole výsledků po jednotlivých záznamech
+
+        Spojené části dávají stejný text jako json.dumps(..., indent=2),
+        ale celý dokument se nikdy nedrží v paměti.
+
+        Args:
+            results: API odpověď, naparsovaná data nebo proud řádků
+
+        Yields:
+            str: Části JSON dokumentu
+        """
+        import json
+
+        first = True
+        for record in ResultsParser._iter_records(results):
+            item = {field: record.get(field, "") for field in ResultSet.FIELDS}
+            # Odsazení vnořeného objektu o úroveň pole (2 mezery)
+            body = json.dumps(item, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+            yield ("[\n  " if first else ",\n  ") + body
+            first = False
+
+        yield "[]" if first else "\n]"
+
+    @staticmethod
+    def write_json(results, fileobj, encoding="utf-8"):
+        """
+        Zapíše výsledky jako JSON do souborového objektu (po záznamech)
+
+        Args:
+            results: API odpověď, naparsovaná data nebo proud řádků
+            fileobj: Textový nebo binární souborový objekt
+            encoding: Kódování pro binární fileobj
+        """
+        with ResultsParser._text_stream(fileobj, encoding) as stream:
+            for chunk in ResultsParser.iter_json_chunks(results):
+                stream.write(chunk)
 
     @staticmethod
     def to_json_string(results):
@@ -56,10 +197,30 @@ class ResultsParser:
         Returns:
             str: JSON string
         """
-        import json
+        return "".join(ResultsParser.iter_json_chunks(results))
 
-        parsed = ResultsParser.parse_google_api_response(results)
-        return json.dumps(parsed, ensure_ascii=False, indent=2)
+    @staticmethod
+    def write_csv(results, fileobj, encoding="utf-8"):
+        """
+        Zapíše výsledky jako CSV do souborového objektu (po řádcích)
+
+        Args:
+            results: API odpověď, naparsovaná data nebo proud řádků
+            fileobj: Textový nebo binární souborový objekt
+            encoding: Kódování pro binární fileobj (např. "utf-8-sig" pro Excel)
+
+        Returns:
+            int: Počet zapsaných řádků (bez hlavičky)
+        """
+        count = 0
+        with ResultsParser._text_stream(fileobj, encoding) as stream:
+            writer = csv.writer(stream, lineterminator="\n")
+            writer.writerow(ResultSet.FIELDS)
+
+            for record in ResultsParser._iter_records(results):
+                writer.writerow([record.get(field, "") for field in ResultSet.FIELDS])
+                count += 1
+        return count
 
     @staticmethod
     def to_csv_data(results):
@@ -72,14 +233,52 @@ class ResultsParser:
         Returns:
             str: CSV string
         """
-        try:
-            import pandas as pd
+        buffer = io.StringIO()
+        ResultsParser.write_csv(results, buffer)
+        return buffer.getvalue()
 
-            parsed = ResultsParser.parse_google_api_response(results)
-            df = pd.DataFrame(parsed)
-            return df.to_csv(index=False, encoding="utf-8")
-        except ImportError:
-            raise ImportError("Pandas není nainstalován")
+    @staticmethod
+    def iter_txt_chunks(results, query):
+        """
+        Postupně generuje textový export - hlavičku a pak jeden blok na výsledek
+
+        Args:
+            results: API odpověď, naparsovaná data nebo proud řádků
+            query: vyhledávací dotaz
+
+        Yields:
+            str: Části textového obsahu
+        """
+        from datetime import datetime
+
+        yield (
+            f"Výsledky vyhledávání: {query}\n"
+            f"Čas: {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}\n"
+            + "=" * 60
+            + "\n\n"
+        )
+
+        for result in ResultsParser._iter_records(results):
+            yield (
+                f"{result.get('rank', '?')}. {result.get('title', 'Bez názvu')}\n"
+                f"   URL: {result.get('link', 'N/A')}\n"
+                f"   {result.get('snippet', 'Bez popisu')}\n\n"
+            )
+
+    @staticmethod
+    def write_txt(results, query, fileobj, encoding="utf-8"):
+        """
+        Zapíše textový export do souborového objektu (po výsledcích)
+
+        Args:
+            results: API odpověď, naparsovaná data nebo proud řádků
+            query: vyhledávací dotaz
+            fileobj: Textový nebo binární souborový objekt
+            encoding: Kódování pro binární fileobj
+        """
+        with ResultsParser._text_stream(fileobj, encoding) as stream:
+            for chunk in ResultsParser.iter_txt_chunks(results, query):
+                stream.write(chunk)
 
     @staticmethod
     def to_txt_content(results, query):
@@ -93,17 +292,311 @@ class ResultsParser:
         Returns:
             str: Textový obsah
         """
-        from datetime import datetime
+        return "".join(ResultsParser.iter_txt_chunks(results, query))
 
-        parsed = ResultsParser.parse_google_api_response(results)
+    @staticmethod
+    def results_digest(results):
+        """
+        Otisk sady výsledků (SHA-256) - klíč cache hotových exportů
+
+        Stejné výsledky dají stejný otisk bez ohledu na to, kdy a v jaké
+        relaci se vyhledávaly.
 
-        txt_content = f"Výsledky vyhledávání: {query}\n"
-        txt_content += f"Čas: {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}\n"
-        txt_content += "=" * 60 + "\n\n"
+        Args:
+            results: API odpověď nebo naparsovaná data
 
-        for result in parsed:
-            txt_content += f"{result.get('rank', '?')}. {result.get('title', 'Bez názvu')}\n"
-            txt_content += f"   URL: {result.get('link', 'N/A')}\n"
-            txt_content += f"   {result.get('snippet', 'Bez popisu')}\n\n"
+        Returns:
+            str: Hex SHA-256
+        """
+        import hashlib
+        import json
+
+        columns = ResultsParser.parse_google_api_response(results).columns
+        raw = json.dumps(columns, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def compare_locales(responses):
+        """
+        Naparsuje odpovědi více jazyků a zarovná je podle URL
+
+        Args:
+            responses: dict {jazyk: API odpověď nebo naparsovaná data}
+
+        Returns:
+            LocaleComparison: Široká tabulka s pořadím v každém jazyce
+        """
+        return LocaleComparison.from_result_sets(
+            {
+                language: ResultsParser.parse_google_api_response(response)
+                for language, response in responses.items()
+            }
+        )
+
+    @staticmethod
+    def write_comparison_csv(comparison, fileobj, encoding="utf-8"):
+        """
+        Zapíše srovnání jazyků jako široké CSV (sloupec rank_<jazyk> pro každý jazyk)
+
+        Chybějící pořadí (odkaz se v jazyce nenašel) je prázdná buňka.
+
+        Args:
+            comparison: LocaleComparison
+            fileobj: Textový nebo binární souborový objekt
+            encoding: Kódování pro binární fileobj
+
+        Returns:
+            int: Počet zapsaných řádků (bez hlavičky)
+        """
+        count = 0
+        with ResultsParser._text_stream(fileobj, encoding) as stream:
+            writer = csv.writer(stream, lineterminator="\n")
+            writer.writerow(comparison.columns)
+
+            for record in comparison:
+                writer.writerow(["" if value is None else value for value in record.values()])
+                count += 1
+        return count
+
+    @staticmethod
+    def to_comparison_csv(comparison):
+        """
+        Převede srovnání jazyků na CSV string
+
+        Args:
+            comparison: LocaleComparison
+
+        Returns:
+            str: CSV string
+        """
+        buffer = io.StringIO()
+        ResultsParser.write_comparison_csv(comparison, buffer)
+        return buffer.getvalue()
+
+    @staticmethod
+    def to_comparison_json(comparison):
+        """
+        Převede srovnání jazyků na JSON string (chybějící pořadí = null)
+
+        Args:
+            comparison: LocaleComparison
+
+        Returns:
+            str: JSON string
+        """
+        import json
+
+        return json.dumps(comparison.to_dicts(), ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def write_movements_csv(movements, fileobj, encoding="utf-8"):
+        """
+        Zapíše změny pořadí jako CSV (chybějící hodnota = prázdná buňka)
+
+        Args:
+            movements: list dictů z RankHistory.movements
+            fileobj: Textový nebo binární souborový objekt
+            encoding: Kódování pro binární fileobj
+
+        Returns:
+            int: Počet zapsaných řádků (bez hlavičky)
+        """
+        count = 0
+        with ResultsParser._text_stream(fileobj, encoding) as stream:
+            writer = csv.writer(stream, lineterminator="\n")
+            writer.writerow(ResultsParser.MOVEMENT_FIELDS)
+
+            for movement in movements:
+                writer.writerow(
+                    [
+                        "" if movement.get(field) is None else movement[field]
+                        for field in ResultsParser.MOVEMENT_FIELDS
+                    ]
+                )
+                count += 1
+        return count
+
+    @staticmethod
+    def to_movements_csv(movements):
+        """
+        Převede změny pořadí na CSV string
+
+        Args:
+            movements: list dictů z RankHistory.movements
+
+        Returns:
+            str: CSV string
+        """
+        buffer = io.StringIO()
+        ResultsParser.write_movements_csv(movements, buffer)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _pyarrow():
+        """Líný import pyarrow (v UI se načte až při exportu)"""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("PyArrow není nainstalován")
+        return pa
+
+    @staticmethod
+    def archive_schema():
+        """
+        Arrow schéma archivu výsledků
+
+        query, language, domain a rank jsou slovníkové sloupce - v archivu
+        milionů řádků se opakuje pár desítek dotazů, jazyků a domén a jen
+        100 různých pořadí.
+        """
+        pa = ResultsParser._pyarrow()
+        text = pa.dictionary(pa.int32(), pa.string())
+        return pa.schema(
+            [
+                ("query", text),
+                ("language", text),
+                ("rank", pa.dictionary(pa.int32(), pa.int16())),
+                ("title", pa.string()),
+                ("link", pa.string()),
+                ("snippet", pa.string()),
+                ("domain", text),
+            ]
+        )
+
+    @staticmethod
+    def link_domain(link):
+        """Doména odkazu (prázdná, pokud odkaz nejde rozebrat, např. "http://[::1")"""
+        from urllib.parse import urlsplit
+
+        try:
+            return urlsplit(link).hostname or ""
+        except ValueError:
+            return ""
+
+    @staticmethod
+    def archive_table(columns):
+        """
+        Postaví Arrow tabulku archivu ze sloupců
+
+        Args:
+            columns: dict {pole: list hodnot} pro query, language a ResultSet.FIELDS
+                     (doména se dopočítá z odkazu)
+
+        Returns:
+            pyarrow.Table: Tabulka se schématem archive_schema()
+        """
+        pa = ResultsParser._pyarrow()
+        schema = ResultsParser.archive_schema()
+        columns = dict(columns)
+        columns["domain"] = [ResultsParser.link_domain(link) for link in columns["link"]]
+        return pa.table(
+            [
+                pa.array(list(columns[field]), type=schema.field(field).type)
+                for field in ResultsParser.ARCHIVE_FIELDS
+            ],
+            schema=schema,
+        )
+
+    @staticmethod
+    def to_arrow_table(results, query="", language=""):
+        """
+        Převede výsledky jednoho vyhledávání na Arrow tabulku archivu
+
+        Args:
+            results: API odpověď nebo naparsovaná data
+            query: Vyhledávací dotaz (stejný pro všechny řádky)
+            language: Jazyk výsledků
+
+        Returns:
+            pyarrow.Table
+        """
+        results = ResultsParser.parse_google_api_response(results)
+        columns = {field: results.column(field) for field in ResultSet.FIELDS}
+        columns["query"] = [query] * len(results)
+        columns["language"] = [language] * len(results)
+        return ResultsParser.archive_table(columns)
+
+    @staticmethod
+    def write_parquet(
+        results,
+        fileobj,
+        query="",
+        language="",
+        compression=PARQUET_COMPRESSION,
+        compression_level=None,
+        row_group_size=PARQUET_ROW_GROUP_SIZE,
+    ):
+        """
+        Zapíše výsledky jako Parquet (sloupcově, komprimovaně)
+
+        Args:
+            results: pyarrow.Table archivu, API odpověď nebo naparsovaná data
+            fileobj: Cesta nebo binární souborový objekt
+            query: Vyhledávací dotaz (jen pokud results není tabulka)
+            language: Jazyk výsledků (jen pokud results není tabulka)
+            compression: Komprese ("zstd", "snappy", "gzip", "lz4", "none")
+            compression_level: Úroveň komprese (None = výchozí kodeku)
+            row_group_size: Maximální počet řádků v jedné row group
+
+        Returns:
+            int: Počet zapsaných řádků
+        """
+        pa = ResultsParser._pyarrow()
+        import pyarrow.parquet as pq
+
+        table = results
+        if not isinstance(table, pa.Table):
+            table = ResultsParser.to_arrow_table(results, query, language)
+        pq.write_table(
+            table,
+            fileobj,
+            compression=compression,
+            compression_level=compression_level,
+            row_group_size=row_group_size,
+        )
+        return table.num_rows
+
+    @staticmethod
+    def to_parquet_bytes(results, query="", language="", **options):
+        """
+        Převede výsledky na obsah Parquet souboru (např. pro st.download_button)
+
+        Args:
+            results: API odpověď nebo naparsovaná data
+            query: Vyhledávací dotaz
+            language: Jazyk výsledků
+            **options: compression, compression_level, row_group_size (viz write_parquet)
+
+        Returns:
+            bytes: Parquet soubor
+        """
+        buffer = io.BytesIO()
+        ResultsParser.write_parquet(results, buffer, query, language, **options)
+        return buffer.getvalue()
+
+    @staticmethod
+    def read_parquet(source, columns=None):
+        """
+        Načte Parquet archiv do pandas bez kopírování dat
+
+        Soubor se čte přes memory map a DataFrame drží přímo Arrow pole
+        (pd.ArrowDtype) - sloupce se nepřevádí na Python objekty. Slovníkové
+        sloupce zůstávají slovníkové (rank je v souboru slovníkově uložený,
+        načte se jako int16).
+
+        Args:
+            source: Cesta, bytes nebo binární souborový objekt
+            columns: Načíst jen tyto sloupce (None = všechny)
+
+        Returns:
+            pandas.DataFrame
+        """
+        ResultsParser._pyarrow()
+        import pandas as pd
+        import pyarrow.parquet as pq
 
-        return txt_content
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        memory_map = isinstance(source, (str, os.PathLike))
+        table = pq.read_table(source, columns=columns, memory_map=memory_map)
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
@@ -0,0 +1,229 @@
+"""
+Datové typy pro výsledky vyhledávání
+"""
+
+from collections.abc import Sequence
+from typing import NamedTuple
+
+
+class SearchResult(NamedTuple):
+    """Jeden výsledek vyhledávání
+
+    Kompaktní n-tice místo dictu, kvůli zpětné kompatibilitě ale
+    podporuje i přístup jako dict: result["title"], result.get("link").
+    """
+
+    rank: int
+    title: str
+    link: str
+    snippet: str
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        """Hodnota pole jako u dict.get()"""
+        return getattr(self, key, default) if key in self._fields else default
+
+    def keys(self):
+        """Názvy polí (díky tomu funguje i dict(result))"""
+        return self._fields
+
+    def to_dict(self):
+        """Převede výsledek na dict"""
+        return dict(zip(self._fields, self))
+
+
+class ResultSet(Sequence):
+    """Sloupcový kontejner výsledků vyhledávání
+
+    Data drží po sloupcích (jeden list na pole), ne jako list dictů -
+    u velkých archivů ušetří režii slovníku na každý řádek a do
+    pandas/Arrow se převádí celé sloupce najednou. Navenek se chová
+    jako sekvence SearchResult a rovná se i ekvivalentnímu listu dictů.
+    """
+
+    FIELDS = SearchResult._fields
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns=None):
+        """Inicializace kontejneru
+
+        Args:
+            columns: dict {pole: list hodnot}, všechny sloupce stejně dlouhé
+        """
+        columns = columns or {}
+        self.columns = {field: list(columns.get(field, [])) for field in self.FIELDS}
+
+        lengths = {len(values) for values in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Všechny sloupce ResultSet musí mít stejnou délku")
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Vytvoří ResultSet z iterovatelného dictů (nebo SearchResult)
+
+        Chybějící pole se doplní jako u parseru ("" a pořadí podle pozice).
+        """
+        columns = {field: [] for field in cls.FIELDS}
+        for i, record in enumerate(records, 1):
+            columns["rank"].append(record.get("rank", i))
+            columns["title"].append(record.get("title", ""))
+            columns["link"].append(record.get("link", ""))
+            columns["snippet"].append(record.get("snippet", ""))
+        return cls(columns)
+
+    def __len__(self):
+        return len(self.columns["rank"])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ResultSet({field: values[index] for field, values in self.columns.items()})
+        return SearchResult(*(self.columns[field][index] for field in self.FIELDS))
+
+    def __iter__(self):
+        return map(SearchResult._make, zip(*(self.columns[field] for field in self.FIELDS)))
+
+    def __eq__(self, other):
+        if isinstance(other, ResultSet):
+            return self.columns == other.columns
+        if isinstance(other, list):
+            return self.to_dicts() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"ResultSet({len(self)} výsledků)"
+
+    def column(self, field):
+        """Vrátí celý sloupec jako list"""
+        return self.columns[field]
+
+    def to_dicts(self):
+        """Převede výsledky na list dictů (např. pro json.dumps)"""
+        return [result.to_dict() for result in self]
+
+    def to_pandas(self):
+        """
+        Převede výsledky na pandas DataFrame
+
+        DataFrame se staví přímo ze sloupců, bez průchodu po řádcích.
+        """
+        import pandas as pd
+
+        return pd.DataFrame(self.columns, columns=list(self.FIELDS))
+
+    def to_arrow(self):
+        """Převede výsledky na pyarrow.Table (po sloupcích)"""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("PyArrow není nainstalován")
+
+        return pa.table(self.columns)
+
+
+class LocaleComparison:
+    """Výsledky jednoho dotazu ve více jazycích zarovnané podle URL
+
+    Každý řádek odpovídá jednomu odkazu a nese jeho pořadí v každém
+    jazyce (None = v daném jazyce se nenašel). Řádky jsou seřazené
+    podle nejlepšího pořadí napříč jazyky.
+    """
+
+    __slots__ = ("languages", "rows")
+
+    def __init__(self, languages, rows):
+        """Inicializace
+
+        Args:
+            languages: list kódů jazyků v pořadí sloupců
+            rows: list dictů {'link', 'title', 'ranks': {jazyk: pořadí}}
+        """
+        self.languages = list(languages)
+        self.rows = rows
+
+    @staticmethod
+    def url_key(link):
+        """Klíč pro zarovnání odkazů (bez fragmentu, koncového lomítka a velikosti hostitele)
+
+        Odkaz, který nejde rozebrat (např. "http://[::1"), je klíčem sám.
+        """
+        from urllib.parse import urlsplit
+
+        try:
+            parts = urlsplit(link)
+        except ValueError:
+            return link
+        path = parts.path.rstrip("/")
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{parts.scheme.lower()}://{parts.netloc.lower()}{path}{query}"
+
+    @classmethod
+    def from_result_sets(cls, result_sets):
+        """
+        Zarovná výsledky jednotlivých jazyků podle URL
+
+        Args:
+            result_sets: dict {jazyk: ResultSet} (pořadí klíčů = pořadí sloupců)
+
+        Returns:
+            LocaleComparison
+        """
+        rows = {}
+        for language, results in result_sets.items():
+            for result in results:
+                key = cls.url_key(result.link)
+                row = rows.get(key)
+                if row is None:
+                    row = rows[key] = {"link": result.link, "title": result.title, "ranks": {}}
+                # Při duplicitě v jednom jazyce platí lepší pozice
+                row["ranks"].setdefault(language, result.rank)
+
+        def order(row):
+            ranks = list(row["ranks"].values())
+            return min(ranks), -len(ranks), sum(ranks) / len(ranks), row["link"]
+
+        return cls(result_sets.keys(), sorted(rows.values(), key=order))
+
+    @property
+    def columns(self):
+        """Názvy sloupců širokého výstupu"""
+        return ["link", "title", "best_rank"] + [f"rank_{lang}" for lang in self.languages]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        """Řádky širokého výstupu jako dicty (chybějící pořadí = None)"""
+        for row in self.rows:
+            record = {
+                "link": row["link"],
+                "title": row["title"],
+                "best_rank": min(row["ranks"].values()),
+            }
+            for language in self.languages:
+                record[f"rank_{language}"] = row["ranks"].get(language)
+            yield record
+
+    def __repr__(self):
+        return f"LocaleComparison({len(self)} odkazů, {', '.join(self.languages)})"
+
+    def to_dicts(self):
+        """Převede srovnání na list dictů (široký formát)"""
+        return list(self)
+
+    def to_pandas(self):
+        """Převede srovnání na pandas DataFrame (pořadí jako nullable Int64)"""
+        import pandas as pd
+
+        frame = pd.DataFrame(self.to_dicts(), columns=self.columns)
+        for language in self.languages:
+            frame[f"rank_{language}"] = frame[f"rank_{language}"].astype("Int64")
+        return frame
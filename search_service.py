@@ -2,9 +2,32 @@
 Vyhledávací služba
 """
 
+import logging
 import os
-import streamlit as st
-from googleapiclient.discovery import build
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from background_refresh import BackgroundRefresher
+from client_pool import ClientPool
+from memory_cache import MemoryCache
+from metrics import SearchMetrics
+from rank_history import RankHistory
+from rate_limiter import QuotaExceededError, RateLimiter
+from result_cache import ResultCache
+from single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+def build(*args, **kwargs):
+    """Líný wrapper nad googleapiclient.discovery.build
+
+    Import googleapiclient trvá ~200 ms, proto se načítá až při stavbě
+    prvního klienta (cache hit ani první render stránky ho nepotřebují).
+    """
+    from googleapiclient.discovery import build as discovery_build
+
+    return discovery_build(*args, **kwargs)
 
 
 class SearchService:
@@ -22,6 +45,53 @@ class SearchService:
         "it": "IT",  # Italština -> Itálie
     }
 
+    # Perzistentní cache sdílená všemi instancemi (načte se líně z env)
+    _cache = None
+    _cache_loaded = False
+    _cache_lock = threading.Lock()
+
+    # Pool předpřipravených customsearch klientů (sdílený všemi vlákny)
+    _client_pool = None
+
+    # Omezení rychlosti a denní kvóty (sdílené všemi vlákny)
+    _rate_limiter = None
+
+    # Slučování souběžných stejných volání API
+    _single_flight = None
+
+    # Obnova prošlých záznamů cache na pozadí
+    _refresher = None
+
+    # Historie pořadí (SEARCH_HISTORY_PATH, načte se líně)
+    _history = None
+    _history_loaded = False
+
+    # Komprimovaná paměťová cache odpovědí (SEARCH_MEMORY_CACHE_*, načte se líně)
+    _memory_cache = None
+
+    # Metriky cache, latence API, chyb a kvóty (sdílené všemi vlákny)
+    _metrics = None
+
+    # Projekce odpovědi API (SEARCH_SLIM_RESPONSES, načte se líně)
+    _item_fields = None
+    _item_fields_loaded = False
+
+    # Pole výsledku, která čte ResultsParser - základ úsporného režimu
+    SLIM_ITEM_FIELDS = ("title", "link", "snippet")
+
+    # Timeout HTTP spojení k API v sekundách
+    HTTP_TIMEOUT = 30
+
+    # API vrací nejvýše 10 výsledků na stránku a nejvýše 100 celkem
+    PAGE_SIZE = 10
+    MAX_RESULTS = 100
+
+    # Maximální počet stránek stahovaných souběžně
+    MAX_PAGE_WORKERS = 4
+
+    # Maximální počet jazyků vyhledávaných souběžně (porovnání jazyků)
+    MAX_LOCALE_WORKERS = 8
+
     def __init__(self):
         """Inicializace služby
 
@@ -34,41 +104,638 @@ class SearchService:
         self.api_key = os.getenv("GOOGLE_API_KEY")
         self.cx = os.getenv("GOOGLE_CX")
 
-    # Statická metoda kvůli cachování
+    @classmethod
+    def get_cache(cls):
+        """Vrátí perzistentní cache nebo None, pokud není nakonfigurovaná
+
+        Cache se vytvoří při prvním použití podle SEARCH_CACHE_* proměnných.
+        """
+        if not cls._cache_loaded:
+            with cls._cache_lock:
+                if not cls._cache_loaded:
+                    cls._cache = ResultCache.from_env()
+                    cls._cache_loaded = True
+        return cls._cache
+
+    @classmethod
+    def get_memory_cache(cls):
+        """Vrátí sdílenou paměťovou cache odpovědí (MemoryCache)
+
+        Cache se vytvoří při prvním použití podle SEARCH_MEMORY_CACHE_* proměnných.
+        """
+        if cls._memory_cache is None:
+            with cls._cache_lock:
+                if cls._memory_cache is None:
+                    cls._memory_cache = MemoryCache.from_env()
+        return cls._memory_cache
+
+    @classmethod
+    def get_client_pool(cls):
+        """Vrátí sdílený pool customsearch klientů"""
+        if cls._client_pool is None:
+            with cls._cache_lock:
+                if cls._client_pool is None:
+                    cls._client_pool = ClientPool(SearchService._build_client)
+        return cls._client_pool
+
+    @classmethod
+    def get_rate_limiter(cls):
+        """Vrátí sdílený rate limiter (nakonfigurovaný z SEARCH_RATE_LIMIT_* a SEARCH_*QUOTA*)"""
+        if cls._rate_limiter is None:
+            with cls._cache_lock:
+                if cls._rate_limiter is None:
+                    cls._rate_limiter = RateLimiter.from_env()
+        return cls._rate_limiter
+
+    @classmethod
+    def get_single_flight(cls):
+        """Vrátí sdílený SingleFlight pro slučování souběžných stejných dotazů
+
+        Mezi procesy se slučuje jen s perzistentní cache (výsledek si
+        procesy předávají přes ni). Zámky leží v SEARCH_LOCK_DIR, výchozí
+        je adresář vedle cache (SEARCH_CACHE_PATH + ".locks").
+        """
+        if cls._single_flight is None:
+            with cls._cache_lock:
+                if cls._single_flight is None:
+                    cache_path = os.getenv("SEARCH_CACHE_PATH")
+                    lock_dir = os.getenv("SEARCH_LOCK_DIR") or (
+                        f"{cache_path}.locks" if cache_path else None
+                    )
+                    cls._single_flight = SingleFlight(lock_dir if cache_path else None)
+        return cls._single_flight
+
+    @classmethod
+    def get_refresher(cls):
+        """Vrátí sdílený BackgroundRefresher (SEARCH_REFRESH_*)"""
+        if cls._refresher is None:
+            with cls._cache_lock:
+                if cls._refresher is None:
+                    cls._refresher = BackgroundRefresher.from_env(
+                        quota_remaining=cls.quota_remaining
+                    )
+        return cls._refresher
+
+    @classmethod
+    def get_history(cls):
+        """Vrátí úložiště historie pořadí nebo None, pokud není nakonfigurované"""
+        if not cls._history_loaded:
+            with cls._cache_lock:
+                if not cls._history_loaded:
+                    cls._history = RankHistory.from_env()
+                    cls._history_loaded = True
+        return cls._history
+
+    @classmethod
+    def record_history(cls, query, language, results):
+        """
+        Uloží výsledky do historie pořadí (pokud je zapnutá)
+
+        Chyba zápisu historie vyhledávání neshodí, jen se zaloguje.
+
+        Args:
+            query: Vyhledávací dotaz
+            language: Jazyk výsledků
+            results: Naparsované výsledky (ResultSet)
+
+        Returns:
+            bool: True, pokud se snímek uložil
+        """
+        history = cls.get_history()
+        if history is None:
+            return False
+        try:
+            history.record(query, language, results)
+        except Exception as e:
+            logger.warning("Zápis historie pořadí selhal: %s", e)
+            return False
+        return True
+
+    @classmethod
+    def get_metrics(cls):
+        """Vrátí sdílené metriky služby (SearchMetrics)"""
+        if cls._metrics is None:
+            with cls._cache_lock:
+                if cls._metrics is None:
+                    cls._metrics = SearchMetrics(
+                        quota_remaining=cls.quota_remaining,
+                        memory_stats=lambda: cls.get_memory_cache().stats(),
+                    )
+        return cls._metrics
+
+    @classmethod
+    def get_item_fields(cls):
+        """
+        Vrátí pole výsledků, na která se odpověď API zúží, nebo None (plná odpověď)
+
+        - SEARCH_SLIM_RESPONSES: 1/true/yes zapne úsporný režim - API vrací
+          jen title, link a snippet (parametr fields) a stejně zúžená
+          odpověď se ukládá do cache
+        - SEARCH_EXTRA_FIELDS: další pole výsledku oddělená čárkou
+          (např. displayLink,pagemap)
+        """
+        if not cls._item_fields_loaded:
+            with cls._cache_lock:
+                if not cls._item_fields_loaded:
+                    cls._item_fields = None
+                    if os.getenv("SEARCH_SLIM_RESPONSES", "").lower() in ("1", "true", "yes"):
+                        extra = os.getenv("SEARCH_EXTRA_FIELDS", "").split(",")
+                        cls._item_fields = tuple(
+                            dict.fromkeys(
+                                cls.SLIM_ITEM_FIELDS
+                                + tuple(field.strip() for field in extra if field.strip())
+                            )
+                        )
+                    cls._item_fields_loaded = True
+        return cls._item_fields
+
+    @staticmethod
+    def fields_param(item_fields):
+        """
+        Hodnota parametru fields (partial response) pro dané pole výsledků
+
+        Kromě výsledků se drží searchInformation a startIndex stránky,
+        podle kterého ResultsParser řadí souběžně stažené stránky.
+        """
+        return f"items({','.join(item_fields)}),searchInformation,queries(request(startIndex))"
+
+    @staticmethod
+    def project_response(response, item_fields):
+        """
+        Zúží odpověď API na pole z fields_param
+
+        API s parametrem fields vrací rovnou zúženou odpověď, projekce
+        to jen zaručí i pro servery, které fields ignorují - do cache se
+        nikdy nedostane víc než zúžená data.
+
+        Args:
+            response: Odpověď API (jedna stránka nebo {"pages": [...]})
+            item_fields: Pole výsledků (None = odpověď beze změny)
+
+        Returns:
+            dict: Zúžená odpověď stejného tvaru
+        """
+        if item_fields is None:
+            return response
+        if "pages" in response:
+            return {
+                "pages": [
+                    SearchService.project_response(page, item_fields)
+                    for page in response["pages"]
+                ]
+            }
+
+        projected = {}
+        if "items" in response:
+            projected["items"] = [
+                {field: item[field] for field in item_fields if field in item}
+                for item in response["items"]
+            ]
+        if "searchInformation" in response:
+            projected["searchInformation"] = response["searchInformation"]
+        requests = response.get("queries", {}).get("request")
+        if requests:
+            projected["queries"] = {
+                "request": [{"startIndex": r["startIndex"]} for r in requests if "startIndex" in r]
+            }
+        return projected
+
+    @classmethod
+    def quota_remaining(cls):
+        """
+        Vrátí počet API dotazů, které dnes ještě zbývají
+
+        Hodí se před spuštěním dávky - dotaz na víc než 10 výsledků
+        spotřebuje jeden API dotaz za každou stránku.
+        """
+        return cls.get_rate_limiter().quota_remaining()
+
+    @staticmethod
+    def normalize_query(query):
+        """Kanonický tvar dotazu pro cache (viz ResultCache.normalize_query)"""
+        return ResultCache.normalize_query(query)
+
+    @staticmethod
+    def clean_query(query):
+        """Dotaz pro API - sjednocené mezery a Unicode (viz ResultCache.clean_query)"""
+        return ResultCache.clean_query(query)
+
+    @classmethod
+    def reset(cls):
+        """Zahodí sdílený stav služby (cache, klienty, limiter, ...), načte se znovu"""
+        with cls._cache_lock:
+            cls._cache = None
+            cls._cache_loaded = False
+            cls._memory_cache = None
+            cls._client_pool = None
+            cls._rate_limiter = None
+            cls._single_flight = None
+            cls._refresher = None
+            cls._history = None
+            cls._history_loaded = False
+            cls._metrics = None
+            cls._item_fields = None
+            cls._item_fields_loaded = False
+
+    @staticmethod
+    def _build_client(api_key):
+        """Vytvoří customsearch klienta s vlastním keep-alive HTTP spojením
+
+        Discovery dokument se bere z kopie přibalené ke googleapiclient
+        (static_discovery), takže se nikdy nestahuje ze sítě.
+
+        SEARCH_API_ENDPOINT přesměruje volání na jiný server, např. na
+        lokální fake_search_server.py pro zátěžové testy.
+        """
+        import httplib2
+
+        endpoint = os.getenv("SEARCH_API_ENDPOINT")
+
+        return build(
+            "customsearch",
+            "v1",
+            developerKey=api_key,
+            http=httplib2.Http(timeout=SearchService.HTTP_TIMEOUT),
+            static_discovery=True,
+            cache_discovery=False,
+            client_options={"api_endpoint": endpoint} if endpoint else None,
+        )
+
     @staticmethod
-    @st.cache_data(ttl=3600)
     def google_search(api_key, cx, query, num, language="cs"):
         """
         Provede vyhledávání pomocí Google Custom Search API
 
+        Výsledek se drží v komprimované paměťové cache procesu
+        (get_memory_cache) a zároveň v perzistentní cache (viz fetch).
+        Stejně jako na disku se pro dotaz a jazyk drží nejdelší odpověď
+        a menší num se z ní ořízne. Do paměti se ukládá jen čerstvá
+        odpověď - prošlý záznam vrácený během obnovy na pozadí nebo po
+        chybě API by v ní jinak přežil i novější data na disku.
+
         Args:
             api_key: Google Custom Search API klíč
             cx: Custom Search Engine ID
             query: Vyhledávací dotaz
-            num: Počet výsledků (max 10)
+            num: Počet výsledků (max 100, nad 10 se stahuje po stránkách)
             language: Jazyk výsledků (cs, en, sk, pl, de, fr, es, it)
                      Země pro geolokalizaci se automaticky určí podle jazyka
 
         Returns:
-            dict: Google API odpověď
-        """
-         # Tato zpráva se vypíše JEN když se volá API (ne z cache)
-        print(f"🔴 API CALL: {query}, {num}, {language}")  # ← Do konzole
-        # Build service v rámci cachovatelné funkce
-        service = build("customsearch", "v1", developerKey=api_key)
-
-        # Automaticky určí zemi podle zvoleného jazyka
-        country = SearchService.LANGUAGE_COUNTRY_MAP.get(language, "US")
-
-        res = (
-            service.cse()
-            .list(
-                q=query,
-                cx=cx,
-                num=num,
-                lr=f"lang_{language}",  # Language restrict - omezí výsledky na daný jazyk
-                gl=country,  # Geolocation - automaticky podle jazyka
-            )
-            .execute()
-        )
+            dict: Google API odpověď, pro num > 10 ve tvaru {"pages": [odpověď, ...]}
+        """
+        memory = SearchService.get_memory_cache()
+        num = min(num, SearchService.MAX_RESULTS)
+        key = ResultCache.make_key(cx, query, None, language, SearchService.get_item_fields())
+        res = SearchService._memory_lookup(memory, key, num)
+        if res is not None:
+            SearchService.get_metrics().cache_requests.inc(layer="memory", result="hit")
+            return res
+
+        SearchService.get_metrics().cache_requests.inc(layer="memory", result="miss")
+        res, state = SearchService.fetch(api_key, cx, query, num, language, with_state=True)
+        if state == "fresh":
+            memory.set(key, {"num": num, "response": res})
         return res
+
+    @staticmethod
+    def _memory_lookup(memory, key, num):
+        """
+        Najde odpověď pro num výsledků v paměťové cache
+
+        Args:
+            memory: MemoryCache
+            key: Klíč záznamu (make_key s num=None)
+            num: Požadovaný počet výsledků
+
+        Returns:
+            dict: Odpověď oříznutá na num nebo None, pokud záznam chybí
+                  nebo má méně výsledků
+        """
+        entry = memory.get(key)
+        if entry is None or entry["num"] < num:
+            return None
+        return SearchService.slice_response(entry["response"], num)
+
+    @staticmethod
+    def google_search_locales(api_key, cx, query, num, languages):
+        """
+        Provede jeden dotaz souběžně ve více jazycích přes paměťovou cache
+
+        Z API (resp. perzistentní cache) se stahují jen jazyky, které
+        v paměťové cache chybí.
+
+        Args:
+            api_key: Google Custom Search API klíč
+            cx: Custom Search Engine ID
+            query: Vyhledávací dotaz
+            num: Počet výsledků na jazyk
+            languages: tuple kódů jazyků
+
+        Returns:
+            dict: {jazyk: Google API odpověď} v pořadí languages
+        """
+        memory = SearchService.get_memory_cache()
+        item_fields = SearchService.get_item_fields()
+        num = min(num, SearchService.MAX_RESULTS)
+        languages = list(dict.fromkeys(languages))
+        keys = {
+            language: ResultCache.make_key(cx, query, None, language, item_fields)
+            for language in languages
+        }
+
+        responses = {}
+        for language in languages:
+            res = SearchService._memory_lookup(memory, keys[language], num)
+            if res is not None:
+                responses[language] = res
+        missing = [language for language in languages if language not in responses]
+
+        if responses:
+            SearchService.get_metrics().cache_requests.inc(
+                len(responses), layer="memory", result="hit"
+            )
+        if missing:
+            SearchService.get_metrics().cache_requests.inc(
+                len(missing), layer="memory", result="miss"
+            )
+            fetched = SearchService.fetch_locales(
+                api_key, cx, query, num, missing, with_state=True
+            )
+            for language, (res, state) in fetched.items():
+                if state == "fresh":
+                    memory.set(keys[language], {"num": num, "response": res})
+                responses[language] = res
+
+        return {language: responses[language] for language in languages}
+
+    @staticmethod
+    def fetch_locales(api_key, cx, query, num, languages, with_state=False):
+        """
+        Provede jeden dotaz souběžně ve více jazycích (bez paměťové cache)
+
+        Každý jazyk jde přes fetch, takže sdílí perzistentní cache,
+        slučování stejných dotazů i rate limiter.
+
+        Returns:
+            dict: {jazyk: Google API odpověď} v pořadí languages,
+                  s with_state {jazyk: (odpověď, stav)} - viz fetch
+        """
+        languages = list(dict.fromkeys(languages))
+        if not languages:
+            return {}
+
+        def fetch_language(language):
+            return SearchService.fetch(api_key, cx, query, num, language, with_state)
+
+        workers = min(len(languages), SearchService.MAX_LOCALE_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(languages, executor.map(fetch_language, languages)))
+
+    @staticmethod
+    def fetch(api_key, cx, query, num, language="cs", with_state=False):
+        """
+        Provede vyhledávání přes perzistentní cache (bez paměťové cache)
+
+        Klíč cache používá normalizovaný dotaz (ResultCache.normalize_query),
+        do API jde dotaz jen se sjednocenými mezerami a Unicode
+        (ResultCache.clean_query), aby operátory OR/AND zůstaly velkými.
+        Pro každý dotaz a jazyk se v cache drží jen nejdelší stažená
+        odpověď a menší num se z ní obslouží oříznutím - API vrací prvních
+        k výsledků stejně, ať se ptáme na k nebo na víc.
+
+        Prošlý záznam v okně SEARCH_CACHE_STALE_TTL se vrátí hned a obnoví
+        na pozadí, v okně SEARCH_CACHE_STALE_IF_ERROR se vrátí, když API
+        selže.
+
+        Args:
+            stejné jako google_search
+            with_state: Vrátit i stav odpovědi
+
+        Returns:
+            dict: Google API odpověď, s with_state tuple (odpověď, stav) - stav
+                  je "fresh" (z API nebo čerstvý záznam cache), "stale" (prošlý
+                  záznam, obnovuje se na pozadí) nebo "fallback" (prošlý
+                  záznam vrácený po chybě API)
+        """
+        query = ResultCache.clean_query(query)
+        num = min(num, SearchService.MAX_RESULTS)
+        cache = SearchService.get_cache()
+        metrics = SearchService.get_metrics()
+        item_fields = SearchService.get_item_fields()
+        key = ResultCache.make_key(cx, query, None, language, item_fields)
+
+        def lookup():
+            entry = cache.get(key)
+            if entry is None or entry["num"] < num:
+                return None
+            return SearchService.slice_response(entry["response"], num), "fresh"
+
+        def store(res, res_num):
+            SearchService._cache_store(cache, key, res, res_num)
+
+        stale = None
+        if cache is not None:
+            state, stale, entry_num = SearchService._cache_lookup(cache, key, num)
+            if state == "hit":
+                metrics.cache_requests.inc(layer="disk", result="hit")
+                return (stale, "fresh") if with_state else stale
+            if state == "stale":
+                # Stale-while-revalidate: vrátí se hned, obnoví se na pozadí
+                metrics.cache_requests.inc(layer="disk", result="stale")
+                SearchService._schedule_refresh(
+                    api_key, cx, query, entry_num, language, store, item_fields
+                )
+                return (stale, "stale") if with_state else stale
+            metrics.cache_requests.inc(layer="disk", result="miss")
+
+        def load():
+            try:
+                res = SearchService._call_api(api_key, cx, query, num, language, item_fields)
+            except Exception as e:
+                if stale is None:
+                    raise
+                # Stale-if-error: při výpadku API nebo vyčerpané kvótě prošlý záznam
+                logger.warning("API selhalo, vracím prošlý záznam cache: %s", e)
+                metrics.cache_requests.inc(layer="disk", result="stale_on_error")
+                return stale, "fallback"
+            if cache is not None:
+                store(res, num)
+            return res, "fresh"
+
+        # Souběžné stejné dotazy (vlákna i procesy se stejnou cache) volají API jen jednou
+        flight_key = ResultCache.make_key(cx, query, num, language, item_fields)
+        recheck = lookup if cache is not None else None
+        result, shared = SearchService.get_single_flight().do(flight_key, load, recheck)
+        if shared:
+            metrics.coalesced.inc()
+        return result if with_state else result[0]
+
+    @staticmethod
+    def _cache_lookup(cache, key, num):
+        """
+        Najde odpověď pro num výsledků v perzistentní cache
+
+        Args:
+            cache: ResultCache
+            key: Klíč záznamu (make_key s num=None)
+            num: Požadovaný počet výsledků
+
+        Returns:
+            tuple: (stav, oříznutá odpověď, num záznamu) - stav je "hit"
+                   (čerstvý záznam), "stale" (okno stale-while-revalidate),
+                   "fallback" (jen pro případ chyby API, stale-if-error)
+                   nebo "miss" (odpověď None)
+        """
+        entry, age = cache.get_entry(key)
+        if entry is None or entry["num"] < num:
+            return "miss", None, None
+
+        response = SearchService.slice_response(entry["response"], num)
+        if age <= cache.ttl:
+            return "hit", response, entry["num"]
+        if age <= cache.ttl + cache.stale_ttl:
+            return "stale", response, entry["num"]
+        if age <= cache.ttl + cache.stale_if_error:
+            return "fallback", response, entry["num"]
+        return "miss", None, None
+
+    @staticmethod
+    def _cache_store(cache, key, res, res_num):
+        """Uloží odpověď do cache, delší odpověď uloženou mezitím jiným procesem nepřepisuje"""
+        entry = cache.get(key)
+        if entry is None or entry["num"] <= res_num:
+            cache.set(key, {"num": res_num, "response": res})
+
+    @staticmethod
+    def _schedule_refresh(api_key, cx, query, num, language, store, item_fields=None):
+        """Naplánuje obnovu prošlého záznamu na pozadí (v limitech BackgroundRefresher)"""
+        flight_key = ResultCache.make_key(cx, query, num, language, item_fields)
+
+        def refresh():
+            def load():
+                res = SearchService._call_api(api_key, cx, query, num, language, item_fields)
+                store(res, num)
+                return res
+
+            SearchService.get_single_flight().do(flight_key, load)
+
+        pages = -(-num // SearchService.PAGE_SIZE)
+        return SearchService.get_refresher().submit(flight_key, refresh, cost=pages)
+
+    @staticmethod
+    def slice_response(response, num):
+        """
+        Ořízne odpověď API na prvních num výsledků
+
+        Výsledek má stejný tvar, jaký by vrátilo přímé volání s num:
+        do 10 výsledků jedna stránka, jinak {"pages": [...]}.
+
+        Args:
+            response: Odpověď z _call_api (jedna stránka nebo {"pages": [...]})
+            num: Požadovaný počet výsledků (nejvýše num původní odpovědi)
+
+        Returns:
+            dict: Oříznutá odpověď
+        """
+        pages = response["pages"] if "pages" in response else [response]
+        sliced = []
+        for i, page in enumerate(pages[: -(-num // SearchService.PAGE_SIZE)]):
+            page = dict(page)
+            if "items" in page:
+                page["items"] = page["items"][: num - i * SearchService.PAGE_SIZE]
+            sliced.append(page)
+
+        if num <= SearchService.PAGE_SIZE:
+            return sliced[0]
+        return {"pages": sliced}
+
+    @staticmethod
+    def _call_api(api_key, cx, query, num, language, item_fields=None):
+        """Zavolá Custom Search API (bez jakékoliv cache)
+
+        Do 10 výsledků stačí jedno volání. Víc výsledků se stahuje po
+        stránkách (start=1, 11, 21, ...) souběžně v omezeném poolu vláken,
+        výsledné stránky spojí až ResultsParser. S item_fields se odpověď
+        zúží (viz get_item_fields).
+        """
+        logger.info("API call: query=%r num=%s language=%s", query, num, language)
+
+        num = min(num, SearchService.MAX_RESULTS)
+        if num <= SearchService.PAGE_SIZE:
+            res = SearchService._fetch_page(
+                api_key, cx, query, num, language, start=1, item_fields=item_fields
+            )
+            return SearchService.project_response(res, item_fields)
+
+        pages = SearchService.page_ranges(num)
+        workers = min(len(pages), SearchService.MAX_PAGE_WORKERS)
+
+        def fetch_page(page):
+            start, page_num = page
+            return SearchService._fetch_page(
+                api_key, cx, query, page_num, language, start, item_fields
+            )
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            res = {"pages": list(executor.map(fetch_page, pages))}
+        return SearchService.project_response(res, item_fields)
+
+    @staticmethod
+    def page_ranges(num):
+        """Rozdělí num výsledků na stránky API [(start, num stránky)] - start=1, 11, 21, ..."""
+        num = min(num, SearchService.MAX_RESULTS)
+        return [
+            (start, min(SearchService.PAGE_SIZE, num - start + 1))
+            for start in range(1, num + 1, SearchService.PAGE_SIZE)
+        ]
+
+    @staticmethod
+    def list_params(cx, query, num, language, start, item_fields=None):
+        """
+        Parametry jednoho volání cse.list
+
+        Země pro geolokalizaci (gl) se určí automaticky podle jazyka.
+        S item_fields se přidá parametr fields (partial response).
+        Stejné parametry posílá i AsyncSearchService přímo v REST dotazu.
+        """
+        params = {
+            "q": query,
+            "cx": cx,
+            "num": num,
+            "start": start,
+            "lr": f"lang_{language}",  # Language restrict - omezí výsledky na daný jazyk
+            "gl": SearchService.LANGUAGE_COUNTRY_MAP.get(language, "US"),  # Geolocation
+        }
+        if item_fields is not None:
+            params["fields"] = SearchService.fields_param(item_fields)
+        return params
+
+    @staticmethod
+    def _fetch_page(api_key, cx, query, num, language, start, item_fields=None):
+        """Stáhne jednu stránku výsledků (max 10)"""
+        metrics = SearchService.get_metrics()
+
+        with SearchService.get_client_pool().client(api_key) as service:
+            request = service.cse().list(
+                **SearchService.list_params(cx, query, num, language, start, item_fields)
+            )
+
+            def execute():
+                # Měří se každý pokus včetně opakování - každý spotřebuje kvótu
+                metrics.api_requests.inc(language=language)
+                with metrics.api_latency.time(language=language):
+                    try:
+                        return request.execute()
+                    except Exception as e:
+                        metrics.api_errors.inc(reason=RateLimiter.error_reason(e))
+                        raise
+
+            # Throttling, denní kvóta a opakování dočasných chyb
+            try:
+                return SearchService.get_rate_limiter().call(execute)
+            except QuotaExceededError as e:
+                if e.__cause__ is None:
+                    # Lokální počítadlo kvóty zastavilo volání ještě před API
+                    metrics.api_errors.inc(reason="localQuotaExceeded")
+                raise
@@ -0,0 +1,117 @@
+"""
+Sloučení souběžných stejných volání (single-flight)
+"""
+
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class _Call:
+    """Jedno probíhající volání, na které mohou čekat další vlákna"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Sloučení souběžných volání se stejným klíčem
+
+    V rámci procesu provede funkci jen první vlákno (leader), ostatní
+    počkají a dostanou jeho výsledek nebo výjimku. Mezi procesy na
+    stejném stroji se leadeři se stejným klíčem řadí přes zámek souboru
+    v `lock_dir`; po získání zámku se zavolá `recheck`, který typicky
+    podívá do sdílené cache, kam mezitím výsledek uložil jiný proces.
+    """
+
+    # Počet souborů se zámky (klíče se na ně rozhashují, počet souborů je omezený)
+    LOCK_STRIPES = 1024
+
+    def __init__(self, lock_dir=None):
+        """Inicializace
+
+        Args:
+            lock_dir: Adresář se zámky pro koordinaci mezi procesy
+                     (None = jen mezi vlákny jednoho procesu)
+        """
+        self.lock_dir = lock_dir if fcntl is not None else None
+        self._calls = {}
+        self._lock = threading.Lock()
+
+        if self.lock_dir:
+            os.makedirs(self.lock_dir, exist_ok=True)
+
+    @contextmanager
+    def _process_lock(self, key):
+        """Zámek souboru sdílený procesy (flock se uvolní i při pádu procesu)"""
+        if not self.lock_dir:
+            yield
+            return
+
+        stripe = zlib.crc32(key.encode("utf-8")) % self.LOCK_STRIPES
+        path = os.path.join(self.lock_dir, f"{stripe:04d}.lock")
+        with open(path, "a+b") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def do(self, key, func, recheck=None):
+        """
+        Provede func jen jednou pro všechna souběžná volání se stejným klíčem
+
+        Args:
+            key: Klíč volání (např. ResultCache.make_key)
+            func: Funkce bez argumentů, která výsledek opravdu získá
+            recheck: Volitelná funkce bez argumentů, která po získání
+                     zámku mezi procesy vrátí hotový výsledek (nebo None)
+
+        Returns:
+            tuple: (výsledek, shared) - shared je True, pokud výsledek
+                   získalo jiné vlákno nebo proces
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        shared = False
+        try:
+            with self._process_lock(key):
+                result = recheck() if recheck is not None else None
+                if result is not None:
+                    shared = True
+                else:
+                    result = func()
+            call.result = result
+            return result, shared
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        """Počet právě probíhajících volání (různých klíčů) v procesu"""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,413 @@
+"""
+Testy pro AsyncSearchService
+"""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from async_search_service import AsyncSearchService  # noqa: E402
+from fake_search_server import FakeSearchServer  # noqa: E402
+from rate_limiter import QuotaExceededError, RateLimiter, TokenBucket  # noqa: E402
+from search_service import SearchService  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def reset_search_service(monkeypatch):
+    """Každý test začíná bez sdíleného stavu SearchService a bez perzistentní cache"""
+    monkeypatch.delenv("SEARCH_CACHE_PATH", raising=False)
+    SearchService.reset()
+    yield
+    SearchService.reset()
+
+
+def page(query, start, num):
+    """Odpověď jedné stránky API"""
+    return {
+        "items": [
+            {"title": f"{query} {i}", "link": f"https://example.com/{i}", "snippet": ""}
+            for i in range(start, start + num)
+        ]
+    }
+
+
+def mock_service(handler, **kwargs):
+    """AsyncSearchService s httpx.MockTransport místo sítě"""
+    service = AsyncSearchService("key", "cx", **kwargs)
+    service._client = httpx.AsyncClient(
+        base_url="https://customsearch.googleapis.com/", transport=httpx.MockTransport(handler)
+    )
+    return service
+
+
+def api_handler(calls, status=200, body=None):
+    """Handler MockTransport, který zaznamenává parametry volání"""
+
+    def handler(request):
+        params = dict(request.url.params)
+        calls.append(params)
+        if status != 200:
+            return httpx.Response(status, json=body or {})
+        return httpx.Response(
+            200, json=page(params["q"], int(params["start"]), int(params["num"]))
+        )
+
+    return handler
+
+
+class TestAsyncSearchService:
+    """Testy pro AsyncSearchService proti httpx.MockTransport"""
+
+    def test_init_from_env(self, monkeypatch):
+        monkeypatch.setenv("GOOGLE_API_KEY", "env-key")
+        monkeypatch.setenv("GOOGLE_CX", "env-cx")
+        monkeypatch.setenv("SEARCH_ASYNC_MAX_CONNECTIONS", "7")
+
+        service = AsyncSearchService()
+
+        assert (service.api_key, service.cx, service.max_connections) == ("env-key", "env-cx", 7)
+
+    def test_search(self):
+        """Test že parametry a výsledky odpovídají synchronní cestě"""
+        calls = []
+
+        async def run():
+            async with mock_service(api_handler(calls)) as service:
+                return await service.search("  Python ", 5, language="de")
+
+        results = asyncio.run(run())
+
+        assert len(results) == 5
+        assert results[0]["rank"] == 1
+        assert calls == [
+            {
+                "q": "Python",
+                "cx": "cx",
+                "num": "5",
+                "start": "1",
+                "lr": "lang_de",
+                "gl": "DE",
+                "key": "key",
+            }
+        ]
+
+    def test_query_keeps_case(self):
+        """Test že operátor OR zůstane v parametru q velkými písmeny"""
+        calls = []
+
+        async def run():
+            async with mock_service(api_handler(calls)) as service:
+                return await service.fetch(" python  OR java ", 1)
+
+        asyncio.run(run())
+
+        assert calls[0]["q"] == "python OR java"
+
+    def test_slim_fields(self, monkeypatch):
+        """Test že úsporný režim posílá fields a vrací zúženou odpověď"""
+        monkeypatch.setenv("SEARCH_SLIM_RESPONSES", "1")
+
+        def handler(request):
+            assert request.url.params["fields"].startswith("items(title,link,snippet)")
+            body = page("x", 1, 1)
+            body["items"][0]["pagemap"] = {"metatags": []}
+            return httpx.Response(200, json=body)
+
+        async def run():
+            async with mock_service(handler) as service:
+                return await service.fetch("x", 1)
+
+        response = asyncio.run(run())
+
+        assert list(response["items"][0]) == ["title", "link", "snippet"]
+
+    def test_pages(self):
+        """Test souběžného stažení stránek pro num > 10"""
+        calls = []
+
+        async def run():
+            async with mock_service(api_handler(calls)) as service:
+                return await service.fetch("python", 25)
+
+        response = asyncio.run(run())
+
+        assert [len(p["items"]) for p in response["pages"]] == [10, 10, 5]
+        assert sorted((c["start"], c["num"]) for c in calls) == [
+            ("1", "10"),
+            ("11", "10"),
+            ("21", "5"),
+        ]
+
+    def test_search_many_order_and_coalescing(self):
+        """Test že výsledky drží pořadí dotazů (i pro stejné normalizované dotazy)"""
+        calls = []
+
+        async def run():
+            async with mock_service(api_handler(calls)) as service:
+                return await service.search_many(["a", "b", "A ", "c"], num=3, concurrency=2)
+
+        results = asyncio.run(run())
+
+        assert [r[0]["title"].lower() for r in results] == ["a 1", "b 1", "a 1", "c 1"]
+        assert sorted({c["q"].lower() for c in calls}) == ["a", "b", "c"]
+
+    def test_coalesced(self):
+        """Test že souběžné stejné dotazy sdílí jedno volání API"""
+        calls = []
+
+        async def run():
+            async with mock_service(api_handler(calls)) as service:
+                return await asyncio.gather(*(service.fetch("python", 10) for _ in range(5)))
+
+        responses = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert all(response == responses[0] for response in responses)
+        assert SearchService.get_metrics().coalesced.value() == 4
+
+    def test_search_many_return_exceptions(self):
+        calls = []
+        body = {"error": {"errors": [{"reason": "invalid"}]}}
+
+        async def run():
+            async with mock_service(api_handler(calls, 400, body)) as service:
+                return await service.search_many(["a", "b"], return_exceptions=True)
+
+        results = asyncio.run(run())
+
+        assert all(type(r).__name__ == "HttpError" for r in results)
+        assert SearchService.get_metrics().api_errors.value(reason="invalid") == 2
+
+    def test_error_hides_api_key(self):
+        calls = []
+
+        async def run():
+            async with mock_service(api_handler(calls, 400)) as service:
+                await service.search("python")
+
+        with pytest.raises(Exception) as exc_info:
+            asyncio.run(run())
+
+        assert "key=key" not in str(exc_info.value)
+
+    def test_retry(self, monkeypatch):
+        """Test opakování dočasné chyby přes sdílený RateLimiter"""
+        monkeypatch.setenv("SEARCH_MAX_RETRIES", "2")
+        statuses = iter([503, 200])
+
+        def handler(request):
+            status = next(statuses)
+            if status != 200:
+                return httpx.Response(status, json={})
+            return httpx.Response(200, json=page("x", 1, 1))
+
+        async def run():
+            async with mock_service(handler) as service:
+                return await service.fetch("x", 1)
+
+        with patch.object(RateLimiter, "backoff", return_value=0):
+            response = asyncio.run(run())
+
+        assert len(response["items"]) == 1
+        assert SearchService.get_metrics().api_requests.value(language="cs") == 2
+
+    def test_transport_error_is_connection_error(self, monkeypatch):
+        monkeypatch.setenv("SEARCH_MAX_RETRIES", "0")
+
+        def handler(request):
+            raise httpx.ConnectError("spojení odmítnuto")
+
+        async def run():
+            async with mock_service(handler) as service:
+                await service.fetch("x", 1)
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(run())
+
+    def test_shared_quota(self, monkeypatch):
+        """Test že asynchronní volání čerpají stejnou denní kvótu jako synchronní"""
+        monkeypatch.setenv("SEARCH_DAILY_QUOTA", "2")
+        calls = []
+
+        async def run():
+            async with mock_service(api_handler(calls)) as service:
+                await service.fetch("a", 10)
+                await service.fetch("b", 10)
+                await service.fetch("c", 10)
+
+        with pytest.raises(QuotaExceededError):
+            asyncio.run(run())
+
+        assert len(calls) == 2
+        assert SearchService.quota_remaining() == 0
+        assert SearchService.get_metrics().api_errors.value(reason="localQuotaExceeded") == 1
+
+    def test_shared_cache(self, monkeypatch, tmp_path):
+        """Test že asynchronní a synchronní cesta sdílí perzistentní cache"""
+        monkeypatch.setenv("SEARCH_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+        SearchService.reset()
+        calls = []
+
+        async def run():
+            async with mock_service(api_handler(calls)) as service:
+                return await service.fetch("Python", 20)
+
+        response = asyncio.run(run())
+
+        with patch.object(SearchService, "_call_api") as call_api:
+            cached = SearchService.fetch("key", "cx", "python", 5)
+
+        call_api.assert_not_called()
+        assert cached == SearchService.slice_response(response, 5)
+        assert len(calls) == 2
+
+    def test_stale_if_error(self, monkeypatch, tmp_path):
+        """Test že při výpadku API se vrátí prošlý záznam"""
+        monkeypatch.setenv("SEARCH_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+        monkeypatch.setenv("SEARCH_CACHE_TTL", "100")
+        monkeypatch.setenv("SEARCH_CACHE_STALE_IF_ERROR", "1000")
+        monkeypatch.setenv("SEARCH_MAX_RETRIES", "0")
+        SearchService.reset()
+        cache = SearchService.get_cache()
+        key = cache.make_key("cx", "python", None, "cs")
+        with patch("result_cache.time.time", return_value=0):
+            cache.set(key, {"num": 10, "response": page("python", 1, 10)})
+
+        async def run():
+            async with mock_service(api_handler([], 503)) as service:
+                return await service.fetch("python", 10)
+
+        with patch("result_cache.time.time", return_value=500):
+            response = asyncio.run(run())
+
+        assert len(response["items"]) == 10
+        summary = SearchService.get_metrics().cache_requests
+        assert summary.value(layer="disk", result="stale_on_error") == 1
+
+    def test_quota_consume_does_not_block_loop(self):
+        """Test že čekání na zámek kvóty (SQLite) neblokuje event loop"""
+        calls = []
+        release = threading.Event()
+        quota = SearchService.get_rate_limiter().quota
+        consume = quota.consume
+
+        def blocked_consume(count=1):
+            release.wait(5)
+            return consume(count)
+
+        async def run():
+            async with mock_service(api_handler(calls)) as service:
+                task = asyncio.ensure_future(service.fetch("x", 1))
+                ticks = 0
+                for _ in range(5):
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+                assert not task.done()
+                release.set()
+                await task
+                return ticks
+
+        with patch.object(quota, "consume", side_effect=blocked_consume):
+            ticks = asyncio.run(run())
+
+        assert ticks == 5
+        assert len(calls) == 1
+
+    def test_refresh_quota_check_does_not_block_loop(self, monkeypatch, tmp_path):
+        """Test že kontrola kvóty před obnovou na pozadí neblokuje event loop"""
+        monkeypatch.setenv("SEARCH_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+        monkeypatch.setenv("SEARCH_CACHE_TTL", "100")
+        monkeypatch.setenv("SEARCH_CACHE_STALE_TTL", "1000")
+        SearchService.reset()
+        cache = SearchService.get_cache()
+        with patch("result_cache.time.time", return_value=0):
+            cache.set(
+                cache.make_key("cx", "python", None, "cs"),
+                {"num": 10, "response": page("python", 1, 10)},
+            )
+        release = threading.Event()
+        refresher = SearchService.get_refresher()
+
+        def blocked_quota_remaining():
+            release.wait(5)
+            return 0
+
+        async def run():
+            async with mock_service(api_handler([])) as service:
+                task = asyncio.ensure_future(service.fetch("python", 10))
+                ticks = 0
+                for _ in range(5):
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+                assert not task.done()
+                release.set()
+                response = await task
+                return ticks, response
+
+        monkeypatch.setattr(refresher, "quota_remaining", blocked_quota_remaining)
+        with patch("result_cache.time.time", return_value=500):
+            ticks, response = asyncio.run(run())
+
+        assert ticks == 5
+        assert len(response["items"]) == 10
+        assert SearchService.get_metrics().cache_requests.value(layer="disk", result="stale") == 1
+
+    def test_missing_httpx(self):
+        service = AsyncSearchService("key", "cx")
+        with patch.dict("sys.modules", {"httpx": None}):
+            with pytest.raises(ImportError, match="httpx"):
+                service._get_client()
+
+
+class TestTokenBucketReserve:
+    """Testy neblokující rezervace tokenů (pro asyncio)"""
+
+    def test_reserve(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+        assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+@pytest.mark.integration
+class TestAsyncSearchServiceAgainstFakeServer:
+    """Testy AsyncSearchService přes skutečné HTTP proti fake serveru"""
+
+    def test_search_many_connection_pool(self, monkeypatch):
+        """Test souběžných dotazů přes omezený pool keep-alive spojení"""
+        monkeypatch.setenv("SEARCH_RATE_LIMIT_QPS", "1000")
+
+        async def run():
+            async with AsyncSearchService("key", "cx", max_connections=4) as service:
+                return await service.search_many([f"dotaz {i}" for i in range(20)], num=15)
+
+        with FakeSearchServer() as server:
+            monkeypatch.setenv("SEARCH_API_ENDPOINT", server.endpoint)
+            results = asyncio.run(run())
+
+            assert server.stats["requests"] == 40
+            assert server.stats["connections"] <= 4
+
+        assert [len(r) for r in results] == [15] * 20
+        assert "(cs-cz)" in results[0][0]["title"]
+
+    def test_quota_exhausted(self, monkeypatch):
+        """Test že vyčerpaná kvóta na straně API skončí QuotaExceededError"""
+
+        async def run():
+            async with AsyncSearchService("key", "cx") as service:
+                await service.search("python")
+                await service.search("java")
+
+        with FakeSearchServer(daily_quota=1) as server:
+            monkeypatch.setenv("SEARCH_API_ENDPOINT", server.endpoint)
+            with pytest.raises(QuotaExceededError):
+                asyncio.run(run())
+
+            assert server.stats["statuses"][403] == 1
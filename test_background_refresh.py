@@ -0,0 +1,62 @@
+"""
+Unit testy pro BackgroundRefresher
+"""
+
+import threading
+
+from background_refresh import BackgroundRefresher
+
+
+class TestBackgroundRefresher:
+    """Testy pro BackgroundRefresher třídu"""
+
+    def test_runs_refresh(self):
+        """Test že obnova proběhne na pozadí"""
+        refresher = BackgroundRefresher(max_workers=1)
+
+        future = refresher.submit("klic", lambda: "obnoveno")
+
+        assert future.result(5) == "obnoveno"
+        assert refresher.pending() == 0
+
+    def test_limits_concurrency_and_dedupes_keys(self):
+        """Test že se stejný klíč neobnovuje dvakrát a obnovy se nehromadí"""
+        refresher = BackgroundRefresher(max_workers=2)
+        release = threading.Event()
+
+        first = refresher.submit("a", lambda: release.wait(5))
+        assert refresher.submit("a", lambda: None) is None
+        second = refresher.submit("b", lambda: release.wait(5))
+        assert refresher.submit("c", lambda: None) is None
+
+        release.set()
+        first.result(5)
+        second.result(5)
+        assert refresher.submit("c", lambda: "ok").result(5) == "ok"
+
+    def test_respects_quota_reserve(self):
+        """Test že obnovy nesáhnou na rezervu denní kvóty"""
+        refresher = BackgroundRefresher(quota_reserve=10, quota_remaining=lambda: 12)
+
+        assert refresher.submit("a", lambda: None, cost=3) is None
+        assert refresher.submit("a", lambda: "ok", cost=2).result(5) == "ok"
+
+    def test_error_does_not_propagate(self):
+        """Test že chyba obnovy neshodí vlákno a klíč se uvolní"""
+        refresher = BackgroundRefresher(max_workers=1)
+
+        def failing():
+            raise RuntimeError("API nedostupné")
+
+        assert refresher.submit("a", failing).result(5) is None
+        assert refresher.pending() == 0
+
+    def test_from_env(self, monkeypatch):
+        """Test konfigurace z environment proměnných"""
+        monkeypatch.setenv("SEARCH_REFRESH_WORKERS", "4")
+        monkeypatch.setenv("SEARCH_REFRESH_QUOTA_RESERVE", "50")
+
+        refresher = BackgroundRefresher.from_env()
+
+        assert refresher.max_workers == 4
+        assert refresher.quota_reserve == 50
@@ -0,0 +1,212 @@
+"""
+Unit testy pro dávkový režim
+"""
+
+import io
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from batch import BatchRunner, main
+
+
+def fake_fetch(api_key, cx, query, num, language="cs"):
+    """Náhrada SearchService.fetch - vrací jeden výsledek podle dotazu"""
+    if query == "chyba":
+        raise RuntimeError("API selhalo")
+    return {"items": [{"title": f"{query} ({language})", "link": "http://test.com"}]}
+
+
+class TestBatchRunner:
+    """Testy pro BatchRunner třídu"""
+
+    @pytest.fixture
+    def queries_file(self, tmp_path):
+        """Fixture se vstupním CSV"""
+        path = tmp_path / "queries.csv"
+        path.write_text(
+            "query,language,num\n"
+            "# komentář\n"
+            "python,en,5\n"
+            "\n"
+            "česká kuchyně\n"
+            "java,,3\n",
+            encoding="utf-8",
+        )
+        return str(path)
+
+    def test_read_queries(self, queries_file):
+        """Test čtení dotazů s výchozími hodnotami"""
+        queries = list(BatchRunner.read_queries(queries_file, language="cs", num=10))
+
+        assert queries == [
+            ("python", "en", 5),
+            ("česká kuchyně", "cs", 10),
+            ("java", "cs", 3),
+        ]
+
+    def test_run_writes_jsonl(self, queries_file, tmp_path):
+        """Test že každý dotaz dá jeden řádek JSONL s normalizovanými výsledky"""
+        output = str(tmp_path / "out.jsonl")
+        runner = BatchRunner("key", "cx", workers=2, progress=None)
+
+        with patch("batch.SearchService.fetch", side_effect=fake_fetch):
+            stats = runner.run(BatchRunner.read_queries(queries_file), output)
+
+        with open(output, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+
+        assert stats["done"] == 3
+        assert {r["query"] for r in records} == {"python", "česká kuchyně", "java"}
+        python = next(r for r in records if r["query"] == "python")
+        assert python["results"][0]["rank"] == 1
+        assert python["results"][0]["title"] == "python (en)"
+        assert "fetched_at" in python
+
+    def test_run_records_errors(self, tmp_path):
+        """Test že chyba jednoho dotazu nezastaví dávku"""
+        output = str(tmp_path / "out.jsonl")
+        runner = BatchRunner("key", "cx", progress=None)
+
+        with patch("batch.SearchService.fetch", side_effect=fake_fetch):
+            stats = runner.run([("chyba", "cs", 10), ("ok", "cs", 10)], output)
+
+        assert stats["failed"] == 1
+        assert stats["done"] == 1
+
+    def test_run_records_history(self, tmp_path, monkeypatch):
+        """Test že se zapnutou historií se úspěšné dotazy uloží jako snímky"""
+        from search_service import SearchService
+
+        monkeypatch.setenv("SEARCH_HISTORY_PATH", str(tmp_path / "history.sqlite3"))
+        SearchService.reset()
+        runner = BatchRunner("key", "cx", progress=None)
+
+        try:
+            with patch("batch.SearchService.fetch", side_effect=fake_fetch):
+                runner.run([("chyba", "cs", 10), ("python", "en", 10)], str(tmp_path / "o.jsonl"))
+
+            history = SearchService.get_history()
+            assert history.days("python", "en")
+            assert history.days("chyba", "cs") == []
+        finally:
+            SearchService.reset()
+
+    def test_resume_skips_finished(self, tmp_path):
+        """Test že resume přeskočí hotové dotazy a zopakuje chybné"""
+        output = tmp_path / "out.jsonl"
+        output.write_text(
+            json.dumps({"query": "hotovo", "language": "cs", "num": 10, "results": []})
+            + "\n"
+            + json.dumps({"query": "chybne", "language": "cs", "num": 10, "error": "x"})
+            + "\n"
+            + '{"query": "useknu',
+            encoding="utf-8",
+        )
+        runner = BatchRunner("key", "cx", progress=None)
+
+        with patch("batch.SearchService.fetch", side_effect=fake_fetch) as mock_fetch:
+            stats = runner.run(
+                [("hotovo", "cs", 10), ("chybne", "cs", 10), ("nove", "cs", 10)],
+                str(output),
+                resume=True,
+            )
+
+        assert stats["skipped"] == 1
+        assert stats["done"] == 2
+        assert sorted(c[0][2] for c in mock_fetch.call_args_list) == ["chybne", "nove"]
+        # Nové záznamy nesmí navázat na useknutý řádek
+        assert BatchRunner.read_checkpoint(str(output)) == {
+            ("hotovo", "cs", 10),
+            ("chybne", "cs", 10),
+            ("nove", "cs", 10),
+        }
+
+    def test_bounded_in_flight(self, tmp_path):
+        """Test že se vstup nečte celý dopředu (paměť zůstává konstantní)"""
+        consumed = []
+
+        def queries():
+            for i in range(20):
+                consumed.append(i)
+                yield f"q{i}", "cs", 10
+
+        in_flight_max = []
+
+        def slow_fetch(*args, **kwargs):
+            in_flight_max.append(len(consumed))
+            return {"items": []}
+
+        runner = BatchRunner("key", "cx", workers=2, progress=None)
+        with patch("batch.SearchService.fetch", side_effect=slow_fetch):
+            runner.run(queries(), str(tmp_path / "out.jsonl"))
+
+        # První dotaz se spustí dřív, než je přečten celý vstup
+        assert in_flight_max[0] < 20
+
+    def test_progress_output(self, tmp_path):
+        """Test výpisu průběhu a propustnosti"""
+        progress = io.StringIO()
+        runner = BatchRunner("key", "cx", progress=progress)
+
+        with patch("batch.SearchService.fetch", side_effect=fake_fetch):
+            runner.run([("a", "cs", 10), ("b", "cs", 10)], str(tmp_path / "out.jsonl"), total=2)
+
+        assert "[2/2]" in progress.getvalue()
+        assert "dotazů/s" in progress.getvalue()
+
+
+class TestBatchMain:
+    """Testy pro CLI vstupní bod"""
+
+    def test_main(self, tmp_path, capsys):
+        """Test spuštění z příkazové řádky"""
+        queries = tmp_path / "queries.csv"
+        queries.write_text("python\njava\n", encoding="utf-8")
+        output = tmp_path / "out.jsonl"
+        env = {"GOOGLE_API_KEY": "key", "GOOGLE_CX": "cx"}
+
+        with patch.dict(os.environ, env), patch(
+            "batch.SearchService.fetch", side_effect=fake_fetch
+        ):
+            exit_code = main([str(queries), "-o", str(output), "-w", "2"])
+
+        assert exit_code == 0
+        assert len(output.read_text(encoding="utf-8").splitlines()) == 2
+        assert "Hotovo: 2" in capsys.readouterr().err
+
+    def test_main_warns_about_quota(self, tmp_path, capsys):
+        """Test varování, když denní kvóta nestačí na celou dávku"""
+        queries = tmp_path / "queries.csv"
+        queries.write_text("python\njava\n", encoding="utf-8")
+        env = {"GOOGLE_API_KEY": "key", "GOOGLE_CX": "cx"}
+
+        with patch.dict(os.environ, env), patch(
+            "batch.SearchService.quota_remaining", return_value=1
+        ), patch("batch.SearchService.fetch", side_effect=fake_fetch):
+            main([str(queries), "-o", str(tmp_path / "out.jsonl")])
+
+        assert "kvóta (1)" in capsys.readouterr().err
+
+    def test_main_quota_counts_pages(self, tmp_path, capsys):
+        """Test že kontrola kvóty počítá jedno volání API na každou stránku výsledků"""
+        queries = tmp_path / "queries.csv"
+        queries.write_text("python,cs,25\njava\n", encoding="utf-8")
+        env = {"GOOGLE_API_KEY": "key", "GOOGLE_CX": "cx"}
+
+        with patch.dict(os.environ, env), patch(
+            "batch.SearchService.quota_remaining", return_value=3
+        ), patch("batch.SearchService.fetch", side_effect=fake_fetch):
+            main([str(queries), "-o", str(tmp_path / "out.jsonl")])
+
+        assert "nestačí na 2 dotazů (4 volání API)" in capsys.readouterr().err
+
+    def test_main_missing_credentials(self, tmp_path):
+        """Test že bez credentials CLI skončí chybou"""
+        queries = tmp_path / "queries.csv"
+        queries.write_text("python\n", encoding="utf-8")
+
+        with patch.dict(os.environ, {}, clear=True), pytest.raises(SystemExit):
+            main([str(queries), "-o", str(tmp_path / "out.jsonl")])
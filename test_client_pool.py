@@ -0,0 +1,85 @@
+"""
+Unit testy pro ClientPool
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from client_pool import ClientPool
+
+
+class TestClientPool:
+    """Testy pro ClientPool třídu"""
+
+    def test_reuses_client(self):
+        """Test že vrácený klient se znovu použije místo nového build()"""
+        factory = Mock(side_effect=lambda key: object())
+        pool = ClientPool(factory)
+
+        with pool.client("key") as first:
+            pass
+        with pool.client("key") as second:
+            pass
+
+        assert first is second
+        assert factory.call_count == 1
+
+    def test_separate_clients_per_api_key(self):
+        """Test že různé API klíče nesdílí klienty"""
+        pool = ClientPool(lambda key: {"key": key})
+
+        with pool.client("a") as client_a:
+            pass
+        with pool.client("b") as client_b:
+            pass
+
+        assert client_a["key"] == "a"
+        assert client_b["key"] == "b"
+
+    def test_concurrent_borrowers_get_distinct_clients(self):
+        """Test že souběžná vlákna nikdy nesdílí jednoho klienta"""
+        pool = ClientPool(lambda key: object())
+        barrier = threading.Barrier(4)
+
+        def borrow(_):
+            with pool.client("key") as client:
+                barrier.wait(timeout=5)
+                return id(client)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            ids = list(executor.map(borrow, range(4)))
+
+        assert len(set(ids)) == 4
+        assert pool.idle_count("key") == 4
+
+    def test_max_idle(self):
+        """Test že pool drží nejvýše max_idle volných klientů"""
+        pool = ClientPool(lambda key: object(), max_idle=1)
+
+        with pool.client("key"), pool.client("key"):
+            pass
+
+        assert pool.idle_count("key") == 1
+
+    def test_client_discarded_after_error(self):
+        """Test že klient po výjimce se do poolu nevrací"""
+        pool = ClientPool(lambda key: object())
+
+        with pytest.raises(RuntimeError):
+            with pool.client("key"):
+                raise RuntimeError("spojení selhalo")
+
+        assert pool.idle_count("key") == 0
+
+    def test_clear(self):
+        """Test zahození volných klientů"""
+        pool = ClientPool(lambda key: object())
+        with pool.client("key"):
+            pass
+
+        pool.clear()
+
+        assert pool.idle_count("key") == 0
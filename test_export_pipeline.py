@@ -0,0 +1,164 @@
+"""
+Testy pro paralelní export (ExportPipeline)
+"""
+
+import csv
+import json
+
+import pytest
+
+from export_pipeline import ExportPipeline, main
+
+
+def api_response(query, count):
+    """Surová API odpověď s count výsledky"""
+    return {
+        "items": [
+            {"title": f"{query} {i}", "link": f"https://example.com/{query}/{i}", "snippet": "ž"}
+            for i in range(1, count + 1)
+        ]
+    }
+
+
+@pytest.fixture
+def batch_output(tmp_path):
+    """JSONL ve formátu batch.py (results, response i chybné záznamy)"""
+    path = tmp_path / "results.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(23):
+            record = {"query": f"dotaz {i}", "language": "cs", "num": 3}
+            if i % 5 == 4:
+                record["error"] = "Denní kvóta je vyčerpaná"
+            elif i % 2:
+                record["response"] = api_response(f"q{i}", 3)
+            else:
+                record["results"] = [
+                    {"rank": 1, "title": f"t{i}", "link": f"https://a.cz/{i}", "snippet": ""}
+                ]
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return path
+
+
+def expected_rows(path):
+    """Očekávané řádky spočítané jednoduše, bez pipeline"""
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    return [dict(zip(ExportPipeline.FIELDS, row)) for row in ExportPipeline.iter_rows(records)]
+
+
+class TestExportPipeline:
+    """Testy pro ExportPipeline"""
+
+    def test_iter_chunks(self, tmp_path):
+        """Test že bloky pokryjí celý soubor včetně posledního řádku bez konce řádku"""
+        path = tmp_path / "in.jsonl"
+        path.write_bytes(b"a\nbb\nccc\nd")
+
+        chunks = list(ExportPipeline.iter_chunks(path, 2))
+
+        assert chunks == [(0, 5), (5, 5)]
+        data = path.read_bytes()
+        assert b"".join(data[o : o + n] for o, n in chunks) == data
+
+    @pytest.mark.parametrize("workers, chunk_size", [(1, 4), (2, 3), (3, 1), (2, 1000)])
+    def test_run_matches_sequential(self, tmp_path, batch_output, workers, chunk_size):
+        """Test že výstup nezávisí na počtu procesů ani velikosti bloků"""
+        outputs = {"json": tmp_path / "out.json", "csv": tmp_path / "out.csv"}
+
+        stats = ExportPipeline(workers=workers, chunk_size=chunk_size).run(batch_output, outputs)
+
+        expected = expected_rows(batch_output)
+        assert stats["rows"] == len(expected) == 9 * 3 + 10
+        assert json.loads(outputs["json"].read_text(encoding="utf-8")) == expected
+
+        with open(outputs["csv"], encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert list(rows[0]) == list(ExportPipeline.FIELDS)
+        assert [row["link"] for row in rows] == [row["link"] for row in expected]
+
+    def test_deterministic_bytes(self, tmp_path, batch_output):
+        """Test že paralelní běh dá bajtově stejné soubory jako běh v jednom procesu"""
+        single = {"json": tmp_path / "1.json", "csv": tmp_path / "1.csv"}
+        parallel = {"json": tmp_path / "n.json", "csv": tmp_path / "n.csv"}
+
+        ExportPipeline(workers=1, chunk_size=5).run(batch_output, single)
+        ExportPipeline(workers=4, chunk_size=2).run(batch_output, parallel)
+
+        for fmt in ("json", "csv"):
+            assert single[fmt].read_bytes() == parallel[fmt].read_bytes()
+
+    def test_json_format_matches_parser(self, tmp_path):
+        """Test že JSON má stejné formátování jako ResultsParser.to_json_string"""
+        path = tmp_path / "in.jsonl"
+        path.write_text(
+            json.dumps({"query": "q", "language": "cs", "response": api_response("q", 1)}) + "\n"
+        )
+        out = tmp_path / "out.json"
+
+        ExportPipeline(workers=1).run(path, {"json": out})
+
+        assert out.read_text(encoding="utf-8").startswith('[\n  {\n    "query": "q",\n')
+
+    def test_empty_input(self, tmp_path):
+        path = tmp_path / "in.jsonl"
+        path.write_text("")
+        outputs = {"json": tmp_path / "out.json", "csv": tmp_path / "out.csv"}
+
+        stats = ExportPipeline(workers=2).run(path, outputs)
+
+        assert stats["rows"] == 0
+        assert outputs["json"].read_text() == "[]"
+        assert outputs["csv"].read_text().strip() == ",".join(ExportPipeline.FIELDS)
+
+    @pytest.mark.parametrize("workers, chunk_size", [(1, 4), (3, 2)])
+    def test_parquet(self, tmp_path, batch_output, workers, chunk_size):
+        """Test Parquet výstupu - stejné řádky, row groups podle row_group_size"""
+        pq = pytest.importorskip("pyarrow.parquet")
+        from results_parser import ResultsParser
+
+        out = tmp_path / "out.parquet"
+        pipeline = ExportPipeline(workers=workers, chunk_size=chunk_size, row_group_size=10)
+
+        stats = pipeline.run(batch_output, {"parquet": out})
+
+        expected = expected_rows(batch_output)
+        metadata = pq.ParquetFile(out).metadata
+        assert stats["rows"] == metadata.num_rows == 37
+        row_groups = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+        assert row_groups == [10, 10, 10, 7]
+        assert metadata.row_group(0).column(0).compression == "ZSTD"
+
+        df = ResultsParser.read_parquet(str(out))
+        assert list(df["link"]) == [row["link"] for row in expected]
+        assert list(df["query"].astype(str)) == [row["query"] for row in expected]
+        assert df["domain"].iloc[0] == "a.cz"
+
+    def test_parquet_empty(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        from results_parser import ResultsParser
+
+        path = tmp_path / "in.jsonl"
+        path.write_text("")
+        out = tmp_path / "out.parquet"
+
+        ExportPipeline(workers=1).run(path, {"parquet": out})
+
+        df = ResultsParser.read_parquet(out)
+        assert len(df) == 0
+        assert list(df.columns) == list(ResultsParser.ARCHIVE_FIELDS)
+
+    def test_unknown_format(self, tmp_path, batch_output):
+        with pytest.raises(ValueError, match="xml"):
+            ExportPipeline(workers=1).run(batch_output, {"xml": tmp_path / "out.xml"})
+
+    def test_main(self, tmp_path, batch_output, capsys):
+        out = tmp_path / "out.csv"
+
+        assert main([str(batch_output), "--csv", str(out), "-w", "2", "-c", "4"]) == 0
+
+        assert out.exists()
+        assert "37 řádků" in capsys.readouterr().err
+
+    def test_main_without_output(self, batch_output):
+        with pytest.raises(SystemExit):
+            main([str(batch_output)])
@@ -0,0 +1,183 @@
+"""
+Testy pro lokální fake Custom Search API a SearchService proti němu
+"""
+
+import json
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+
+import pytest
+
+from fake_search_server import FakeSearchServer, LatencyModel, main
+from rate_limiter import QuotaExceededError
+from results_parser import ResultsParser
+from search_service import SearchService
+
+
+def get_json(url):
+    """Stáhne JSON i z chybové odpovědi"""
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+class TestLatencyModel:
+    """Testy pro LatencyModel"""
+
+    @pytest.mark.parametrize(
+        "spec", ["fixed:0.05", "uniform:0.01,0.02", "normal:0.1,0.01", "lognormal:-3,0.5"]
+    )
+    def test_parse_and_sample(self, spec):
+        """Test podporovaných rozdělení"""
+        model = LatencyModel.parse(spec)
+        samples = [model.sample() for _ in range(100)]
+
+        assert all(sample >= 0 for sample in samples)
+
+    def test_fixed(self):
+        assert LatencyModel.parse("fixed:0.05").sample() == 0.05
+
+    def test_unknown(self):
+        with pytest.raises(ValueError):
+            LatencyModel.parse("cauchy:1")
+
+
+@pytest.mark.integration
+class TestFakeSearchServer:
+    """Testy HTTP rozhraní fake serveru"""
+
+    @pytest.fixture
+    def server(self):
+        with FakeSearchServer(seed=1) as server:
+            yield server
+
+    def test_list(self, server):
+        """Test cse.list se stránkováním"""
+        status, body = get_json(
+            f"{server.endpoint}customsearch/v1?q=python&cx=cx&key=k&num=5&start=11&lr=lang_cs&gl=CZ"
+        )
+
+        assert status == 200
+        assert len(body["items"]) == 5
+        assert body["queries"]["request"][0]["startIndex"] == 11
+        assert "(cs-cz)" in body["items"][0]["title"]
+
+    def test_deterministic(self, server):
+        """Test že stejný dotaz vrací stejné výsledky"""
+        url = f"{server.endpoint}customsearch/v1?q=python&cx=cx&key=k"
+        assert get_json(url) == get_json(url)
+
+    @pytest.mark.parametrize(
+        "query, status",
+        [
+            ("q=x&cx=cx", 403),  # Bez klíče
+            ("q=x&key=k", 400),  # Bez cx
+            ("q=x&cx=cx&key=k&num=11", 400),
+            ("q=x&cx=cx&key=k&start=95&num=10", 400),
+        ],
+    )
+    def test_invalid_requests(self, server, query, status):
+        """Test validace parametrů jako u skutečného API"""
+        assert get_json(f"{server.endpoint}customsearch/v1?{query}")[0] == status
+
+    def test_not_found(self, server):
+        assert get_json(f"{server.endpoint}jinde")[0] == 404
+
+    def test_stats(self, server):
+        """Test statistik požadavků"""
+        get_json(f"{server.endpoint}customsearch/v1?q=x&cx=cx&key=k")
+        status, stats = get_json(f"{server.endpoint}stats")
+
+        assert status == 200
+        assert stats["quota_used"] == 1
+
+    def test_errors_and_quota(self):
+        """Test simulace chyb a vyčerpání kvóty"""
+        with FakeSearchServer(error_rate=1.0) as server:
+            status, body = get_json(f"{server.endpoint}customsearch/v1?q=x&cx=cx&key=k")
+            assert status in (500, 503)
+
+        with FakeSearchServer(rate_limit_rate=1.0) as server:
+            status, body = get_json(f"{server.endpoint}customsearch/v1?q=x&cx=cx&key=k")
+            assert status == 429
+            assert body["error"]["errors"][0]["reason"] == "rateLimitExceeded"
+
+        with FakeSearchServer(daily_quota=1) as server:
+            url = f"{server.endpoint}customsearch/v1?q=x&cx=cx&key=k"
+            assert get_json(url)[0] == 200
+            status, body = get_json(url)
+            assert status == 403
+            assert body["error"]["errors"][0]["reason"] == "dailyLimitExceeded"
+
+
+@pytest.mark.integration
+class TestSearchServiceAgainstFakeServer:
+    """Testy SearchService přes skutečné HTTP proti fake serveru"""
+
+    @pytest.fixture(autouse=True)
+    def clean_service(self, monkeypatch):
+        monkeypatch.delenv("SEARCH_CACHE_PATH", raising=False)
+        SearchService.reset()
+        yield
+        SearchService.reset()
+
+    def test_fetch_pages(self, monkeypatch):
+        """Test stránkovaného vyhledávání přes HTTP"""
+        with FakeSearchServer() as server:
+            monkeypatch.setenv("SEARCH_API_ENDPOINT", server.endpoint)
+
+            response = SearchService.fetch("key", "cx", "python", 25, language="de")
+            results = ResultsParser.parse_google_api_response(response)
+
+        assert len(results) == 25
+        assert results[24]["rank"] == 25
+        assert "(de-de)" in results[0]["title"]
+
+    def test_connection_reuse(self, monkeypatch):
+        """Test že opakované dotazy znovu používají keep-alive spojení"""
+        with FakeSearchServer() as server:
+            monkeypatch.setenv("SEARCH_API_ENDPOINT", server.endpoint)
+
+            for query in ("a", "b", "c", "d"):
+                SearchService.fetch("key", "cx", query, 10)
+
+            assert server.stats["requests"] == 4
+            assert server.stats["connections"] == 1
+
+    def test_retry_then_fail(self, monkeypatch):
+        """Test že trvalé 5xx se zopakuje a pak propaguje"""
+        from googleapiclient.errors import HttpError
+
+        monkeypatch.setenv("SEARCH_MAX_RETRIES", "2")
+        with FakeSearchServer(error_rate=1.0) as server:
+            monkeypatch.setenv("SEARCH_API_ENDPOINT", server.endpoint)
+
+            with patch("rate_limiter.time.sleep"), pytest.raises(HttpError):
+                SearchService.fetch("key", "cx", "python", 10)
+
+            assert server.stats["requests"] == 3
+
+    def test_quota_exhausted(self, monkeypatch):
+        """Test že vyčerpaná kvóta na straně API skončí QuotaExceededError"""
+        with FakeSearchServer(daily_quota=1) as server:
+            monkeypatch.setenv("SEARCH_API_ENDPOINT", server.endpoint)
+
+            SearchService.fetch("key", "cx", "python", 10)
+            with pytest.raises(QuotaExceededError):
+                SearchService.fetch("key", "cx", "java", 10)
+
+
+class TestFakeServerCli:
+    """Test spuštění z příkazové řádky"""
+
+    def test_main(self, capsys):
+        """Test že CLI server spustí a po Ctrl+C ukončí"""
+        with patch(
+            "fake_search_server.ThreadingHTTPServer.serve_forever", side_effect=KeyboardInterrupt
+        ):
+            assert main(["--port", "0", "--latency", "uniform:0,0.01"]) == 0
+
+        assert "Fake Custom Search API" in capsys.readouterr().out
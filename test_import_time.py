@@ -0,0 +1,80 @@
+"""
+Testy rozpočtu doby importu (cold start aplikace)
+"""
+
+import os
+
+import pytest
+
+from benchmarks.import_time import check_budget, load_budget, main, parse_importtime
+
+
+class TestParseImporttime:
+    """Testy pro zpracování výstupu -X importtime"""
+
+    def test_parse(self):
+        """Test parsování řádků importtime"""
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   _io\n"
+            "import time:      2499 |       6838 | results_parser\n"
+            "nějaký jiný výstup\n"
+        )
+
+        timings = parse_importtime(stderr)
+
+        assert timings == {"_io": (120, 120), "results_parser": (2499, 6838)}
+
+
+class TestImportBudget:
+    """Kontrola rozpočtu doby importu podle benchmarks/import_budget.json
+
+    Zakázané importy se kontrolují vždy. Limity max_ms platí jen pro stroj,
+    na kterém se měřily, proto se kontrolují až se SEARCH_CHECK_IMPORT_TIME=1.
+    """
+
+    def test_budget_file(self):
+        """Test že rozpočet pokrývá vstupní bod aplikace"""
+        budget = load_budget()
+
+        assert "main" in budget
+        assert all("max_ms" in limits for limits in budget.values())
+
+    def test_no_forbidden_imports(self):
+        """Test že import modulů nenačte těžké závislosti"""
+        _, violations = check_budget(load_budget(), repeat=1, timing=False)
+
+        assert violations == []
+
+    @pytest.mark.slow
+    @pytest.mark.skipif(
+        os.getenv("SEARCH_CHECK_IMPORT_TIME") != "1",
+        reason="Měření doby importu se zapíná přes SEARCH_CHECK_IMPORT_TIME=1",
+    )
+    def test_import_budget(self):
+        """Test že import modulů nepřekročí rozpočet max_ms"""
+        _, violations = check_budget(load_budget(), repeat=2)
+
+        assert violations == []
+
+    def test_violations_reported(self):
+        """Test že překročení rozpočtu i zakázaný import se nahlásí"""
+        budget = {"results_parser": {"max_ms": 0, "forbidden": ["csv"]}}
+
+        _, violations = check_budget(budget, repeat=1)
+
+        assert len(violations) == 2
+        assert "csv" in violations[1]
+
+    def test_timing_skipped(self):
+        """Test že bez timing se hlásí jen zakázané importy"""
+        budget = {"results_parser": {"max_ms": 0, "forbidden": ["csv"]}}
+
+        _, violations = check_budget(budget, repeat=1, timing=False)
+
+        assert violations == ["results_parser: při startu se importuje csv"]
+
+    def test_cli(self, capsys):
+        """Test výpisu z příkazové řádky"""
+        assert main(["--repeat", "1", "--top", "1"]) == 0
+        assert "main:" in capsys.readouterr().out
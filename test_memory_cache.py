@@ -0,0 +1,133 @@
+"""
+Testy pro komprimovanou paměťovou cache (MemoryCache)
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+import memory_cache
+from memory_cache import MemoryCache
+
+
+def response(query, count=10):
+    """Odpověď API s count výsledky (dobře komprimovatelná jako skutečné odpovědi)"""
+    return {
+        "items": [
+            {
+                "title": f"{query} výsledek {i}",
+                "link": f"https://example.com/{query}/{i}",
+                "snippet": "Popis stránky s opakujícím se textem. " * 5,
+            }
+            for i in range(count)
+        ]
+    }
+
+
+class TestMemoryCache:
+    """Testy pro MemoryCache"""
+
+    def test_get_set(self):
+        cache = MemoryCache()
+
+        assert cache.get("a") is None
+        assert cache.set("a", response("a"))
+        assert cache.get("a") == response("a")
+        assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+    def test_returns_copy(self):
+        """Test že úprava vrácené hodnoty nezmění uložený záznam"""
+        cache = MemoryCache()
+        cache.set("a", response("a"))
+
+        cache.get("a")["items"].clear()
+
+        assert len(cache.get("a")["items"]) == 10
+
+    @pytest.mark.parametrize("codec", ["zlib", "auto"])
+    def test_compressed(self, codec):
+        """Test že se v paměti počítá komprimovaná velikost"""
+        cache = MemoryCache(codec=codec)
+        cache.set("a", response("a"))
+
+        stats = cache.stats()
+
+        assert stats["bytes"] < stats["raw_bytes"]
+        assert stats["ratio"] > 2
+
+    def test_evicts_least_recently_used(self):
+        """Test že při překročení rozpočtu se maže nejdéle nepoužitý záznam"""
+        cache = MemoryCache(codec="zlib")
+        cache.set("a", response("a"))
+        entry_size = cache.stats()["bytes"]
+        cache = MemoryCache(max_bytes=int(entry_size * 2.5), max_entry_bytes=entry_size * 2)
+
+        cache.set("a", response("a"))
+        cache.set("b", response("b"))
+        cache.get("a")
+        cache.set("c", response("c"))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["bytes"] <= stats["max_bytes"]
+
+    def test_oversized_entry_rejected(self):
+        """Test že příliš velký záznam se neuloží a nevytlačí ostatní"""
+        cache = MemoryCache(max_bytes=8000, max_entry_bytes=400)
+        cache.set("small", {"items": []})
+
+        assert not cache.set("big", response("big", 100))
+
+        assert cache.get("big") is None
+        assert cache.get("small") == {"items": []}
+        assert cache.stats()["rejected"] == 1
+
+    def test_overwrite_updates_size(self):
+        cache = MemoryCache()
+        cache.set("a", response("a", 50))
+        cache.set("a", {"items": []})
+
+        assert len(cache) == 1
+        assert cache.stats()["raw_bytes"] == len('{"items":[]}')
+
+    def test_ttl(self):
+        cache = MemoryCache(ttl=10)
+        with patch("memory_cache.time.time", return_value=0):
+            cache.set("a", response("a"))
+        with patch("memory_cache.time.time", return_value=11):
+            assert cache.get("a") is None
+
+        assert len(cache) == 0
+        assert cache.stats()["bytes"] == 0
+
+    def test_clear(self):
+        cache = MemoryCache()
+        cache.set("a", response("a"))
+
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.stats()["bytes"] == 0
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("SEARCH_MEMORY_CACHE_MB", "2")
+        monkeypatch.setenv("SEARCH_MEMORY_CACHE_TTL", "60")
+        monkeypatch.setenv("SEARCH_MEMORY_CACHE_CODEC", "zlib")
+
+        cache = MemoryCache.from_env()
+
+        assert (cache.max_bytes, cache.ttl, cache.codec) == (2 * 1024 * 1024, 60, "zlib")
+
+    def test_auto_falls_back_to_zlib(self, monkeypatch):
+        monkeypatch.setattr(memory_cache, "_zstd", None)
+
+        assert MemoryCache().codec == "zlib"
+        with pytest.raises(ImportError, match="zstandard"):
+            MemoryCache(codec="zstd")
+
+    def test_unknown_codec(self):
+        with pytest.raises(ValueError, match="lz4"):
+            MemoryCache(codec="lz4")
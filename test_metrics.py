@@ -0,0 +1,156 @@
+"""
+Unit testy pro metriky
+"""
+
+import urllib.request
+
+import pytest
+
+from metrics import Counter, Histogram, MetricsRegistry, SearchMetrics, start_http_server
+
+
+class TestCounter:
+    """Testy pro Counter třídu"""
+
+    def test_inc_per_labels(self):
+        """Test že hodnoty se počítají zvlášť pro každou kombinaci labelů"""
+        counter = Counter("requests_total", "Požadavky", ["language"])
+        counter.inc(language="cs")
+        counter.inc(2, language="cs")
+        counter.inc(language="en")
+
+        assert counter.value(language="cs") == 3
+        assert counter.value(language="en") == 1
+        assert counter.value(language="de") == 0
+
+    def test_samples_escape_labels(self):
+        """Test escapování hodnot labelů v Prometheus výstupu"""
+        counter = Counter("errors_total", "Chyby", ["reason"])
+        counter.inc(reason='bad "quote"\n')
+
+        assert counter.samples() == ['errors_total{reason="bad \\"quote\\"\\n"} 1']
+
+
+class TestHistogram:
+    """Testy pro Histogram třídu"""
+
+    def test_buckets_are_cumulative(self):
+        """Test kumulativních bucketů, součtu a počtu"""
+        histogram = Histogram("latency_seconds", "Latence", ["language"], buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 2.0):
+            histogram.observe(value, language="cs")
+
+        assert histogram.samples() == [
+            'latency_seconds_bucket{language="cs",le="0.1"} 1',
+            'latency_seconds_bucket{language="cs",le="1.0"} 2',
+            'latency_seconds_bucket{language="cs",le="+Inf"} 3',
+            'latency_seconds_sum{language="cs"} 2.55',
+            'latency_seconds_count{language="cs"} 3',
+        ]
+
+    def test_quantile(self):
+        """Test odhadu kvantilu z bucketů"""
+        histogram = Histogram("latency_seconds", "Latence", buckets=(0.1, 1.0))
+        assert histogram.quantile(0.5) is None
+
+        for value in (0.05, 0.05, 0.05, 0.5):
+            histogram.observe(value)
+
+        assert histogram.quantile(0.5) == 0.1
+        assert histogram.quantile(0.95) == 1.0
+
+    def test_time_records_on_exception(self):
+        """Test že time() zaznamená dobu i při výjimce"""
+        histogram = Histogram("latency_seconds", "Latence")
+
+        with pytest.raises(ValueError):
+            with histogram.time():
+                raise ValueError("chyba")
+
+        assert histogram.series()[()]["count"] == 1
+
+
+class TestMetricsRegistry:
+    """Testy pro MetricsRegistry třídu"""
+
+    def test_render_format(self):
+        """Test Prometheus text formátu"""
+        registry = MetricsRegistry()
+        registry.counter("searches_total", "Vyhledávání").inc()
+        registry.gauge("quota_remaining", "Kvóta", lambda: 7)
+
+        assert registry.render() == (
+            "# HELP searches_total Vyhledávání\n"
+            "# TYPE searches_total counter\n"
+            "searches_total 1\n"
+            "# HELP quota_remaining Kvóta\n"
+            "# TYPE quota_remaining gauge\n"
+            "quota_remaining 7\n"
+        )
+
+
+class TestSearchMetrics:
+    """Testy pro SearchMetrics třídu"""
+
+    def test_memory_hits_counted(self):
+        """Test že hity paměťové cache se počítají přímo, ne ze spuštěných vyhledávání"""
+        metrics = SearchMetrics()
+        for _ in range(6):
+            metrics.searches.inc(language="cs")
+        metrics.cache_requests.inc(3, layer="memory", result="hit")
+        metrics.cache_requests.inc(layer="memory", result="miss")
+
+        assert metrics.cache_counts("memory") == (3, 1)
+        assert metrics.hit_rate("memory") == 0.75
+        assert metrics.hit_rate("disk") is None
+
+    def test_summary(self):
+        """Test souhrnu pro admin panel"""
+        metrics = SearchMetrics(quota_remaining=lambda: 99)
+        metrics.api_requests.inc(language="cs")
+        metrics.api_latency.observe(0.2, language="cs")
+        metrics.api_errors.inc(reason="rateLimitExceeded")
+
+        summary = metrics.summary()
+
+        assert summary["api_requests"] == 1
+        assert summary["errors"] == {"rateLimitExceeded": 1}
+        assert summary["latency"]["cs"]["count"] == 1
+        assert summary["latency"]["cs"]["avg"] == pytest.approx(0.2)
+        assert summary["quota_remaining"] == 99
+        assert summary["memory_cache"] is None
+
+    def test_memory_cache_gauges(self):
+        """Test že využití paměťové cache je v souhrnu i v Prometheus výstupu"""
+        stats = {"entries": 2, "bytes": 1500, "max_bytes": 4096, "evictions": 1}
+        metrics = SearchMetrics(memory_stats=lambda: stats)
+
+        output = metrics.render()
+
+        assert "search_memory_cache_bytes 1500" in output
+        assert "search_memory_cache_max_bytes 4096" in output
+        assert "search_memory_cache_entries 2" in output
+        assert "# TYPE search_memory_cache_evictions_total counter" in output
+        assert "search_memory_cache_evictions_total 1" in output
+        assert metrics.summary()["memory_cache"] == stats
+
+
+class TestExporter:
+    """Testy pro HTTP exporter metrik"""
+
+    def test_serves_metrics(self):
+        """Test že exporter vrací aktuální výstup render()"""
+        metrics = SearchMetrics()
+        metrics.searches.inc(language="cs")
+        server = start_http_server(0, metrics.render, addr="127.0.0.1")
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as resp:
+                body = resp.read().decode("utf-8")
+                content_type = resp.headers["Content-Type"]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert 'search_requests_total{language="cs"} 1' in body
+        assert content_type.startswith("text/plain; version=0.0.4")
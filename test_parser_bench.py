@@ -0,0 +1,78 @@
+"""
+Testy benchmark suity ResultsParser
+"""
+
+import json
+
+from benchmarks.parser_bench import (
+    BENCHMARKS,
+    compare,
+    format_results,
+    load_baseline,
+    main,
+    make_response,
+    run_benchmarks,
+    save_baseline,
+)
+from results_parser import ResultsParser
+
+
+class TestParserBench:
+    """Testy pro benchmarks/parser_bench.py"""
+
+    def test_make_response(self):
+        """Test že syntetická odpověď má tvar Google API"""
+        response = make_response(25)
+
+        assert len(response["items"]) == 25
+        parsed = ResultsParser.parse_google_api_response(response)
+        assert parsed[24]["rank"] == 25
+
+    def test_run_benchmarks(self):
+        """Test že se změří všechny operace pro všechny velikosti"""
+        results = run_benchmarks([10, 50], repeat=1)
+
+        assert set(results) == {f"{name}@{size}" for name in BENCHMARKS for size in (10, 50)}
+        for result in results.values():
+            assert result["seconds"] > 0
+            assert result["items_per_s"] > 0
+            assert result["peak_mb"] >= 0
+
+    def test_baseline_roundtrip(self, tmp_path):
+        """Test uložení a načtení baseline"""
+        path = str(tmp_path / "baseline.json")
+        results = run_benchmarks([10], repeat=1, names=["parse"])
+
+        save_baseline(results, path)
+
+        assert load_baseline(path) == json.loads(json.dumps(results))
+
+    def test_compare_detects_regression(self):
+        """Test odhalení poklesu propustnosti i růstu paměti"""
+        baseline = {"parse@10": {"seconds": 1.0, "items_per_s": 1000.0, "peak_mb": 10.0}}
+        slower = {"parse@10": {"seconds": 2.0, "items_per_s": 500.0, "peak_mb": 20.0}}
+        same = {"parse@10": {"seconds": 1.1, "items_per_s": 900.0, "peak_mb": 11.0}}
+
+        assert len(compare(slower, baseline, threshold=0.25)) == 2
+        assert compare(same, baseline, threshold=0.25) == []
+        assert compare({"jiny@10": slower["parse@10"]}, baseline) == []
+
+    def test_format_results(self):
+        """Test výpisu tabulky"""
+        text = format_results({"parse@10": {"seconds": 0.001, "items_per_s": 10000, "peak_mb": 0}})
+        assert "parse@10" in text
+
+    def test_cli_save_and_compare(self, tmp_path, capsys):
+        """Test CLI - uložení baseline a porovnání s ní"""
+        path = str(tmp_path / "baseline.json")
+
+        assert main(["--sizes", "10", "--repeat", "1", "--baseline", path, "--save-baseline"]) == 0
+
+        # Baseline s nereálně vysokou propustností -> regrese
+        baseline = load_baseline(path)
+        for result in baseline.values():
+            result["items_per_s"] *= 1000
+        save_baseline(baseline, path)
+
+        assert main(["--sizes", "10", "--repeat", "1", "--baseline", path, "--compare"]) == 1
+        assert "❌" in capsys.readouterr().out
@@ -0,0 +1,121 @@
+"""
+Unit testy pro historii pořadí
+"""
+
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from rank_history import RankHistory
+from search_results import ResultSet
+
+
+def snapshot(*links):
+    """ResultSet s odkazy v daném pořadí"""
+    return ResultSet.from_records([{"title": link.upper(), "link": link} for link in links])
+
+
+class TestRankHistory:
+    """Testy pro RankHistory třídu"""
+
+    @pytest.fixture
+    def history(self, tmp_path):
+        """Fixture pro úložiště v dočasném adresáři"""
+        return RankHistory(str(tmp_path / "history.sqlite3"))
+
+    def test_first_snapshot_all_new(self, history):
+        """Test prvního snímku - všechny URL jsou nové"""
+        assert history.record("python", "cs", snapshot("a", "b"), day="2026-01-01") == 2
+
+        movements = history.movements("python", "cs")
+        assert [(m["url"], m["rank"], m["status"]) for m in movements] == [
+            ("a", 1, "new"),
+            ("b", 2, "new"),
+        ]
+
+    def test_movements_against_previous_snapshot(self, history):
+        """Test změn pořadí oproti předchozímu snímku včetně vypadlých URL"""
+        history.record("python", "cs", snapshot("a", "b", "c"), day="2026-01-01")
+        history.record("python", "cs", snapshot("b", "a", "d"), day="2026-01-02")
+
+        movements = history.movements("Python ", "cs")
+
+        rows = [(m["url"], m["rank"], m["prev_rank"], m["change"], m["status"]) for m in movements]
+        assert rows == [
+            ("b", 1, 2, 1, "up"),
+            ("a", 2, 1, -1, "down"),
+            ("d", 3, None, None, "new"),
+            ("c", None, 3, None, "dropped"),
+        ]
+
+    def test_same_day_replaces_snapshot(self, history):
+        """Test že opakovaný zápis stejného dne snímek nahradí"""
+        history.record("python", "cs", snapshot("a", "b"), day="2026-01-01")
+        history.record("python", "cs", snapshot("b"), day="2026-01-01")
+
+        assert history.days("python", "cs") == ["2026-01-01"]
+        assert [m["url"] for m in history.movements("python", "cs")] == ["b"]
+
+    def test_backfill_relinks_next_snapshot(self, history):
+        """Test že dodatečně vložený starší den přepočítá změny následujícího"""
+        history.record("python", "cs", snapshot("a", "b"), day="2026-01-01")
+        history.record("python", "cs", snapshot("a", "b"), day="2026-01-03")
+        history.record("python", "cs", snapshot("b", "a"), day="2026-01-02")
+
+        movements = history.movements("python", "cs", day="2026-01-03")
+        assert [(m["url"], m["change"]) for m in movements] == [("a", 1), ("b", -1)]
+
+    def test_url_history(self, history):
+        """Test historie jedné URL za období"""
+        history.record("python", "cs", snapshot("a", "b"), day="2025-09-01")
+        history.record("python", "cs", snapshot("b", "a"), day="2026-01-01")
+        history.record("python", "cs", snapshot("a"), day="2026-01-02")
+        history.record("python", "en", snapshot("a"), day="2026-01-02")
+
+        assert history.url_history("b", "python", "cs", until=date(2026, 1, 2)) == [
+            ("2026-01-01", 1)
+        ]
+        assert history.history("python", "cs", days=90, until=date(2026, 1, 2)) == {
+            "b": [("2026-01-01", 1)],
+            "a": [("2026-01-01", 2), ("2026-01-02", 1)],
+        }
+
+    def test_unknown_query(self, history):
+        """Test dotazu bez snímků"""
+        assert history.movements("nic", "cs") == []
+        assert history.days("nic", "cs") == []
+
+    def test_url_history_uses_index(self, history):
+        """Test že historie URL se čte přes index (ne průchodem tabulky)"""
+        plan = history._connect().execute(
+            "EXPLAIN QUERY PLAN SELECT day, rank FROM ranks WHERE url = ? AND query = ? "
+            "AND language = ? AND day > ? AND day <= ?",
+            ("a", "python", "cs", "2026-01-01", "2026-03-01"),
+        ).fetchall()
+
+        detail = " ".join(row[-1] for row in plan)
+        assert detail.startswith("SEARCH")
+        assert "SCAN" not in detail
+
+    def test_many_snapshots_fast(self, history):
+        """Test že dotaz na 90 dní historie nad tisíci řádků je rychlý"""
+        links = [f"https://example.cz/{i}" for i in range(100)]
+        for offset in range(90):
+            day = date(2026, 1, 1) + timedelta(days=offset)
+            history.record("python", "cs", snapshot(*links[offset % 10 :]), day=day)
+
+        started = time.perf_counter()
+        points = history.url_history(links[50], "python", "cs", until=date(2026, 3, 31))
+        elapsed = time.perf_counter() - started
+
+        assert points
+        assert elapsed < 0.05
+
+    def test_from_env(self, monkeypatch, tmp_path):
+        """Test konfigurace z environment proměnných"""
+        monkeypatch.delenv("SEARCH_HISTORY_PATH", raising=False)
+        assert RankHistory.from_env() is None
+
+        monkeypatch.setenv("SEARCH_HISTORY_PATH", str(tmp_path / "history.sqlite3"))
+        assert isinstance(RankHistory.from_env(), RankHistory)
@@ -0,0 +1,193 @@
+"""
+Unit testy pro rate limiter a denní kvótu
+"""
+
+import json
+from unittest.mock import Mock, patch
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from rate_limiter import DailyQuota, QuotaExceededError, RateLimiter, TokenBucket
+
+
+def http_error(status, reason=None, headers=None):
+    """Vytvoří HttpError jako z Google API"""
+    resp = httplib2.Response({"status": status, **(headers or {})})
+    body = {"error": {"code": status, "errors": [{"reason": reason}] if reason else []}}
+    return HttpError(resp, json.dumps(body).encode("utf-8"))
+
+
+class TestTokenBucket:
+    """Testy pro TokenBucket třídu"""
+
+    def test_burst_without_waiting(self):
+        """Test že do kapacity se nečeká"""
+        bucket = TokenBucket(rate=5)
+        waited = [bucket.acquire() for _ in range(5)]
+        assert waited == [0.0] * 5
+
+    def test_waits_when_empty(self):
+        """Test že po vyčerpání se čeká podle rychlosti doplňování"""
+        bucket = TokenBucket(rate=10, capacity=1)
+        bucket.acquire()
+
+        with patch("rate_limiter.time.sleep") as mock_sleep:
+            # Po "spánku" musí být token doplněný - posuneme monotonic čas
+            with patch("rate_limiter.time.monotonic", side_effect=[bucket._updated, 1e9]):
+                waited = bucket.acquire()
+
+        assert mock_sleep.call_count == 1
+        assert waited == pytest.approx(0.1)
+
+
+class TestDailyQuota:
+    """Testy pro DailyQuota třídu"""
+
+    def test_in_memory(self):
+        """Test počítání kvóty v paměti"""
+        quota = DailyQuota(limit=2)
+        quota.consume()
+
+        assert quota.used() == 1
+        assert quota.remaining() == 1
+
+    def test_exceeded(self):
+        """Test že nad limit se vyhodí QuotaExceededError"""
+        quota = DailyQuota(limit=1)
+        quota.consume()
+
+        with pytest.raises(QuotaExceededError):
+            quota.consume()
+        assert quota.used() == 1
+
+    def test_persists_across_restart(self, tmp_path):
+        """Test že počítadlo v souboru přežije restart"""
+        path = str(tmp_path / "quota.sqlite3")
+        DailyQuota(limit=100, path=path).consume(3)
+
+        quota = DailyQuota(limit=100, path=path)
+        assert quota.used() == 3
+        assert quota.remaining() == 97
+
+    def test_persistent_exceeded(self, tmp_path):
+        """Test překročení kvóty uložené v souboru"""
+        quota = DailyQuota(limit=1, path=str(tmp_path / "quota.sqlite3"))
+        quota.consume()
+
+        with pytest.raises(QuotaExceededError):
+            quota.consume()
+
+    def test_new_day_resets(self):
+        """Test že nový den kvóty začíná od nuly"""
+        quota = DailyQuota(limit=1)
+        with patch.object(DailyQuota, "quota_day", return_value="2026-01-01"):
+            quota.consume()
+        with patch.object(DailyQuota, "quota_day", return_value="2026-01-02"):
+            assert quota.remaining() == 1
+
+
+class TestRateLimiter:
+    """Testy pro RateLimiter třídu"""
+
+    @pytest.fixture
+    def limiter(self):
+        """Fixture pro limiter bez čekání na tokeny"""
+        return RateLimiter(TokenBucket(rate=1000), DailyQuota(limit=100), max_retries=3)
+
+    def test_success(self, limiter):
+        """Test úspěšného volání"""
+        assert limiter.call(lambda: {"items": []}) == {"items": []}
+        assert limiter.quota_remaining() == 99
+
+    @pytest.mark.parametrize("status", [429, 500, 503])
+    def test_retries_transient_errors(self, limiter, status):
+        """Test opakování po dočasné chybě"""
+        func = Mock(side_effect=[http_error(status), {"items": []}])
+
+        with patch("rate_limiter.time.sleep") as mock_sleep:
+            assert limiter.call(func) == {"items": []}
+
+        assert func.call_count == 2
+        assert mock_sleep.call_count == 1
+
+    def test_retries_403_rate_limit(self, limiter):
+        """Test že 403 rateLimitExceeded se opakuje"""
+        func = Mock(side_effect=[http_error(403, "rateLimitExceeded"), {"ok": True}])
+
+        with patch("rate_limiter.time.sleep"):
+            assert limiter.call(func) == {"ok": True}
+
+    def test_daily_limit_from_api(self, limiter):
+        """Test že 403 dailyLimitExceeded se neopakuje"""
+        func = Mock(side_effect=http_error(403, "dailyLimitExceeded"))
+
+        with pytest.raises(QuotaExceededError):
+            limiter.call(func)
+        assert func.call_count == 1
+
+    def test_non_retryable_error(self, limiter):
+        """Test že např. 400 se neopakuje"""
+        func = Mock(side_effect=http_error(400, "invalid"))
+
+        with pytest.raises(HttpError):
+            limiter.call(func)
+        assert func.call_count == 1
+
+    def test_gives_up_after_max_retries(self, limiter):
+        """Test že po max_retries se chyba propaguje"""
+        func = Mock(side_effect=http_error(503))
+
+        with patch("rate_limiter.time.sleep"), pytest.raises(HttpError):
+            limiter.call(func)
+        assert func.call_count == 4
+
+    def test_local_quota_blocks_call(self):
+        """Test že po vyčerpání lokální kvóty se API vůbec nevolá"""
+        limiter = RateLimiter(TokenBucket(rate=1000), DailyQuota(limit=0))
+        func = Mock()
+
+        with pytest.raises(QuotaExceededError):
+            limiter.call(func)
+        func.assert_not_called()
+
+    def test_backoff_exponential_with_jitter(self, limiter):
+        """Test že backoff roste exponenciálně a je omezený max_delay"""
+        with patch("rate_limiter.random.uniform", side_effect=lambda a, b: b):
+            delays = [limiter.backoff(attempt) for attempt in range(10)]
+
+        assert delays[:3] == [0.5, 1.0, 2.0]
+        assert max(delays) == limiter.max_delay
+
+    def test_backoff_respects_retry_after(self, limiter):
+        """Test že hlavička Retry-After má přednost"""
+        assert limiter.backoff(0, http_error(429, headers={"retry-after": "7"})) == 7.0
+
+    def test_retries_connection_errors(self, limiter):
+        """Test opakování po výpadku spojení"""
+        func = Mock(side_effect=[TimeoutError(), "ok"])
+
+        with patch("rate_limiter.time.sleep"):
+            assert limiter.call(func) == "ok"
+
+    def test_error_reason(self):
+        """Test popisku chyby pro metriky"""
+        error = http_error(403, "dailyLimitExceeded")
+        assert RateLimiter.error_reason(error) == "dailyLimitExceeded"
+        assert RateLimiter.error_reason(http_error(500)) == "http_500"
+        assert RateLimiter.error_reason(TimeoutError()) == "TimeoutError"
+
+    def test_from_env(self, tmp_path, monkeypatch):
+        """Test konfigurace z environment proměnných"""
+        monkeypatch.setenv("SEARCH_RATE_LIMIT_QPS", "2")
+        monkeypatch.setenv("SEARCH_DAILY_QUOTA", "50")
+        monkeypatch.setenv("SEARCH_QUOTA_PATH", str(tmp_path / "quota.sqlite3"))
+        monkeypatch.setenv("SEARCH_MAX_RETRIES", "5")
+
+        limiter = RateLimiter.from_env()
+
+        assert limiter.bucket.rate == 2.0
+        assert limiter.quota.limit == 50
+        assert limiter.quota.path.endswith("quota.sqlite3")
+        assert limiter.max_retries == 5
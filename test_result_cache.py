@@ -0,0 +1,183 @@
+"""
+Unit testy pro ResultCache
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from result_cache import ResultCache
+
+
+def _write_entries(path, worker, count):
+    """Zápis záznamů z jiného procesu (musí být na úrovni modulu kvůli pickle)"""
+    cache = ResultCache(path)
+    for i in range(count):
+        cache.set(ResultCache.make_key("cx", f"q{worker}-{i}", 10, "cs"), {"items": [i]})
+    return count
+
+
+class TestResultCache:
+    """Testy pro ResultCache třídu"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Fixture pro cache v dočasném adresáři"""
+        return ResultCache(str(tmp_path / "cache.sqlite3"), ttl=60, max_entries=100)
+
+    def test_set_and_get(self, cache):
+        """Test uložení a načtení záznamu"""
+        key = ResultCache.make_key("cx", "python", 10, "cs")
+        cache.set(key, {"items": [{"title": "Český výsledek"}]})
+
+        assert cache.get(key) == {"items": [{"title": "Český výsledek"}]}
+        assert len(cache) == 1
+
+    def test_get_missing(self, cache):
+        """Test neexistujícího záznamu"""
+        assert cache.get("neexistuje") is None
+
+    def test_make_key_ignores_api_key_and_differs_by_params(self):
+        """Test že klíč rozlišuje parametry dotazu"""
+        base = ResultCache.make_key("cx", "python", 10, "cs")
+
+        assert base == ResultCache.make_key("cx", "python", 10, "cs")
+        assert base != ResultCache.make_key("cx", "python", 5, "cs")
+        assert base != ResultCache.make_key("cx", "python", 10, "en")
+        assert base != ResultCache.make_key("other", "python", 10, "cs")
+
+    def test_make_key_fields(self):
+        """Test že zúžená odpověď má vlastní klíč a plná odpověď klíč beze změny"""
+        base = ResultCache.make_key("cx", "python", 10, "cs")
+
+        assert base == ResultCache.make_key("cx", "python", 10, "cs", None)
+        assert base != ResultCache.make_key("cx", "python", 10, "cs", ("title", "link"))
+        assert ResultCache.make_key("cx", "python", 10, "cs", ("title",)) != ResultCache.make_key(
+            "cx", "python", 10, "cs", ("link",)
+        )
+
+    @pytest.mark.parametrize(
+        "query, expected",
+        [
+            ("  Python   programming ", "python programming"),
+            ("PYTHON\tknihy\n", "python knihy"),
+            ("cafe\u0301", "caf\u00e9"),  # NFD -> NFC
+            ("Straße", "straße"),  # casefold by změnil ß na ss
+            ("İstanbul", "İstanbul"),  # lower() by změnil délku
+            ("Python OR Java", "python OR java"),  # operátory zůstávají
+            ("Kava AROUND(3) Mleko", "kava AROUND(3) mleko"),
+        ],
+    )
+    def test_normalize_query(self, query, expected):
+        """Test kanonického tvaru dotazu"""
+        assert ResultCache.normalize_query(query) == expected
+
+    def test_clean_query_keeps_case(self):
+        """Test že dotaz pro API má sjednocené mezery a NFC, ale původní velikost písmen"""
+        assert ResultCache.clean_query("  python\tOR  Java ") == "python OR Java"
+        assert ResultCache.clean_query("Cafe\u0301") == "Caf\u00e9"
+
+    def test_make_key_keeps_operators(self):
+        """Test že operátor OR a obyčejné slovo "or" mají různé klíče"""
+        assert ResultCache.make_key("cx", "python OR java", 10, "cs") != ResultCache.make_key(
+            "cx", "python or java", 10, "cs"
+        )
+
+    def test_make_key_normalizes_query(self):
+        """Test že varianty zápisu dotazu mají stejný klíč"""
+        base = ResultCache.make_key("cx", "python programming", 10, "cs")
+
+        assert base == ResultCache.make_key("cx", " Python  Programming", 10, "cs")
+
+    def test_expired_entry(self, tmp_path):
+        """Test že vypršený záznam se nevrací"""
+        cache = ResultCache(str(tmp_path / "cache.sqlite3"), ttl=10)
+        cache.set("key", {"items": []})
+
+        with patch("result_cache.time.time", return_value=time.time() + 11):
+            assert cache.get("key") is None
+
+    def test_stale_entry_within_retention(self, tmp_path):
+        """Test že prošlý záznam vrací jen get_entry a jen v rámci stale okna"""
+        cache = ResultCache(str(tmp_path / "cache.sqlite3"), ttl=10, stale_ttl=20)
+        cache.set("key", {"items": []})
+
+        with patch("result_cache.time.time", return_value=time.time() + 15):
+            assert cache.get("key") is None
+            value, age = cache.get_entry("key")
+            assert value == {"items": []}
+            assert age > 10
+
+        with patch("result_cache.time.time", return_value=time.time() + 31):
+            assert cache.get_entry("key") == (None, None)
+
+    def test_lru_eviction(self, tmp_path):
+        """Test že nad limit se maže nejdéle nepoužitý záznam"""
+        cache = ResultCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+        cache.set("a", {"v": "a"})
+        cache.set("b", {"v": "b"})
+        cache.get("a")  # "a" je teď používanější než "b"
+        cache.set("c", {"v": "c"})
+
+        assert len(cache) == 2
+        assert cache.get("a") == {"v": "a"}
+        assert cache.get("b") is None
+        assert cache.get("c") == {"v": "c"}
+
+    def test_survives_reopen(self, tmp_path):
+        """Test že data přežijí nové otevření (restart procesu)"""
+        path = str(tmp_path / "cache.sqlite3")
+        ResultCache(path).set("key", {"items": [1]})
+
+        assert ResultCache(path).get("key") == {"items": [1]}
+
+    def test_clear(self, cache):
+        """Test smazání cache"""
+        cache.set("key", {"items": []})
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_concurrent_threads(self, cache):
+        """Test souběžného zápisu z více vláken"""
+
+        def write(i):
+            cache.set(f"key{i}", {"i": i})
+            return cache.get(f"key{i}")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(write, range(50)))
+
+        assert results == [{"i": i} for i in range(50)]
+
+    def test_concurrent_processes(self, tmp_path):
+        """Test souběžného zápisu z více procesů"""
+        path = str(tmp_path / "shared.sqlite3")
+        ResultCache(path)  # Vytvoření schématu předem
+
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            written = list(executor.map(_write_entries, [path] * 4, range(4), [25] * 4))
+
+        assert sum(written) == 100
+        assert len(ResultCache(path)) == 100
+
+    def test_from_env_disabled(self):
+        """Test že bez SEARCH_CACHE_PATH je cache vypnutá"""
+        with patch.dict(os.environ, {}, clear=True):
+            assert ResultCache.from_env() is None
+
+    def test_from_env(self, tmp_path):
+        """Test konfigurace z environment proměnných"""
+        env = {
+            "SEARCH_CACHE_PATH": str(tmp_path / "data" / "cache.sqlite3"),
+            "SEARCH_CACHE_TTL": "120",
+            "SEARCH_CACHE_MAX_ENTRIES": "5",
+        }
+        with patch.dict(os.environ, env, clear=True):
+            cache = ResultCache.from_env()
+
+        assert cache.ttl == 120
+        assert cache.max_entries == 5
+        assert os.path.exists(env["SEARCH_CACHE_PATH"])
@@ -113,17 +113,62 @@ class TestResultsParser:
         assert "Test 2" in result
 
     def test_to_csv_data_without_pandas(self, monkeypatch):
-        """Test CSV bez pandas"""
+        """Test že CSV export pandas nepotřebuje"""
+        import sys
 
-        def mock_import(*args, **kwargs):
-            raise ImportError("No module named 'pandas'")
-
-        monkeypatch.setattr("builtins.__import__", mock_import)
+        # None v sys.modules způsobí ImportError při "import pandas"
+        monkeypatch.setitem(sys.modules, "pandas", None)
 
         data = {"items": [{"title": "Test", "link": "http://test.com", "snippet": "Snippet"}]}
 
-        with pytest.raises(ImportError, match="Pandas není nainstalován"):
-            ResultsParser.to_csv_data(data)
+        result = ResultsParser.to_csv_data(data)
+
+        assert result == "rank,title,link,snippet\n1,Test,http://test.com,Snippet\n"
+
+    def test_to_csv_data_quoting(self):
+        """Test správného escapování čárek, uvozovek a nových řádků"""
+        data = {
+            "items": [
+                {"title": 'Řez, "speciál"', "link": "http://test.cz?a=1,2", "snippet": "a\nb"}
+            ]
+        }
+
+        result = ResultsParser.to_csv_data(data)
+
+        assert '"Řez, ""speciál"""' in result
+        assert '"http://test.cz?a=1,2"' in result
+        assert '"a\nb"' in result
+
+    def test_write_csv_binary_file(self):
+        """Test zápisu do binárního souboru se zvoleným kódováním"""
+        import io
+
+        data = {"items": [{"title": "Český", "link": "http://test.cz", "snippet": "S"}]}
+        buffer = io.BytesIO()
+
+        count = ResultsParser.write_csv(data, buffer, encoding="utf-8-sig")
+
+        assert count == 1
+        assert not buffer.closed
+        assert buffer.getvalue().startswith("\ufeffrank".encode("utf-8"))
+        assert "Český".encode("utf-8") in buffer.getvalue()
+
+    def test_write_csv_streams_rows(self):
+        """Test že generátor řádků se zapisuje průběžně, bez načtení do paměti"""
+        import io
+
+        consumed = []
+
+        def rows():
+            for i in range(1, 4):
+                consumed.append(i)
+                yield {"rank": i, "title": f"T{i}", "link": f"http://t{i}.cz", "snippet": ""}
+
+        buffer = io.StringIO()
+        count = ResultsParser.write_csv(rows(), buffer)
+
+        assert count == 3
+        assert buffer.getvalue().splitlines()[3] == "3,T3,http://t3.cz,"
 
     def test_to_txt_content(self):
         """Test převodu na textový obsah"""
@@ -169,6 +214,18 @@ class TestResultsParser:
         assert "Český název" in result
         assert "Příliš žluťoučký" in result
 
+    def test_results_digest(self):
+        """Test že otisk závisí jen na obsahu výsledků"""
+        data = {"items": [{"title": "A", "link": "http://a.cz", "snippet": "S"}]}
+        parsed = ResultsParser.parse_google_api_response(data)
+
+        digest = ResultsParser.results_digest(parsed)
+
+        assert digest == ResultsParser.results_digest(data)
+        assert len(digest) == 64
+        data["items"][0]["title"] = "B"
+        assert ResultsParser.results_digest(data) != digest
+
     def test_parse_large_dataset(self):
         """Test s velkým množstvím dat"""
         data = {
@@ -200,3 +257,295 @@ class TestResultsParser:
 
         assert result[0]["title"] == 'Test & <script>alert("xss")</script>'
         assert "&" in result[0]["link"]
+
+    def test_parse_multiple_pages_global_rank(self):
+        """Test spojení stránek do jednoho seznamu s globálním pořadím"""
+        data = {
+            "pages": [
+                {
+                    "queries": {"request": [{"startIndex": 11}]},
+                    "items": [{"title": "Druhá", "link": "http://b.com", "snippet": "B"}],
+                },
+                {
+                    "queries": {"request": [{"startIndex": 1}]},
+                    "items": [
+                        {"title": "První", "link": "http://a.com", "snippet": "A"},
+                        {"title": "Duplicitní", "link": "http://b.com", "snippet": "B"},
+                    ],
+                },
+            ]
+        }
+
+        result = ResultsParser.parse_google_api_response(data)
+
+        assert [r["rank"] for r in result] == [1, 2]
+        assert [r["title"] for r in result] == ["První", "Duplicitní"]
+
+    def test_parse_pages_without_items(self):
+        """Test stránek bez výsledků (Google vrátil méně, než se žádalo)"""
+        data = {"pages": [{"items": [{"title": "Jen jeden"}]}, {}]}
+
+        result = ResultsParser.parse_google_api_response(data)
+
+        assert len(result) == 1
+        assert result[0]["rank"] == 1
+
+    def test_parse_returns_result_set(self):
+        """Test že parser vrací sloupcový ResultSet"""
+        from search_results import ResultSet
+
+        data = {"items": [{"title": "Test", "link": "http://test.com", "snippet": "S"}]}
+
+        result = ResultsParser.parse_google_api_response(data)
+
+        assert isinstance(result, ResultSet)
+        assert result.column("title") == ["Test"]
+        assert ResultsParser.parse_google_api_response(result) is result
+
+    def test_to_json_string_matches_json_dumps(self):
+        """Test že streamovaný JSON je shodný s json.dumps(indent=2)"""
+        data = {
+            "items": [
+                {"title": 'Český "titulek"', "link": "http://test.cz", "snippet": "a\nb"},
+                {"title": "Druhý"},
+            ]
+        }
+
+        expected = json.dumps(
+            ResultsParser.parse_google_api_response(data).to_dicts(), ensure_ascii=False, indent=2
+        )
+
+        assert ResultsParser.to_json_string(data) == expected
+        assert ResultsParser.to_json_string({}) == "[]"
+
+    def test_write_json_streams_to_file(self):
+        """Test zápisu JSON z generátoru řádků do binárního souboru"""
+        import io
+
+        def rows():
+            for i in range(1, 1001):
+                yield {"rank": i, "title": f"T{i}", "link": f"http://t{i}.cz", "snippet": ""}
+
+        buffer = io.BytesIO()
+        ResultsParser.write_json(rows(), buffer)
+
+        parsed = json.loads(buffer.getvalue().decode("utf-8"))
+        assert len(parsed) == 1000
+        assert parsed[-1]["rank"] == 1000
+
+    def test_iter_json_chunks_is_lazy(self):
+        """Test že generátor nečte vstup dopředu"""
+        consumed = []
+
+        def rows():
+            for i in range(1, 4):
+                consumed.append(i)
+                yield {"rank": i}
+
+        chunks = ResultsParser.iter_json_chunks(rows())
+        next(chunks)
+
+        assert consumed == [1]
+
+    def test_write_txt(self):
+        """Test zápisu textového exportu do souboru"""
+        import io
+
+        data = {"items": [{"title": "Titulek", "link": "http://test.cz", "snippet": "Popis"}]}
+        buffer = io.StringIO()
+
+        ResultsParser.write_txt(data, "dotaz", buffer)
+
+        assert buffer.getvalue() == ResultsParser.to_txt_content(data, "dotaz")
+        assert "1. Titulek" in buffer.getvalue()
+
+    def test_iter_txt_chunks(self):
+        """Test že TXT se generuje po blocích - hlavička + jeden blok na výsledek"""
+        data = {"items": [{"title": f"T{i}"} for i in range(3)]}
+
+        chunks = list(ResultsParser.iter_txt_chunks(data, "dotaz"))
+
+        assert len(chunks) == 4
+        assert chunks[0].startswith("Výsledky vyhledávání: dotaz")
+
+
+class TestResultsParserLocaleComparison:
+    """Testy pro srovnání jazyků a jeho export"""
+
+    @pytest.fixture
+    def comparison(self):
+        """Srovnání z API odpovědí dvou jazyků"""
+        return ResultsParser.compare_locales(
+            {
+                "cs": {"items": [{"title": "A, s čárkou", "link": "https://a.cz"}]},
+                "de": {
+                    "items": [
+                        {"title": "B", "link": "https://b.de"},
+                        {"title": "A", "link": "https://a.cz"},
+                    ]
+                },
+            }
+        )
+
+    def test_compare_locales(self, comparison):
+        """Test naparsování a zarovnání odpovědí"""
+        assert comparison.languages == ["cs", "de"]
+        assert [row["link"] for row in comparison] == ["https://a.cz", "https://b.de"]
+
+    def test_comparison_csv(self, comparison):
+        """Test širokého CSV - chybějící pořadí je prázdná buňka"""
+        assert ResultsParser.to_comparison_csv(comparison) == (
+            "link,title,best_rank,rank_cs,rank_de\n"
+            'https://a.cz,"A, s čárkou",1,1,2\n'
+            "https://b.de,B,1,,1\n"
+        )
+
+    def test_comparison_json(self, comparison):
+        """Test JSON exportu - chybějící pořadí je null"""
+        data = json.loads(ResultsParser.to_comparison_json(comparison))
+
+        assert data[1] == {
+            "link": "https://b.de",
+            "title": "B",
+            "best_rank": 1,
+            "rank_cs": None,
+            "rank_de": 1,
+        }
+
+
+class TestResultsParserMovements:
+    """Testy pro export změn pořadí"""
+
+    def test_movements_csv(self):
+        """Test CSV se změnami pořadí - chybějící hodnoty jsou prázdné"""
+        movements = [
+            {
+                "url": "https://a.cz",
+                "title": "A",
+                "rank": 1,
+                "prev_rank": 3,
+                "change": 2,
+                "status": "up",
+            },
+            {
+                "url": "https://b.cz",
+                "title": "B",
+                "rank": None,
+                "prev_rank": 1,
+                "change": None,
+                "status": "dropped",
+            },
+        ]
+
+        assert ResultsParser.to_movements_csv(movements) == (
+            "url,title,rank,prev_rank,change,status\n"
+            "https://a.cz,A,1,3,2,up\n"
+            "https://b.cz,B,,1,,dropped\n"
+        )
+
+
+class TestResultsParserParquet:
+    """Testy pro Parquet/Arrow export"""
+
+    @pytest.fixture(autouse=True)
+    def require_pyarrow(self):
+        """Testy Parquet/Arrow se bez pyarrow přeskočí"""
+        pytest.importorskip("pyarrow")
+
+    @pytest.fixture
+    def response(self):
+        """API odpověď se třemi výsledky, dva z nich ze stejné domény"""
+        return {
+            "items": [
+                {"title": "Python", "link": "https://www.Python.org/", "snippet": "Jazyk"},
+                {"title": "Docs", "link": "https://docs.python.org/3/", "snippet": "Dokumentace"},
+                {"title": "Wiki", "link": "https://www.python.org/wiki", "snippet": "Žluťoučký"},
+            ]
+        }
+
+    def test_arrow_table_dictionary_columns(self, response):
+        """Test že query, language, domain a rank jsou slovníkové sloupce"""
+        import pyarrow as pa
+
+        table = ResultsParser.to_arrow_table(response, "python", "cs")
+
+        assert table.column_names == list(ResultsParser.ARCHIVE_FIELDS)
+        for field in ResultsParser.DICTIONARY_FIELDS:
+            assert pa.types.is_dictionary(table.schema.field(field).type)
+        assert table.column("domain").to_pylist() == [
+            "www.python.org",
+            "docs.python.org",
+            "www.python.org",
+        ]
+        assert table.column("rank").to_pylist() == [1, 2, 3]
+
+    def test_arrow_table_invalid_link(self, response):
+        """Test že neplatný odkaz nerozbije export - doména zůstane prázdná"""
+        response["items"].append({"title": "Chyba", "link": "http://[::1", "snippet": ""})
+
+        table = ResultsParser.to_arrow_table(response, "python", "cs")
+
+        assert table.column("domain").to_pylist()[-1] == ""
+        assert table.column("link").to_pylist()[-1] == "http://[::1"
+
+    def test_parquet_roundtrip(self, response):
+        """Test zápisu a načtení zpět do pandas"""
+        data = ResultsParser.to_parquet_bytes(response, "python", "cs")
+        df = ResultsParser.read_parquet(data)
+
+        assert list(df.columns) == list(ResultsParser.ARCHIVE_FIELDS)
+        assert list(df["rank"]) == [1, 2, 3]
+        assert df["snippet"].iloc[2] == "Žluťoučký"
+        assert set(df["language"].astype(str)) == {"cs"}
+
+    def test_read_parquet_zero_copy(self, response, tmp_path):
+        """Test že DataFrame drží Arrow pole (bez převodu na Python objekty)"""
+        import pandas as pd
+
+        path = tmp_path / "archiv.parquet"
+        with open(path, "wb") as f:
+            ResultsParser.write_parquet(response, f, "python", "cs")
+
+        df = ResultsParser.read_parquet(path, columns=["link", "rank"])
+
+        assert list(df.columns) == ["link", "rank"]
+        assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+
+    @pytest.mark.parametrize("compression", ["zstd", "snappy", "gzip", "none"])
+    def test_compression_and_row_groups(self, response, compression):
+        """Test zvolené komprese a rozdělení do row groups"""
+        import pyarrow.parquet as pq
+
+        data = ResultsParser.to_parquet_bytes(
+            response, "python", "cs", compression=compression, row_group_size=2
+        )
+        metadata = pq.ParquetFile(pa_buffer(data)).metadata
+
+        assert metadata.num_row_groups == 2
+        expected = "UNCOMPRESSED" if compression == "none" else compression.upper()
+        assert metadata.row_group(0).column(0).compression == expected
+
+    def test_rank_dictionary_encoded_on_disk(self, response):
+        """Test že pořadí je v souboru uložené slovníkově (RLE_DICTIONARY)"""
+        import pyarrow.parquet as pq
+
+        data = ResultsParser.to_parquet_bytes(response, "python", "cs")
+        column = pq.ParquetFile(pa_buffer(data)).metadata.row_group(0).column(2)
+
+        assert column.path_in_schema == "rank"
+        assert "RLE_DICTIONARY" in column.encodings
+
+    def test_missing_pyarrow(self, response, monkeypatch):
+        """Test srozumitelné chyby, když pyarrow není nainstalovaný"""
+        import sys
+
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        with pytest.raises(ImportError, match="PyArrow"):
+            ResultsParser.to_parquet_bytes(response)
+
+
+def pa_buffer(data):
+    """Bytes jako pyarrow BufferReader pro ParquetFile"""
+    import pyarrow as pa
+
+    return pa.BufferReader(data)
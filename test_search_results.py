@@ -0,0 +1,191 @@
+"""
+Unit testy pro SearchResult a ResultSet
+"""
+
+import pytest
+
+from search_results import LocaleComparison, ResultSet, SearchResult
+
+
+class TestSearchResult:
+    """Testy pro SearchResult"""
+
+    @pytest.fixture
+    def result(self):
+        return SearchResult(1, "Titulek", "http://test.cz", "Popis")
+
+    def test_dict_access(self, result):
+        """Test zpětně kompatibilního přístupu jako k dictu"""
+        assert result["title"] == "Titulek"
+        assert result.get("link") == "http://test.cz"
+        assert result.get("neexistuje", "?") == "?"
+        assert dict(result) == {
+            "rank": 1,
+            "title": "Titulek",
+            "link": "http://test.cz",
+            "snippet": "Popis",
+        }
+
+    def test_tuple_access(self, result):
+        """Test že zůstává n-ticí"""
+        assert result[0] == 1
+        assert result.rank == 1
+        rank, title, link, snippet = result
+        assert snippet == "Popis"
+
+    def test_missing_key(self, result):
+        """Test neexistujícího klíče"""
+        with pytest.raises(KeyError):
+            result["neexistuje"]
+
+    def test_no_instance_dict(self, result):
+        """Test že výsledek nemá __dict__ (kompaktní v paměti)"""
+        assert not hasattr(result, "__dict__")
+
+
+class TestResultSet:
+    """Testy pro ResultSet"""
+
+    @pytest.fixture
+    def records(self):
+        return [
+            {"rank": i, "title": f"Title {i}", "link": f"http://test{i}.com", "snippet": f"S {i}"}
+            for i in range(1, 4)
+        ]
+
+    def test_from_records_roundtrip(self, records):
+        """Test převodu z a do listu dictů"""
+        result_set = ResultSet.from_records(records)
+
+        assert len(result_set) == 3
+        assert result_set.to_dicts() == records
+        assert result_set == records
+
+    def test_from_records_defaults(self):
+        """Test doplnění chybějících polí"""
+        result_set = ResultSet.from_records([{"title": "Jen titulek"}])
+
+        assert result_set[0] == SearchResult(1, "Jen titulek", "", "")
+
+    def test_indexing_and_iteration(self, records):
+        """Test přístupu k řádkům"""
+        result_set = ResultSet.from_records(records)
+
+        assert result_set[1]["title"] == "Title 2"
+        assert result_set[-1].rank == 3
+        assert [r.link for r in result_set] == [r["link"] for r in records]
+
+    def test_slice(self, records):
+        """Test že řez vrací zase ResultSet"""
+        result_set = ResultSet.from_records(records)[:2]
+
+        assert isinstance(result_set, ResultSet)
+        assert result_set == records[:2]
+
+    def test_column(self, records):
+        """Test přístupu ke sloupci"""
+        result_set = ResultSet.from_records(records)
+        assert result_set.column("rank") == [1, 2, 3]
+
+    def test_empty(self):
+        """Test prázdného kontejneru"""
+        result_set = ResultSet()
+
+        assert len(result_set) == 0
+        assert not result_set
+        assert result_set == []
+        assert list(result_set) == []
+
+    def test_uneven_columns(self):
+        """Test že sloupce musí mít stejnou délku"""
+        with pytest.raises(ValueError):
+            ResultSet({"rank": [1, 2], "title": ["a"], "link": ["a"], "snippet": ["a"]})
+
+    def test_equality_between_sets(self, records):
+        """Test porovnání dvou ResultSet"""
+        assert ResultSet.from_records(records) == ResultSet.from_records(records)
+        assert ResultSet.from_records(records) != ResultSet()
+        assert ResultSet() != "něco jiného"
+
+    def test_to_pandas(self, records):
+        """Test převodu na DataFrame"""
+        df = ResultSet.from_records(records).to_pandas()
+
+        assert list(df.columns) == ["rank", "title", "link", "snippet"]
+        assert df["title"].tolist() == ["Title 1", "Title 2", "Title 3"]
+
+    def test_to_pandas_empty(self):
+        """Test prázdného DataFrame se správnými sloupci"""
+        df = ResultSet().to_pandas()
+        assert list(df.columns) == ["rank", "title", "link", "snippet"]
+        assert len(df) == 0
+
+    def test_to_arrow(self, records):
+        """Test převodu na Arrow tabulku"""
+        pytest.importorskip("pyarrow")
+        table = ResultSet.from_records(records).to_arrow()
+
+        assert table.column_names == ["rank", "title", "link", "snippet"]
+        assert table.num_rows == 3
+        assert table.column("rank").to_pylist() == [1, 2, 3]
+
+    def test_repr(self):
+        assert repr(ResultSet()) == "ResultSet(0 výsledků)"
+
+
+class TestLocaleComparison:
+    """Testy pro LocaleComparison třídu"""
+
+    @pytest.fixture
+    def comparison(self):
+        """Srovnání dvou jazyků s částečně společnými odkazy"""
+        return LocaleComparison.from_result_sets(
+            {
+                "cs": ResultSet.from_records(
+                    [
+                        {"title": "A", "link": "https://a.cz/"},
+                        {"title": "B", "link": "https://b.cz"},
+                    ]
+                ),
+                "en": ResultSet.from_records(
+                    [
+                        {"title": "C", "link": "https://c.com"},
+                        {"title": "A en", "link": "https://A.cz#sekce"},
+                    ]
+                ),
+            }
+        )
+
+    def test_aligned_by_url(self, comparison):
+        """Test zarovnání stejných URL (bez fragmentu, lomítka a velikosti hostitele)"""
+        assert comparison.to_dicts() == [
+            {"link": "https://a.cz/", "title": "A", "best_rank": 1, "rank_cs": 1, "rank_en": 2},
+            {"link": "https://c.com", "title": "C", "best_rank": 1, "rank_cs": None, "rank_en": 1},
+            {"link": "https://b.cz", "title": "B", "best_rank": 2, "rank_cs": 2, "rank_en": None},
+        ]
+
+    def test_invalid_link(self):
+        """Test že odkaz, který nejde rozebrat, srovnání neshodí"""
+        comparison = LocaleComparison.from_result_sets(
+            {
+                "cs": ResultSet.from_records([{"title": "A", "link": "http://[::1"}]),
+                "en": ResultSet.from_records([{"title": "A", "link": "http://[::1"}]),
+            }
+        )
+
+        assert comparison.to_dicts() == [
+            {"link": "http://[::1", "title": "A", "best_rank": 1, "rank_cs": 1, "rank_en": 1}
+        ]
+
+    def test_columns(self, comparison):
+        """Test sloupců širokého výstupu"""
+        assert comparison.columns == ["link", "title", "best_rank", "rank_cs", "rank_en"]
+        assert repr(comparison) == "LocaleComparison(3 odkazů, cs, en)"
+
+    def test_to_pandas(self, comparison):
+        """Test převodu na DataFrame s nullable pořadím"""
+        df = comparison.to_pandas()
+
+        assert list(df.columns) == comparison.columns
+        assert str(df["rank_en"].dtype) == "Int64"
+        assert df["rank_en"].isna().tolist() == [False, False, True]
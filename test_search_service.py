@@ -3,13 +3,24 @@ Unit testy pro SearchService
 """
 
 import os
+import threading
+import time
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
+from result_cache import ResultCache
 from search_service import SearchService
 
 
+@pytest.fixture(autouse=True)
+def reset_search_service():
+    """Každý test začíná bez sdíleného stavu SearchService"""
+    SearchService.reset()
+    yield
+    SearchService.reset()
+
+
 class TestSearchService:
     """Testy pro SearchService třídu"""
 
@@ -202,13 +213,7 @@ class TestSearchService:
         }
 
         for lang, expected_country in language_tests.items():
-            # Vymaž cache před každým testem
-            import streamlit as st
-            if hasattr(st, 'cache_data'):
-                st.cache_data.clear()
-
-            with patch("search_service.build") as mock_build, \
-                 patch("search_service.st.cache_data", lambda ttl: lambda f: f):
+            with patch("search_service.build") as mock_build:
                 mock_service = Mock()
                 mock_cse_instance = Mock()
                 mock_list_method = Mock()
@@ -219,10 +224,9 @@ class TestSearchService:
                 mock_service.cse.return_value = mock_cse_instance
                 mock_build.return_value = mock_service
 
-                # Volej přímo bez cache
-                from search_service import SearchService
-                # Získej uncached verzi funkce
-                result = SearchService.google_search.__wrapped__(
+                # Zahodí paměťovou cache i klienty z poolu postavené předchozím mockem
+                SearchService.reset()
+                result = SearchService.google_search(
                     search_service.api_key, search_service.cx, "test", num=10, language=lang
                 )
 
@@ -249,3 +253,703 @@ class TestSearchService:
 
             call_args = mock_cse.return_value.list.call_args
             assert call_args[1]["gl"] == "US"  # Výchozí země pro neznámý jazyk
+
+
+class TestSearchServicePersistentCache:
+    """Testy pro perzistentní cache v SearchService.fetch"""
+
+    @staticmethod
+    def _mock_build(mock_build, response):
+        mock_list = Mock()
+        mock_list.execute.return_value = response
+        mock_build.return_value.cse.return_value.list.return_value = mock_list
+        return mock_list
+
+    def test_fetch_without_cache_calls_api(self):
+        """Test že bez SEARCH_CACHE_PATH se volá vždy API"""
+        with patch.dict(os.environ, {}, clear=True), patch("search_service.build") as mock_build:
+            mock_list = self._mock_build(mock_build, {"items": []})
+
+            SearchService.fetch("key", "cx", "python", 10)
+            SearchService.fetch("key", "cx", "python", 10)
+
+            assert SearchService.get_cache() is None
+            assert mock_list.execute.call_count == 2
+
+    def test_fetch_uses_persistent_cache(self, tmp_path):
+        """Test že druhé volání se obslouží z disku i po resetu (restartu)"""
+        env = {"SEARCH_CACHE_PATH": str(tmp_path / "cache.sqlite3")}
+        response = {"items": [{"title": "Test", "link": "http://test.com", "snippet": "S"}]}
+
+        with patch.dict(os.environ, env), patch("search_service.build") as mock_build:
+            mock_list = self._mock_build(mock_build, response)
+
+            assert SearchService.fetch("key", "cx", "python", 10) == response
+
+            # Simulace restartu procesu - in-memory stav se zahodí
+            SearchService.reset()
+            assert SearchService.fetch("other-key", "cx", "python", 10) == response
+
+            assert mock_list.execute.call_count == 1
+
+    def test_fetch_cache_key_includes_language(self, tmp_path):
+        """Test že různé jazyky mají různé záznamy"""
+        env = {"SEARCH_CACHE_PATH": str(tmp_path / "cache.sqlite3")}
+
+        with patch.dict(os.environ, env), patch("search_service.build") as mock_build:
+            mock_list = self._mock_build(mock_build, {"items": []})
+
+            SearchService.fetch("key", "cx", "python", 10, language="cs")
+            SearchService.fetch("key", "cx", "python", 10, language="en")
+
+            assert mock_list.execute.call_count == 2
+
+
+class TestSearchServiceClientPool:
+    """Testy pro znovupoužití customsearch klienta"""
+
+    def test_build_called_once_for_repeated_searches(self):
+        """Test že build() se nevolá při každém dotazu"""
+        with patch.dict(os.environ, {}, clear=True), patch("search_service.build") as mock_build:
+            mock_build.return_value.cse.return_value.list.return_value.execute.return_value = {}
+
+            SearchService.fetch("key", "cx", "python", 10)
+            SearchService.fetch("key", "cx", "java", 10)
+
+            assert mock_build.call_count == 1
+
+    def test_build_uses_static_discovery(self):
+        """Test že klient se staví z přibaleného discovery dokumentu"""
+        with patch("search_service.build") as mock_build:
+            SearchService._build_client("key")
+
+            kwargs = mock_build.call_args[1]
+            assert kwargs["developerKey"] == "key"
+            assert kwargs["static_discovery"] is True
+            assert kwargs["http"] is not None
+
+    def test_build_client_without_mock(self):
+        """Test že skutečný klient jde postavit bez přístupu k síti"""
+        client = SearchService._build_client("key")
+        assert hasattr(client, "cse")
+
+
+class TestSearchServicePagination:
+    """Testy pro stahování víc než 10 výsledků po stránkách"""
+
+    @staticmethod
+    def _page_response(**kwargs):
+        start = kwargs["start"]
+        return {
+            "queries": {"request": [{"startIndex": start}]},
+            "items": [
+                {"title": f"Result {start + i}", "link": f"http://test{start + i}.com"}
+                for i in range(kwargs["num"])
+            ],
+        }
+
+    def _mock_list(self, mock_build):
+        mock_list = mock_build.return_value.cse.return_value.list
+        mock_list.side_effect = lambda **kwargs: Mock(
+            execute=Mock(return_value=self._page_response(**kwargs))
+        )
+        return mock_list
+
+    def test_up_to_ten_results_single_call(self):
+        """Test že do 10 výsledků se volá API jen jednou a odpověď se nemění"""
+        with patch.dict(os.environ, {}, clear=True), patch("search_service.build") as mock_build:
+            mock_list = self._mock_list(mock_build)
+
+            result = SearchService.fetch("key", "cx", "python", 10)
+
+            assert mock_list.call_count == 1
+            assert len(result["items"]) == 10
+
+    def test_pages_requested_with_start_offsets(self):
+        """Test že 25 výsledků se stáhne jako 3 stránky (10 + 10 + 5)"""
+        with patch.dict(os.environ, {}, clear=True), patch("search_service.build") as mock_build:
+            mock_list = self._mock_list(mock_build)
+
+            result = SearchService.fetch("key", "cx", "python", 25)
+
+            requested = sorted((c[1]["start"], c[1]["num"]) for c in mock_list.call_args_list)
+            assert requested == [(1, 10), (11, 10), (21, 5)]
+            assert len(result["pages"]) == 3
+
+    def test_num_capped_at_api_limit(self):
+        """Test že víc než 100 výsledků API neumí"""
+        with patch.dict(os.environ, {}, clear=True), patch("search_service.build") as mock_build:
+            mock_list = self._mock_list(mock_build)
+
+            SearchService.fetch("key", "cx", "python", 150)
+
+            assert mock_list.call_count == 10
+
+    def test_pages_fetched_concurrently(self):
+        """Test že stránky se stahují souběžně, ne jedna po druhé"""
+        import threading
+
+        barrier = threading.Barrier(SearchService.MAX_PAGE_WORKERS, timeout=5)
+
+        def execute_page(**kwargs):
+            barrier.wait()  # Projde jen když běží všechny stránky naráz
+            return self._page_response(**kwargs)
+
+        with patch.dict(os.environ, {}, clear=True), patch("search_service.build") as mock_build:
+            mock_build.return_value.cse.return_value.list.side_effect = lambda **kwargs: Mock(
+                execute=Mock(side_effect=lambda: execute_page(**kwargs))
+            )
+
+            result = SearchService.fetch("key", "cx", "python", 40)
+
+            assert len(result["pages"]) == 4
+
+
+class TestSearchServiceRateLimiting:
+    """Testy pro omezení rychlosti a kvótu v SearchService"""
+
+    def test_quota_remaining(self, monkeypatch):
+        """Test že volání API snižuje zbývající kvótu"""
+        monkeypatch.delenv("SEARCH_CACHE_PATH", raising=False)
+        monkeypatch.setenv("SEARCH_DAILY_QUOTA", "100")
+
+        with patch("search_service.build") as mock_build:
+            mock_build.return_value.cse.return_value.list.return_value.execute.return_value = {}
+
+            assert SearchService.quota_remaining() == 100
+            SearchService.fetch("key", "cx", "python", 25)  # 3 stránky = 3 dotazy
+
+            assert SearchService.quota_remaining() == 97
+
+    def test_transient_error_retried(self, monkeypatch):
+        """Test že dočasná chyba API se zopakuje"""
+        import httplib2
+        from googleapiclient.errors import HttpError
+
+        monkeypatch.delenv("SEARCH_CACHE_PATH", raising=False)
+        error = HttpError(httplib2.Response({"status": 503}), b"{}")
+
+        with patch("search_service.build") as mock_build, patch("rate_limiter.time.sleep"):
+            execute = mock_build.return_value.cse.return_value.list.return_value.execute
+            execute.side_effect = [error, {"items": []}]
+
+            assert SearchService.fetch("key", "cx", "python", 10) == {"items": []}
+            assert execute.call_count == 2
+
+
+class TestSearchServiceMetrics:
+    """Testy pro metriky SearchService"""
+
+    def test_api_calls_and_latency_per_language(self, monkeypatch):
+        """Test že každé volání API se započítá i s latencí podle jazyka"""
+        monkeypatch.delenv("SEARCH_CACHE_PATH", raising=False)
+
+        with patch("search_service.build") as mock_build:
+            mock_build.return_value.cse.return_value.list.return_value.execute.return_value = {}
+            SearchService.fetch("key", "cx", "python", 25, language="de")
+
+        metrics = SearchService.get_metrics()
+        assert metrics.api_requests.value(language="de") == 3
+        assert metrics.api_latency.series()[("de",)]["count"] == 3
+
+    def test_errors_counted_by_reason(self, monkeypatch):
+        """Test že chyby API se počítají podle důvodu (i opakované pokusy)"""
+        import httplib2
+        from googleapiclient.errors import HttpError
+
+        monkeypatch.delenv("SEARCH_CACHE_PATH", raising=False)
+        body = b'{"error": {"errors": [{"reason": "backendError"}]}}'
+        error = HttpError(httplib2.Response({"status": 503}), body)
+
+        with patch("search_service.build") as mock_build, patch("rate_limiter.time.sleep"):
+            execute = mock_build.return_value.cse.return_value.list.return_value.execute
+            execute.side_effect = [error, {"items": []}]
+            SearchService.fetch("key", "cx", "python", 10)
+
+        metrics = SearchService.get_metrics()
+        assert metrics.api_errors.value(reason="backendError") == 1
+        assert metrics.api_requests.value(language="cs") == 2
+
+    def test_local_quota_exhaustion_counted(self, monkeypatch):
+        """Test že zastavení lokální kvótou se započítá jako chyba"""
+        from rate_limiter import QuotaExceededError
+
+        monkeypatch.delenv("SEARCH_CACHE_PATH", raising=False)
+        monkeypatch.setenv("SEARCH_DAILY_QUOTA", "0")
+
+        with patch("search_service.build"):
+            with pytest.raises(QuotaExceededError):
+                SearchService.fetch("key", "cx", "python", 10)
+
+        assert SearchService.get_metrics().api_errors.value(reason="localQuotaExceeded") == 1
+
+    def test_disk_cache_hits_and_misses(self, monkeypatch, tmp_path):
+        """Test počítání hitů a missů perzistentní cache"""
+        monkeypatch.setenv("SEARCH_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+
+        with patch("search_service.build") as mock_build:
+            mock_build.return_value.cse.return_value.list.return_value.execute.return_value = {}
+            SearchService.fetch("key", "cx", "python", 10)
+            SearchService.fetch("key", "cx", "python", 10)
+
+        metrics = SearchService.get_metrics()
+        assert metrics.cache_requests.value(layer="disk", result="miss") == 1
+        assert metrics.cache_requests.value(layer="disk", result="hit") == 1
+        assert metrics.hit_rate("disk") == 0.5
+
+    def test_render_includes_quota_gauge(self, monkeypatch):
+        """Test že Prometheus výstup obsahuje zbývající kvótu"""
+        monkeypatch.setenv("SEARCH_DAILY_QUOTA", "42")
+
+        assert "search_quota_remaining 42" in SearchService.get_metrics().render()
+
+
+class TestSearchServiceSingleFlight:
+    """Testy pro slučování souběžných stejných dotazů"""
+
+    def test_concurrent_identical_searches_call_api_once(self, monkeypatch):
+        """Test že souběžné stejné dotazy zavolají API jen jednou"""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        monkeypatch.delenv("SEARCH_CACHE_PATH", raising=False)
+        release = threading.Event()
+
+        def slow_execute():
+            release.wait(5)
+            return {"items": [{"title": "T", "link": "L", "snippet": "S"}]}
+
+        with patch("search_service.build") as mock_build:
+            execute = mock_build.return_value.cse.return_value.list.return_value.execute
+            execute.side_effect = slow_execute
+
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                futures = [
+                    executor.submit(SearchService.fetch, "key", "cx", "python", 10)
+                    for _ in range(5)
+                ]
+                while execute.call_count == 0:
+                    time.sleep(0.01)
+                time.sleep(0.1)
+                release.set()
+                results = [future.result() for future in futures]
+
+        assert execute.call_count == 1
+        assert all(result == results[0] for result in results)
+        assert SearchService.get_metrics().coalesced.value() == 4
+
+    def test_lock_dir_next_to_cache(self, monkeypatch, tmp_path):
+        """Test že zámky mezi procesy se zapnou jen s perzistentní cache"""
+        monkeypatch.delenv("SEARCH_LOCK_DIR", raising=False)
+        monkeypatch.delenv("SEARCH_CACHE_PATH", raising=False)
+        assert SearchService.get_single_flight().lock_dir is None
+
+        SearchService.reset()
+        cache_path = str(tmp_path / "cache.sqlite3")
+        monkeypatch.setenv("SEARCH_CACHE_PATH", cache_path)
+        assert SearchService.get_single_flight().lock_dir == f"{cache_path}.locks"
+
+
+class TestSearchServiceCanonicalCache:
+    """Testy pro kanonické klíče a obsloužení menšího num z větší odpovědi"""
+
+    @pytest.fixture
+    def execute(self, monkeypatch, tmp_path):
+        """Mock API, které vrací tolik položek, kolik se žádá"""
+        monkeypatch.setenv("SEARCH_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+
+        with patch("search_service.build") as mock_build:
+            cse_list = mock_build.return_value.cse.return_value.list
+
+            def list_(**kwargs):
+                request = Mock()
+                request.execute.return_value = {
+                    "queries": {"request": [{"startIndex": kwargs["start"]}]},
+                    "items": [
+                        {"title": f"T{i}", "link": f"https://{i}.cz", "snippet": ""}
+                        for i in range(kwargs["start"], kwargs["start"] + kwargs["num"])
+                    ],
+                }
+                return request
+
+            cse_list.side_effect = list_
+            yield cse_list
+
+    def test_query_variants_share_entry(self, execute):
+        """Test že "Python " a "python" sdílí záznam v cache"""
+        SearchService.fetch("key", "cx", "Python ", 10)
+        SearchService.fetch("key", "cx", "python", 10)
+
+        assert execute.call_count == 1
+        assert execute.call_args[1]["q"] == "Python"
+
+    def test_api_query_keeps_case(self, execute):
+        """Test že do API jde dotaz s velkými písmeny (operátor OR), jen bez přebytečných mezer"""
+        SearchService.fetch("key", "cx", "  python  OR Java  site:Example.com ", 10)
+
+        assert execute.call_args[1]["q"] == "python OR Java site:Example.com"
+
+    def test_operator_not_shared_with_plain_word(self, execute):
+        """Test že "python OR java" a "python or java" nesdílí záznam v cache"""
+        SearchService.fetch("key", "cx", "python OR java", 10)
+        SearchService.fetch("key", "cx", "python or java", 10)
+
+        assert [c[1]["q"] for c in execute.call_args_list] == ["python OR java", "python or java"]
+
+    def test_smaller_num_sliced_from_cache(self, execute):
+        """Test že num=5 se obslouží z uložené odpovědi s 10 výsledky"""
+        SearchService.fetch("key", "cx", "python", 10)
+        result = SearchService.fetch("key", "cx", "python", 5)
+
+        assert execute.call_count == 1
+        assert [item["title"] for item in result["items"]] == ["T1", "T2", "T3", "T4", "T5"]
+
+    def test_larger_num_calls_api(self, execute):
+        """Test že větší num než v cache zavolá API a uloží delší odpověď"""
+        SearchService.fetch("key", "cx", "python", 5)
+        SearchService.fetch("key", "cx", "python", 25)
+        execute.reset_mock()
+
+        result = SearchService.fetch("key", "cx", "python", 15)
+
+        execute.assert_not_called()
+        assert [len(page["items"]) for page in result["pages"]] == [10, 5]
+
+    def test_slice_response_matches_direct_call(self):
+        """Test tvaru oříznuté odpovědi"""
+        pages = [
+            {"items": [{"link": f"{start}-{i}"} for i in range(10)]} for start in (1, 11, 21)
+        ]
+        response = {"pages": pages}
+
+        assert SearchService.slice_response(response, 3) == {"items": pages[0]["items"][:3]}
+        assert SearchService.slice_response(response, 20) == {"pages": pages[:2]}
+        assert SearchService.slice_response({"items": []}, 5) == {"items": []}
+
+
+class TestSearchServiceStaleWhileRevalidate:
+    """Testy pro stale-while-revalidate a stale-if-error"""
+
+    @pytest.fixture
+    def stale_cache(self, monkeypatch, tmp_path):
+        """Cache s jedním prošlým záznamem (stáří 150 s při TTL 100 s)"""
+        monkeypatch.setenv("SEARCH_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+        monkeypatch.setenv("SEARCH_CACHE_TTL", "100")
+
+        def prepare(stale_ttl=0, stale_if_error=0):
+            monkeypatch.setenv("SEARCH_CACHE_STALE_TTL", str(stale_ttl))
+            monkeypatch.setenv("SEARCH_CACHE_STALE_IF_ERROR", str(stale_if_error))
+            SearchService.reset()
+            cache = SearchService.get_cache()
+            with patch("result_cache.time.time", return_value=time.time() - 150):
+                cache.set(
+                    ResultCache.make_key("cx", "python", None, "cs"),
+                    {"num": 10, "response": {"items": [{"title": "starý"}]}},
+                )
+            return cache
+
+        return prepare
+
+    def test_stale_served_and_refreshed(self, stale_cache):
+        """Test že prošlý záznam se vrátí hned a obnoví na pozadí"""
+        cache = stale_cache(stale_ttl=100)
+        release = threading.Event()
+
+        def execute():
+            release.wait(5)
+            return {"items": [{"title": "nový"}]}
+
+        with patch("search_service.build") as mock_build:
+            cse_list = mock_build.return_value.cse.return_value.list
+            cse_list.return_value.execute.side_effect = execute
+
+            result = SearchService.fetch("key", "cx", "python", 10)
+            assert result == {"items": [{"title": "starý"}]}
+            assert SearchService.get_refresher().pending() == 1
+
+            release.set()
+            while SearchService.get_refresher().pending():
+                time.sleep(0.01)
+
+        entry = cache.get(ResultCache.make_key("cx", "python", None, "cs"))
+        assert entry["response"] == {"items": [{"title": "nový"}]}
+        assert SearchService.get_metrics().cache_requests.value(layer="disk", result="stale") == 1
+
+    def test_stale_served_when_api_fails(self, stale_cache):
+        """Test že při chybě API se vrátí prošlý záznam"""
+        stale_cache(stale_if_error=100)
+
+        with patch("search_service.build") as mock_build:
+            execute = mock_build.return_value.cse.return_value.list.return_value.execute
+            execute.side_effect = ValueError("API nedostupné")
+
+            result = SearchService.fetch("key", "cx", "python", 5)
+
+        assert result == {"items": [{"title": "starý"}]}
+        metrics = SearchService.get_metrics()
+        assert metrics.cache_requests.value(layer="disk", result="stale_on_error") == 1
+
+    def test_error_raised_without_stale_window(self, stale_cache):
+        """Test že bez stale oken se chyba API propaguje"""
+        stale_cache()
+
+        with patch("search_service.build") as mock_build:
+            execute = mock_build.return_value.cse.return_value.list.return_value.execute
+            execute.side_effect = ValueError("API nedostupné")
+
+            with pytest.raises(ValueError):
+                SearchService.fetch("key", "cx", "python", 10)
+
+
+class TestSearchServiceLocaleFanOut:
+    """Testy pro souběžné vyhledávání ve více jazycích"""
+
+    def test_fetch_locales_runs_concurrently(self, monkeypatch):
+        """Test že jazyky se stahují souběžně a vrací se v pořadí výběru"""
+        monkeypatch.delenv("SEARCH_CACHE_PATH", raising=False)
+        barrier = threading.Barrier(3, timeout=5)
+
+        def list_(**kwargs):
+            request = Mock()
+
+            def execute():
+                # Projde jen když běží všechny tři jazyky najednou
+                barrier.wait()
+                return {"items": [{"title": kwargs["lr"], "link": "https://x.cz"}]}
+
+            request.execute.side_effect = execute
+            return request
+
+        with patch("search_service.build") as mock_build:
+            mock_build.return_value.cse.return_value.list.side_effect = list_
+            responses = SearchService.fetch_locales("key", "cx", "python", 10, ("de", "cs", "en"))
+
+        assert list(responses) == ["de", "cs", "en"]
+        assert responses["cs"]["items"][0]["title"] == "lang_cs"
+
+    def test_fetch_locales_empty(self):
+        """Test prázdného výběru jazyků"""
+        assert SearchService.fetch_locales("key", "cx", "python", 10, ()) == {}
+
+
+class TestSearchServiceMemoryCache:
+    """Testy pro paměťovou cache google_search"""
+
+    @pytest.fixture(autouse=True)
+    def no_disk_cache(self, monkeypatch):
+        monkeypatch.delenv("SEARCH_CACHE_PATH", raising=False)
+
+    def test_repeated_search_served_from_memory(self):
+        """Test že opakované vyhledávání nevolá fetch a vrací nezávislou kopii"""
+        fetched = ({"items": [{"title": "a"}]}, "fresh")
+        with patch.object(SearchService, "fetch", return_value=fetched) as f:
+            first = SearchService.google_search("key", "cx", "Python", 10)
+            first["items"].clear()
+            second = SearchService.google_search("key", "cx", " python ", 10)
+
+        assert f.call_count == 1
+        assert second == {"items": [{"title": "a"}]}
+        requests = SearchService.get_metrics().cache_requests
+        assert requests.value(layer="memory", result="miss") == 1
+        assert requests.value(layer="memory", result="hit") == 1
+        assert SearchService.get_memory_cache().stats()["hits"] == 1
+
+    def test_smaller_num_sliced_from_memory(self):
+        """Test že bez perzistentní cache se num=5 obslouží z odpovědi s 10 výsledky"""
+        items = [{"title": f"T{i}"} for i in range(10)]
+        with patch.object(SearchService, "fetch", return_value=({"items": items}, "fresh")) as f:
+            SearchService.google_search("key", "cx", "python", 10)
+            result = SearchService.google_search("key", "cx", "python", 5)
+            SearchService.google_search("key", "cx", "python", 20)
+
+        assert result == {"items": items[:5]}
+        assert [c[0][3] for c in f.call_args_list] == [10, 20]
+
+    def test_locales_fetch_only_missing(self):
+        """Test že porovnání jazyků stáhne jen jazyky, které v paměti chybí"""
+
+        def fetch_locales(api_key, cx, query, num, languages, with_state=False):
+            return {language: ({"items": [{"title": language}]}, "fresh") for language in languages}
+
+        with patch.object(SearchService, "fetch_locales", side_effect=fetch_locales) as f:
+            SearchService.google_search_locales("key", "cx", "python", 10, ("cs",))
+            responses = SearchService.google_search_locales("key", "cx", "python", 10, ("de", "cs"))
+
+        assert f.call_args[0][4] == ["de"]
+        requests = SearchService.get_metrics().cache_requests
+        assert requests.value(layer="memory", result="hit") == 1
+        assert requests.value(layer="memory", result="miss") == 2
+        assert list(responses) == ["de", "cs"]
+        assert responses["cs"]["items"][0]["title"] == "cs"
+
+    @pytest.mark.parametrize("state", ["stale", "fallback"])
+    def test_stale_not_stored(self, state):
+        """Test že prošlá odpověď (obnova na pozadí, chyba API) se do paměti neuloží"""
+        fetched = ({"items": [{"title": "starý"}]}, state)
+        with patch.object(SearchService, "fetch", return_value=fetched) as f:
+            SearchService.google_search("key", "cx", "python", 10)
+            SearchService.google_search("key", "cx", "python", 10)
+
+        assert f.call_count == 2
+        assert len(SearchService.get_memory_cache()) == 0
+
+    def test_refreshed_data_served_after_background_refresh(self, monkeypatch, tmp_path):
+        """Test že po dokončení obnovy na pozadí vrátí google_search nová data"""
+        monkeypatch.setenv("SEARCH_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+        monkeypatch.setenv("SEARCH_CACHE_TTL", "1")
+        monkeypatch.setenv("SEARCH_CACHE_STALE_TTL", "100")
+        SearchService.reset()
+        with patch("result_cache.time.time", return_value=time.time() - 50):
+            SearchService.get_cache().set(
+                ResultCache.make_key("cx", "python", None, "cs"),
+                {"num": 10, "response": {"items": [{"title": "v1"}]}},
+            )
+
+        with patch("search_service.build") as mock_build:
+            execute = mock_build.return_value.cse.return_value.list.return_value.execute
+            execute.return_value = {"items": [{"title": "v2"}]}
+
+            first = SearchService.google_search("key", "cx", "python", 10)
+            while SearchService.get_refresher().pending():
+                time.sleep(0.01)
+            second = SearchService.google_search("key", "cx", "python", 10)
+
+        assert first == {"items": [{"title": "v1"}]}
+        assert second == {"items": [{"title": "v2"}]}
+
+    def test_budget_from_env(self, monkeypatch):
+        monkeypatch.setenv("SEARCH_MEMORY_CACHE_MB", "0.5")
+        monkeypatch.setenv("SEARCH_MEMORY_CACHE_CODEC", "zlib")
+        SearchService.reset()
+
+        cache = SearchService.get_memory_cache()
+
+        assert (cache.max_bytes, cache.codec) == (512 * 1024, "zlib")
+
+
+class TestSearchServiceRankHistory:
+    """Testy pro zápis historie pořadí"""
+
+    def test_disabled_without_path(self, monkeypatch):
+        """Test že bez SEARCH_HISTORY_PATH se historie nezapisuje"""
+        monkeypatch.delenv("SEARCH_HISTORY_PATH", raising=False)
+
+        assert SearchService.get_history() is None
+        assert SearchService.record_history("python", "cs", []) is False
+
+    def test_records_snapshot(self, monkeypatch, tmp_path):
+        """Test zápisu snímku do historie"""
+        from search_results import ResultSet
+
+        monkeypatch.setenv("SEARCH_HISTORY_PATH", str(tmp_path / "history.sqlite3"))
+        results = ResultSet.from_records([{"title": "A", "link": "https://a.cz"}])
+
+        assert SearchService.record_history("python", "cs", results) is True
+        assert SearchService.get_history().movements("python", "cs")[0]["url"] == "https://a.cz"
+
+    def test_write_error_does_not_raise(self, monkeypatch, tmp_path):
+        """Test že chyba zápisu historie vyhledávání neshodí"""
+        monkeypatch.setenv("SEARCH_HISTORY_PATH", str(tmp_path / "history.sqlite3"))
+
+        with patch.object(SearchService.get_history(), "record", side_effect=OSError("disk")):
+            assert SearchService.record_history("python", "cs", []) is False
+
+
+class TestSearchServiceFieldProjection:
+    """Testy pro úsporný režim (parametr fields a zúžená cache)"""
+
+    FULL_PAGE = {
+        "kind": "customsearch#search",
+        "queries": {"request": [{"startIndex": 1, "count": 2, "searchTerms": "python"}]},
+        "searchInformation": {"totalResults": "2", "searchTime": 0.1},
+        "context": {"title": "CSE"},
+        "items": [
+            {
+                "kind": "customsearch#result",
+                "title": "A",
+                "link": "https://a.cz",
+                "snippet": "a",
+                "htmlSnippet": "<b>a</b>",
+                "displayLink": "a.cz",
+                "pagemap": {"metatags": [{"og:title": "A"}]},
+            }
+        ],
+    }
+
+    @pytest.fixture
+    def slim(self, monkeypatch):
+        monkeypatch.setenv("SEARCH_SLIM_RESPONSES", "1")
+        monkeypatch.delenv("SEARCH_EXTRA_FIELDS", raising=False)
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("SEARCH_SLIM_RESPONSES", raising=False)
+
+        assert SearchService.get_item_fields() is None
+        assert "fields" not in SearchService.list_params("cx", "q", 10, "cs", 1)
+
+    def test_item_fields_with_extra(self, slim, monkeypatch):
+        """Test že další pole se přidají za základní a neopakují se"""
+        monkeypatch.setenv("SEARCH_EXTRA_FIELDS", " displayLink, title ,pagemap")
+
+        assert SearchService.get_item_fields() == (
+            "title",
+            "link",
+            "snippet",
+            "displayLink",
+            "pagemap",
+        )
+
+    def test_fields_param(self):
+        assert SearchService.fields_param(SearchService.SLIM_ITEM_FIELDS) == (
+            "items(title,link,snippet),searchInformation,queries(request(startIndex))"
+        )
+
+    def test_request_uri_contains_fields(self):
+        """Test že googleapiclient posílá fields v URL požadavku"""
+        service = SearchService._build_client("key")
+        params = SearchService.list_params("cx", "q", 10, "cs", 1, ("title", "link"))
+
+        uri = service.cse().list(**params).uri
+
+        assert "fields=items%28title%2Clink%29" in uri
+
+    def test_project_response(self):
+        """Test že zúžená odpověď drží jen vybraná pole a startIndex stránky"""
+        projected = SearchService.project_response(self.FULL_PAGE, ("title", "link", "snippet"))
+
+        assert projected == {
+            "queries": {"request": [{"startIndex": 1}]},
+            "searchInformation": {"totalResults": "2", "searchTime": 0.1},
+            "items": [{"title": "A", "link": "https://a.cz", "snippet": "a"}],
+        }
+        assert SearchService.project_response(self.FULL_PAGE, None) is self.FULL_PAGE
+
+    def test_project_pages(self):
+        response = {"pages": [self.FULL_PAGE, {"queries": {"request": [{"startIndex": 11}]}}]}
+
+        projected = SearchService.project_response(response, ("link",))
+
+        assert projected["pages"][0]["items"] == [{"link": "https://a.cz"}]
+        assert projected["pages"][1] == {"queries": {"request": [{"startIndex": 11}]}}
+
+    def test_fetch_caches_projected_response(self, slim, monkeypatch, tmp_path):
+        """Test že se do cache uloží jen zúžená data, pod vlastním klíčem"""
+        from results_parser import ResultsParser
+
+        monkeypatch.setenv("SEARCH_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+
+        with patch("search_service.build") as mock_build:
+            cse_list = mock_build.return_value.cse.return_value.list
+            cse_list.return_value.execute.return_value = self.FULL_PAGE
+
+            result = SearchService.fetch("key", "cx", "python", 10)
+
+        assert cse_list.call_args[1]["fields"].startswith("items(title,link,snippet)")
+        assert result["items"] == [{"title": "A", "link": "https://a.cz", "snippet": "a"}]
+        assert ResultsParser.parse_google_api_response(result)[0]["title"] == "A"
+
+        cache = SearchService.get_cache()
+        item_fields = SearchService.get_item_fields()
+        entry = cache.get(ResultCache.make_key("cx", "python", None, "cs", item_fields))
+        assert entry["response"] == result
+        assert cache.get(ResultCache.make_key("cx", "python", None, "cs")) is None
@@ -0,0 +1,112 @@
+"""
+Unit testy pro SingleFlight
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import single_flight
+from single_flight import SingleFlight
+
+
+def hold_lock(lock_dir, result_path, started):
+    """Proces, který jako leader drží zámek a výsledek zapíše do souboru"""
+
+    def slow():
+        started.set()
+        time.sleep(0.5)
+        with open(result_path, "w", encoding="utf-8") as f:
+            f.write("z jiného procesu")
+        return "z jiného procesu"
+
+    SingleFlight(lock_dir).do("klic", slow)
+
+
+class TestSingleFlight:
+    """Testy pro SingleFlight třídu"""
+
+    def test_concurrent_calls_coalesced(self):
+        """Test že souběžná stejná volání provedou funkci jen jednou"""
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            release.wait(5)
+            return {"items": []}
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(flight.do, "klic", slow) for _ in range(8)]
+            # Počkáme, až se všichni následovníci přidají k probíhajícímu volání
+            while flight.in_flight() != 1 or len(calls) != 1:
+                time.sleep(0.01)
+            time.sleep(0.1)
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert len(calls) == 1
+        assert [result for result, _ in results] == [{"items": []}] * 8
+        assert sum(shared for _, shared in results) == 7
+        assert flight.in_flight() == 0
+
+    def test_different_keys_not_coalesced(self):
+        """Test že různé klíče se volají samostatně"""
+        flight = SingleFlight()
+
+        assert flight.do("a", lambda: 1) == (1, False)
+        assert flight.do("b", lambda: 2) == (2, False)
+
+    def test_error_propagates_to_waiters(self):
+        """Test že výjimku leadera dostanou i čekající vlákna"""
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def failing():
+            release.wait(5)
+            raise ValueError("chyba API")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flight.do, "klic", failing)
+            while flight.in_flight() != 1:
+                time.sleep(0.01)
+            follower = executor.submit(flight.do, "klic", failing)
+            time.sleep(0.1)
+            release.set()
+
+            for future in (leader, follower):
+                with pytest.raises(ValueError):
+                    future.result()
+
+        # Po chybě se klíč uvolní a další volání proběhne znovu
+        assert flight.do("klic", lambda: "ok") == ("ok", False)
+
+    @pytest.mark.skipif(single_flight.fcntl is None, reason="Zámky souborů jen na POSIX")
+    def test_coalesced_across_processes(self, tmp_path):
+        """Test že proces počká na jiný proces a převezme jeho výsledek přes recheck"""
+        lock_dir = str(tmp_path / "locks")
+        result_path = str(tmp_path / "result.txt")
+        context = multiprocessing.get_context("fork")
+        started = context.Event()
+
+        process = context.Process(target=hold_lock, args=(lock_dir, result_path, started))
+        process.start()
+        try:
+            assert started.wait(5)
+
+            def recheck():
+                if os.path.exists(result_path):
+                    with open(result_path, encoding="utf-8") as f:
+                        return f.read()
+                return None
+
+            result = SingleFlight(lock_dir).do("klic", lambda: "vlastní volání", recheck)
+        finally:
+            process.join(5)
+
+        assert result == ("z jiného procesu", True)
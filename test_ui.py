@@ -71,14 +71,19 @@ class TestSearchUIHelpers:
         assert hasattr(ui, "render_results")
         assert hasattr(ui, "render_export_buttons")
         assert hasattr(ui, "render_locale_settings")
+        assert hasattr(ui, "render_metrics_panel")
+        assert hasattr(ui, "render_compare_locales")
+        assert hasattr(ui, "render_comparison")
+        assert hasattr(ui, "render_comparison_export")
+        assert hasattr(ui, "render_rank_movements")
 
     def test_export_methods_exist(self):
         """Test že všechny export metody existují"""
         ui = SearchUI()
 
-        assert hasattr(ui, "_render_json_export")
-        assert hasattr(ui, "_render_csv_export")
-        assert hasattr(ui, "_render_txt_export")
+        assert hasattr(ui, "_render_export")
+        assert hasattr(ui, "export_payload")
+        assert set(ui.EXPORT_FORMATS) == {"json", "csv", "txt", "parquet"}
 
 
 class TestSearchUIIntegration:
@@ -89,7 +94,6 @@ class TestSearchUIIntegration:
         import ui
 
         assert hasattr(ui, "st")  # Streamlit
-        assert hasattr(ui, "json")
         assert hasattr(ui, "datetime")
         assert hasattr(ui, "ResultsParser")
 
@@ -108,3 +112,171 @@ class TestSearchUIIntegration:
         except Exception as e:
             # Streamlit může selhat mimo running app
             pytest.skip(f"Streamlit initialization failed: {e}")
+
+
+class TestSearchUIParseOnce:
+    """Testy že UI pracuje s už naparsovanými výsledky"""
+
+    def test_render_does_not_reparse(self):
+        """Test že vykreslení ani exporty znovu neparsují API odpověď"""
+        from unittest.mock import patch
+
+        from results_parser import ResultsParser
+
+        ui = SearchUI()
+        results = ResultsParser.parse_google_api_response(
+            {"items": [{"title": "Test", "link": "http://test.com", "snippet": "S"}]}
+        )
+
+        parse = ResultsParser.parse_google_api_response
+        with patch.object(
+            ResultsParser, "parse_google_api_response", wraps=parse
+        ) as mock_parse, patch("ui.st.download_button") as mock_download, patch(
+            "ui.st.segmented_control"
+        ) as mock_format:
+            ui.render_results(results)
+            for fmt in ui.EXPORT_FORMATS:
+                mock_format.return_value = fmt
+                ui.render_export_buttons(results, "test", digest=f"reparse-{fmt}")
+
+        # Exporty dostanou hotový seznam, parser jen vrátí vstup beze změny
+        for call in mock_parse.call_args_list:
+            assert call[0][0] is results
+        assert mock_download.call_count == 4
+
+
+class TestSearchUIResultsView:
+    """Testy výběru režimu zobrazení výsledků"""
+
+    @staticmethod
+    def results(count):
+        from results_parser import ResultsParser
+
+        return ResultsParser.parse_google_api_response(
+            {
+                "items": [
+                    {"title": f"T{i}", "link": f"http://test.com/{i}", "snippet": "S"}
+                    for i in range(count)
+                ]
+            }
+        )
+
+    @pytest.mark.parametrize(
+        "count, mode",
+        [(1, "expanders"), (10, "expanders"), (11, "paged"), (30, "paged"), (31, "table")],
+    )
+    def test_results_view_mode(self, count, mode):
+        assert SearchUI.results_view_mode(count) == mode
+
+    def test_table_renders_constant_elements(self):
+        """Test že velká sada je jedna tabulka, ne karta na výsledek"""
+        from unittest.mock import patch
+
+        ui = SearchUI()
+        with patch("ui.st") as mock_st:
+            ui.render_results(self.results(100))
+
+        assert mock_st.expander.call_count == 0
+        assert mock_st.dataframe.call_count == 1
+        assert len(mock_st.dataframe.call_args[0][0]["link"]) == 100
+
+    def test_paged_renders_one_page(self):
+        """Test že střední sada vykreslí karty jen pro vybranou stránku"""
+        from unittest.mock import patch
+
+        ui = SearchUI()
+        with patch("ui.st") as mock_st:
+            mock_st.session_state = {"results_page": 3}
+            mock_st.number_input.return_value = 2
+            ui.render_results(self.results(25))
+
+        assert mock_st.number_input.call_args[1]["max_value"] == 3
+        titles = [call[0][0] for call in mock_st.expander.call_args_list]
+        assert titles[0] == "**11. T10**"
+        assert len(titles) == SearchUI.RESULTS_PAGE_SIZE
+
+
+class TestSearchUILazyExport:
+    """Testy líného a cachovaného exportu"""
+
+    @pytest.fixture
+    def results(self):
+        from results_parser import ResultsParser
+
+        return ResultsParser.parse_google_api_response(
+            {"items": [{"title": "Test", "link": "http://test.com", "snippet": "S"}]}
+        )
+
+    def test_nothing_built_without_format(self, results):
+        """Test že bez vybraného formátu se žádný export nesestaví"""
+        from unittest.mock import patch
+
+        ui = SearchUI()
+        with patch("ui.st") as mock_st, patch.object(SearchUI, "export_payload") as payload:
+            mock_st.segmented_control.return_value = None
+            ui.render_export_buttons(results, "test")
+
+        payload.assert_not_called()
+        mock_st.download_button.assert_not_called()
+
+    def test_payload_built_once_per_digest(self, results):
+        """Test že opakované vykreslení (rerun) export znovu negeneruje"""
+        from unittest.mock import patch
+
+        from results_parser import ResultsParser
+
+        ui = SearchUI()
+        with patch("ui.st.segmented_control", return_value="csv"), patch(
+            "ui.st.download_button"
+        ) as mock_download, patch.object(
+            ResultsParser, "to_csv_data", wraps=ResultsParser.to_csv_data
+        ) as to_csv:
+            for _ in range(3):
+                ui.render_export_buttons(results, "test", digest="once-per-digest")
+
+        assert to_csv.call_count == 1
+        assert mock_download.call_count == 3
+        assert mock_download.call_args[1]["on_click"] == "ignore"
+        assert mock_download.call_args[1]["data"].startswith("rank,title,link,snippet")
+
+    def test_results_section(self, results):
+        """Test že fragment vykreslí výsledky i export"""
+        from unittest.mock import patch
+
+        ui = SearchUI()
+        with patch.object(SearchUI, "render_results") as render, patch.object(
+            SearchUI, "render_export_buttons"
+        ) as export:
+            # Mimo běžící aplikaci fragment nic nevykreslí - volá se obalená funkce
+            SearchUI.render_results_section.__wrapped__(ui, results, "test", "cs", "abc")
+
+        render.assert_called_once_with(results)
+        export.assert_called_once_with(results, "test", "cs", "abc")
+
+
+class TestSearchUICompareLocales:
+    """Testy výběru jazyků k porovnání"""
+
+    def test_single_language_explained(self):
+        """Test že při jednom vybraném jazyce UI řekne, že se porovnávat nebude"""
+        from unittest.mock import patch
+
+        ui = SearchUI()
+        with patch("ui.st") as mock_st:
+            mock_st.multiselect.return_value = ["Deutsch (de)"]
+            languages = ui.render_compare_locales()
+
+        assert languages == ["de"]
+        assert "Deutsch (de)" in mock_st.caption.call_args[0][0]
+
+    def test_multiple_languages(self):
+        """Test že při porovnání více jazyků se žádná poznámka nezobrazí"""
+        from unittest.mock import patch
+
+        ui = SearchUI()
+        with patch("ui.st") as mock_st:
+            mock_st.multiselect.return_value = ["Čeština (cs)", "English (en)"]
+            languages = ui.render_compare_locales()
+
+        assert languages == ["cs", "en"]
+        mock_st.caption.assert_not_called()
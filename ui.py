@@ -2,17 +2,46 @@
 UI komponenta pro vyhledávací aplikaci
 """
 
-import json
 from datetime import datetime
 
 import streamlit as st
 
 from results_parser import ResultsParser
+from search_results import ResultSet
 
 
 class SearchUI:
     """Třída pro UI vyhledávací aplikace"""
 
+    # Mapování jazyků pro lepší UX
+    LANGUAGE_OPTIONS = {
+        "Čeština (cs)": "cs",
+        "English (en)": "en",
+        "Slovenčina (sk)": "sk",
+        "Polski (pl)": "pl",
+        "Deutsch (de)": "de",
+        "Français (fr)": "fr",
+        "Español (es)": "es",
+        "Italiano (it)": "it",
+    }
+
+    # Výsledků na stránku; do tohoto počtu se vykreslí všechny karty najednou
+    RESULTS_PAGE_SIZE = 10
+
+    # Nad tento počet výsledků se místo karet vykreslí jedna tabulka
+    RESULTS_PAGED_LIMIT = 30
+
+    # Formáty exportu výsledků: klíč -> (popisek, přípona, MIME typ)
+    EXPORT_FORMATS = {
+        "json": ("📥 JSON", "json", "application/json"),
+        "csv": ("📊 CSV", "csv", "text/csv"),
+        "txt": ("📄 TXT", "txt", "text/plain"),
+        "parquet": ("🗜️ Parquet", "parquet", "application/vnd.apache.parquet"),
+    }
+
+    # Značky stavu změny pořadí
+    MOVEMENT_STATUS = {"new": "🆕", "up": "🔼", "down": "🔽", "same": "⏺️", "dropped": "❌"}
+
     def __init__(self):
         """Inicializace UI"""
         self.setup_page()
@@ -34,38 +63,48 @@ class SearchUI:
     def render_locale_settings(self):
         """Vykreslení nastavení lokalizace"""
         with st.expander("⚙️ Nastavení jazyka", expanded=False):
-            # Mapování jazyků pro lepší UX
-            language_options = {
-                "Čeština (cs)": "cs",
-                "English (en)": "en",
-                "Slovenčina (sk)": "sk",
-                "Polski (pl)": "pl",
-                "Deutsch (de)": "de",
-                "Français (fr)": "fr",
-                "Español (es)": "es",
-                "Italiano (it)": "it",
-            }
-
             selected_display = st.selectbox(
                 "Jazyk výsledků:",
-                options=list(language_options.keys()),
+                options=list(self.LANGUAGE_OPTIONS.keys()),
                 index=0,
                 help="Vyhledávání omezí na zvolený jazyk. Země se určí automaticky.",
             )
 
-            language = language_options[selected_display]
+            language = self.LANGUAGE_OPTIONS[selected_display]
 
             return language
 
+    def render_compare_locales(self):
+        """Vykreslení výběru jazyků pro porovnání
+
+        Returns:
+            list: Kódy vybraných jazyků (porovnává se až od dvou, jeden
+                  vybraný jazyk nahradí jazyk z nastavení)
+        """
+        with st.expander("🌍 Porovnání jazyků", expanded=False):
+            selected = st.multiselect(
+                "Porovnat výsledky v jazycích:",
+                options=list(self.LANGUAGE_OPTIONS.keys()),
+                help="Dotaz se spustí souběžně ve všech vybraných jazycích "
+                "a výsledky se zarovnají podle URL (1 dotaz API na jazyk a 10 výsledků).",
+            )
+            if len(selected) == 1:
+                st.caption(
+                    f"Porovnání potřebuje aspoň dva jazyky - vyhledá se jen v jazyce {selected[0]}."
+                )
+
+            return [self.LANGUAGE_OPTIONS[display] for display in selected]
+
     def render_results_count(self):
         """Vykreslení nastavení počtu výsledků"""
         with st.expander("⚙️ Počet výsledků", expanded=False):
             count = st.number_input(
                 "Zadejte počet výsledků:",
                 min_value=1,
-                max_value=10,
+                max_value=100,
                 value=5,
-                help="Maximální počet výsledků, které se mají vrátit."
+                help="Maximální počet výsledků, které se mají vrátit. "
+                "Nad 10 výsledků se stránky stahují souběžně (1 dotaz API na 10 výsledků).",
             )
 
             return count
@@ -90,12 +129,19 @@ class SearchUI:
         """Zobrazení informační zprávy"""
         st.info(message)
 
-    def render_results(self, results_json):
-        """Vykreslení výsledků vyhledávání"""
-        try:
-            # Použij parser pro normalizaci dat
-            results = ResultsParser.parse_google_api_response(results_json)
+    def render_results(self, results, mode=None):
+        """Vykreslení výsledků vyhledávání
+
+        Počet prvků stránky nesmí růst s počtem výsledků - každý prvek
+        znamená práci při rerunu i zprávu přes websocket. Malé sady se
+        vykreslí jako rozbalovací karty, střední po stránkách karet a velké
+        jedinou tabulkou (st.dataframe virtualizuje řádky až v prohlížeči).
 
+        Args:
+            results: Výsledky už normalizované přes ResultsParser (parsují se jen jednou)
+            mode: "expanders", "paged" nebo "table" (výchozí podle počtu výsledků)
+        """
+        try:
             if not results:
                 self.show_info("Žádné výsledky nenalezeny")
                 return
@@ -103,83 +149,337 @@ class SearchUI:
             st.divider()
             st.subheader(f"📋 Nalezeno {len(results)} výsledků")
 
-            # Zobraz výsledky
-            for result in results:
-                with st.expander(
-                    f"**{result.get('rank', '?')}. {result.get('title', 'Bez názvu')}**"
-                ):
-                    st.markdown(
-                        f"**🔗 URL:** [{result.get('link', 'N/A')}]({result.get('link', '#')})"
-                    )
-                    st.markdown(f"**📄 Popis:** {result.get('snippet', 'Bez popisu')}")
+            mode = mode or self.results_view_mode(len(results))
+            if mode == "table":
+                self._render_results_table(results)
+            elif mode == "paged":
+                self._render_results_expanders(self._results_page(results))
+            else:
+                self._render_results_expanders(results)
 
         except Exception as e:
             self.show_error(f"Chyba při zobrazení výsledků: {e}")
 
-    def render_export_buttons(self, results_json, query):
-        """Vykreslení tlačítek pro export"""
+    @classmethod
+    def results_view_mode(cls, count):
+        """Režim zobrazení výsledků podle jejich počtu
+
+        Returns:
+            str: "expanders" (všechny karty), "paged" (karty po stránkách)
+                 nebo "table" (jedna tabulka)
+        """
+        if count <= cls.RESULTS_PAGE_SIZE:
+            return "expanders"
+        if count <= cls.RESULTS_PAGED_LIMIT:
+            return "paged"
+        return "table"
+
+    def _render_results_expanders(self, results):
+        """Výsledky jako rozbalovací karty (karta a dva markdowny na výsledek)"""
+        for result in results:
+            with st.expander(f"**{result.get('rank', '?')}. {result.get('title', 'Bez názvu')}**"):
+                st.markdown(
+                    f"**🔗 URL:** [{result.get('link', 'N/A')}]({result.get('link', '#')})"
+                )
+                st.markdown(f"**📄 Popis:** {result.get('snippet', 'Bez popisu')}")
+
+    def _results_page(self, results):
+        """Výběr stránky výsledků (RESULTS_PAGE_SIZE na stránku)
+
+        Returns:
+            Výsledky na vybrané stránce
+        """
+        pages = -(-len(results) // self.RESULTS_PAGE_SIZE)
+        # Nové výsledky mohou mít méně stránek než předchozí výběr
+        if st.session_state.get("results_page", 1) > pages:
+            st.session_state.results_page = 1
+        page = st.number_input(
+            f"Stránka (celkem {pages}):",
+            min_value=1,
+            max_value=pages,
+            key="results_page",
+        )
+        start = (page - 1) * self.RESULTS_PAGE_SIZE
+        return results[start : start + self.RESULTS_PAGE_SIZE]
+
+    def _render_results_table(self, results):
+        """Výsledky jako jedna tabulka s odkazy (konstantní počet prvků stránky)"""
+        data = results.columns if isinstance(results, ResultSet) else list(results)
+        st.dataframe(
+            data,
+            column_config={
+                "rank": st.column_config.NumberColumn("#", width="small"),
+                "title": st.column_config.TextColumn("Název"),
+                "link": st.column_config.LinkColumn("URL"),
+                "snippet": st.column_config.TextColumn("Popis"),
+            },
+            hide_index=True,
+            use_container_width=True,
+        )
+
+    def render_comparison(self, comparison):
+        """Vykreslení srovnání jazyků (pořadí každého odkazu v každém jazyce)
+
+        Args:
+            comparison: LocaleComparison z ResultsParser.compare_locales
+        """
+        try:
+            if not len(comparison):
+                self.show_info("Žádné výsledky nenalezeny")
+                return
+
+            st.divider()
+            st.subheader(
+                f"🌍 Porovnání {len(comparison.languages)} jazyků - {len(comparison)} odkazů"
+            )
+            st.dataframe(
+                comparison.to_dicts(),
+                column_config={"link": st.column_config.LinkColumn("URL")},
+                hide_index=True,
+                use_container_width=True,
+            )
+
+        except Exception as e:
+            self.show_error(f"Chyba při zobrazení porovnání: {e}")
+
+    def render_comparison_export(self, comparison, query):
+        """Vykreslení tlačítek pro export srovnání jazyků
+
+        Args:
+            comparison: LocaleComparison
+            query: Vyhledávací dotaz
+        """
         st.divider()
-        st.subheader("📥 Export výsledků")
+        st.subheader("📥 Export porovnání")
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"vysledky_{query.replace(' ', '_')}_{timestamp}"
+        filename = f"porovnani_{query.replace(' ', '_')}_{timestamp}"
 
-        col1, col2, col3 = st.columns(3)
+        col1, col2 = st.columns(2)
 
         with col1:
-            self._render_json_export(results_json, filename)
+            try:
+                st.download_button(
+                    label="📥 JSON",
+                    data=ResultsParser.to_comparison_json(comparison),
+                    file_name=f"{filename}.json",
+                    mime="application/json",
+                    use_container_width=True,
+                )
+            except Exception as e:
+                st.button("📥 JSON", disabled=True, help=f"Chyba: {e}", use_container_width=True)
 
         with col2:
-            self._render_csv_export(results_json, filename)
-
-        with col3:
-            self._render_txt_export(results_json, filename, query)
-
-    def _render_json_export(self, results_json, filename):
-        """Export JSON"""
+            try:
+                st.download_button(
+                    label="📊 CSV",
+                    data=ResultsParser.to_comparison_csv(comparison),
+                    file_name=f"{filename}.csv",
+                    mime="text/csv",
+                    use_container_width=True,
+                )
+            except Exception as e:
+                st.button("📊 CSV", disabled=True, help=f"Chyba: {e}", use_container_width=True)
+
+    def render_rank_movements(self, movements, history, query):
+        """Vykreslení změn pořadí oproti předchozímu snímku a historie URL
+
+        Args:
+            movements: list dictů z RankHistory.movements
+            history: dict {url: [(den, pořadí)]} z RankHistory.history
+            query: Vyhledávací dotaz (pro název exportu)
+        """
         try:
-            json_string = ResultsParser.to_json_string(results_json)
+            if not movements:
+                return
 
-            st.download_button(
-                label="📥 JSON",
-                data=json_string,
-                file_name=f"{filename}.json",
-                mime="application/json",
+            st.divider()
+            st.subheader("📈 Změny pořadí")
+            st.dataframe(
+                [
+                    {**movement, "status": self.MOVEMENT_STATUS.get(movement["status"], "")}
+                    for movement in movements
+                ],
+                column_config={"url": st.column_config.LinkColumn("URL")},
+                hide_index=True,
                 use_container_width=True,
             )
-        except Exception as e:
-            st.button("📥 JSON", disabled=True, help=f"Chyba: {e}", use_container_width=True)
-
-    def _render_csv_export(self, results_json, filename):
-        """Export CSV"""
-        try:
-            csv_data = ResultsParser.to_csv_data(results_json)
 
+            urls = [url for url, points in history.items() if len(points) > 1]
+            if urls:
+                url = st.selectbox("Historie pořadí URL (90 dní):", options=urls)
+                st.line_chart(
+                    {
+                        "den": [day for day, _ in history[url]],
+                        "pořadí": [rank for _, rank in history[url]],
+                    },
+                    x="den",
+                    y="pořadí",
+                )
+
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             st.download_button(
-                label="📊 CSV",
-                data=csv_data,
-                file_name=f"{filename}.csv",
+                label="📈 Změny pořadí CSV",
+                data=ResultsParser.to_movements_csv(movements),
+                file_name=f"zmeny_{query.replace(' ', '_')}_{timestamp}.csv",
                 mime="text/csv",
-                use_container_width=True,
-            )
-        except ImportError:
-            st.button(
-                "📊 CSV", disabled=True, help="Pandas není nainstalován", use_container_width=True
             )
+
         except Exception as e:
-            st.button("📊 CSV", disabled=True, help=f"Chyba: {e}", use_container_width=True)
+            self.show_error(f"Chyba při zobrazení změn pořadí: {e}")
+
+    @st.fragment
+    def render_results_section(self, results, query, language="", digest=None):
+        """Vykreslení výsledků a exportu jako fragment
+
+        Stránkování výsledků a výběr formátu exportu překreslí jen tento
+        fragment, ne celou aplikaci (formulář, historii, porovnání, metriky).
+
+        Args:
+            results: Výsledky už normalizované přes ResultsParser
+            query: Vyhledávací dotaz
+            language: Jazyk výsledků
+            digest: Otisk výsledků (ResultsParser.results_digest), jinak se spočítá
+        """
+        self.render_results(results)
+        self.render_export_buttons(results, query, language, digest)
+
+    def render_export_buttons(self, results, query, language="", digest=None):
+        """Vykreslení exportu výsledků
+
+        Soubor se sestaví až pro formát, který si uživatel vybere, a drží
+        se v cache podle otisku výsledků - další reruny ho znovu negenerují.
+
+        Args:
+            results: Výsledky už normalizované přes ResultsParser
+            query: Vyhledávací dotaz
+            language: Jazyk výsledků (sloupec Parquet archivu)
+            digest: Otisk výsledků (ResultsParser.results_digest), jinak se spočítá
+        """
+        st.divider()
+        st.subheader("📥 Export výsledků")
 
-    def _render_txt_export(self, results_json, filename, query):
-        """Export TXT"""
+        fmt = st.segmented_control(
+            "Formát exportu:",
+            options=list(self.EXPORT_FORMATS),
+            format_func=lambda key: self.EXPORT_FORMATS[key][0],
+            key="export_format",
+        )
+        if fmt is None:
+            st.caption("Soubor se připraví až pro vybraný formát.")
+            return
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"vysledky_{query.replace(' ', '_')}_{timestamp}"
+        digest = digest or ResultsParser.results_digest(results)
+        self._render_export(fmt, results, filename, query, language, digest)
+
+    def _render_export(self, fmt, results, filename, query, language, digest):
+        """Tlačítko ke stažení jednoho formátu (při chybě neaktivní s popisem)"""
+        label, extension, mime = self.EXPORT_FORMATS[fmt]
         try:
-            txt_content = ResultsParser.to_txt_content(results_json, query)
+            data = self.export_payload(digest, fmt, query, language, results)
 
             st.download_button(
-                label="📄 TXT",
-                data=txt_content.encode("utf-8"),
-                file_name=f"{filename}.txt",
-                mime="text/plain",
+                label=label,
+                data=data,
+                file_name=f"{filename}.{extension}",
+                mime=mime,
+                on_click="ignore",
                 use_container_width=True,
             )
         except Exception as e:
-            st.button("📄 TXT", disabled=True, help=f"Chyba: {e}", use_container_width=True)
+            st.button(label, disabled=True, help=f"Chyba: {e}", use_container_width=True)
+
+    @staticmethod
+    @st.cache_data(max_entries=64, show_spinner=False)
+    def export_payload(digest, fmt, query, language, _results):
+        """
+        Obsah exportu výsledků v jednom formátu (cachovaný podle otisku)
+
+        Výsledky (_results) Streamlit nehashuje - klíčem cache je digest,
+        takže stejné výsledky se neserializují znovu ani v jiné relaci.
+
+        Args:
+            digest: Otisk výsledků (ResultsParser.results_digest)
+            fmt: Klíč z EXPORT_FORMATS
+            query: Vyhledávací dotaz (TXT hlavička, Parquet sloupec)
+            language: Jazyk výsledků (Parquet sloupec)
+            _results: Výsledky už normalizované přes ResultsParser
+
+        Returns:
+            str nebo bytes: Obsah souboru
+        """
+        if fmt == "json":
+            return ResultsParser.to_json_string(_results)
+        if fmt == "csv":
+            return ResultsParser.to_csv_data(_results)
+        if fmt == "txt":
+            return ResultsParser.to_txt_content(_results, query).encode("utf-8")
+        if fmt == "parquet":
+            return ResultsParser.to_parquet_bytes(_results, query, language)
+        raise ValueError(f"Neznámý formát exportu: {fmt}")
+
+    def render_metrics_panel(self, summary):
+        """Vykreslení admin panelu s metrikami
+
+        Args:
+            summary: Souhrn z SearchMetrics.summary()
+        """
+        st.divider()
+        with st.expander("📊 Metriky", expanded=False):
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Vyhledávání", summary["searches"])
+            col2.metric("Volání API", summary["api_requests"])
+            col3.metric("Sloučené dotazy", summary["coalesced"])
+            quota = summary["quota_remaining"]
+            col4.metric("Zbývající kvóta", "?" if quota is None else quota)
+
+            if summary["cache"]:
+                st.markdown("**Cache**")
+                st.table(
+                    [
+                        {
+                            "vrstva": layer,
+                            "hity": counts["hit"],
+                            "missy": counts["miss"],
+                            "úspěšnost": (
+                                "-"
+                                if counts["hit_rate"] is None
+                                else f"{counts['hit_rate']:.0%}"
+                            ),
+                        }
+                        for layer, counts in sorted(summary["cache"].items())
+                    ]
+                )
+
+            memory = summary.get("memory_cache")
+            if memory:
+                st.caption(
+                    f"Paměťová cache ({memory['codec']}): {memory['entries']} záznamů, "
+                    f"{memory['bytes'] / 2**20:.1f} / {memory['max_bytes'] / 2**20:.0f} MB, "
+                    f"vytlačeno {memory['evictions']}"
+                )
+
+            if summary["latency"]:
+                st.markdown("**Latence API**")
+                st.table(
+                    [
+                        {
+                            "jazyk": language,
+                            "volání": stats["count"],
+                            "průměr [ms]": round(stats["avg"] * 1000),
+                            "p95 [s] ≤": stats["p95"],
+                        }
+                        for language, stats in sorted(summary["latency"].items())
+                    ]
+                )
+
+            if summary["errors"]:
+                st.markdown("**Chyby API**")
+                st.table(
+                    [
+                        {"důvod": reason, "počet": count}
+                        for reason, count in sorted(summary["errors"].items())
+                    ]
+                )